@@ -1,71 +1,153 @@
 import random
-from typing import List
+from typing import List, Optional
 from tabulate import tabulate
-from robot import Robot
-from flying_robot import Flying_Robot
-from wheeled_robot import Wheeled_Robot
-from hybrid_robot import Hybrid_Robot
+from events import EventSink
+from results import ColumnarRecordWriter, CsvRecordWriter, EnergyStats
+from simulation import iter_robot_records, simulate_fleet
 
 
-def simulate_robots(num_robots: int = 50, num_actions: int = 3) -> None:
+# Runs with more robots print only the summary, since the grid table grows with every robot
+TABLE_LIMIT = 100
+
+
+def simulate_robots(
+    num_robots: int = 50,
+    num_actions: int = 3,
+    engine: str = "objects",
+    sink: Optional[EventSink] = None,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    csv_path: Optional[str] = None,
+    columns_dir: Optional[str] = None,
+    table_limit: int = TABLE_LIMIT,
+    horizon: float = 100.0,
+    shard_engine: str = "objects",
+) -> EnergyStats:
     """
     Simulate a group of robots performing actions and track energy consumption.
 
-    Displays results in a formatted table using tabulate.
+    Results are streamed robot by robot into online statistics (and the optional output
+    files). Runs of up to table_limit robots also display them in a table using tabulate.
 
     Args:
         num_robots (int, optional): Number of robots to simulate. Defaults to 50.
         num_actions (int, optional): Number of actions per robot. Defaults to 5.
+        engine (str, optional): "objects" to simulate one robot object at a time, or "fleet"
+            for the vectorized NumPy engine, "sharded" to split the robots across a process
+            pool (only the summary is available), or "timeline" to run the robots over
+            simulated time with the discrete-event scheduler instead of num_actions rounds.
+            Defaults to "objects".
+        sink (Optional[EventSink], optional): Destination of the per-robot and per-action
+            events, e.g. NullSink() to skip them or JsonLinesSink(path) for an event log.
+            Defaults to the sink returned by get_default_sink(). The fleet engine emits no events,
+            and the sharded engine rejects a sink.
+        workers (Optional[int], optional): Worker processes of the sharded engine. Defaults to the number of CPUs.
+        seed (Optional[int], optional): Master seed of the sharded engine. Defaults to a value drawn
+            from the random module, so random.seed() keeps sharded runs reproducible.
+        csv_path (Optional[str], optional): CSV file to stream the per-robot results to.
+        columns_dir (Optional[str], optional): Directory to stream the per-robot results to, one file per column.
+        table_limit (int, optional): Largest run displayed as a table. Defaults to TABLE_LIMIT.
+        horizon (float, optional): Simulated time the timeline engine runs for. Defaults to 100.0.
+        shard_engine (str, optional): Engine the sharded engine runs every shard with, "objects"
+            or "fleet". Defaults to "objects".
+
+    Returns:
+        EnergyStats: Energy consumption statistics of the run.
     """
-    # Initialize list to store robots
-    robots: List[Robot] = []
-    for i in range(num_robots):
-        name = f"Robot-{i + 1}"
-        robot_type = random.choice(["flying", "wheeled", "hybrid"])
-        if robot_type == "flying":
-            robots.append(Flying_Robot(name))
-        elif robot_type == "wheeled":
-            robots.append(Wheeled_Robot(name))
-        else:
-            robots.append(Hybrid_Robot(name))
-
-    # List to store table data for each robot
-    table_data = []
-    total_energy_consumed = 0.0
-    for robot in robots:
-        print(f"\nSimulating {robot.name} ({type(robot).__name__})")
-        initial_energy = robot.get_energy_level()
-        robot.power_on()
-        for _ in range(num_actions):
-            if isinstance(robot, Hybrid_Robot):
-                if random.random() < 0.3:  # 30% chance to switch
-                    robot.switch_mode(random.choice(["flying", "rolling"]))
-            robot.move()
-        final_energy = robot.get_energy_level()
-        energy_consumed = initial_energy - final_energy
-        total_energy_consumed += energy_consumed
-        # Add robot data to table
-        table_data.append([
-            robot.name,
-            type(robot).__name__,
-            f"{initial_energy:.2f}",
-            f"{final_energy:.2f}",
-            f"{energy_consumed:.2f}"
-        ])
+    if engine == "sharded":
+        if csv_path is not None or columns_dir is not None:
+            raise ValueError("The sharded engine only produces summary statistics.")
+        if sink is not None:
+            raise ValueError("The sharded engine discards events; it does not accept a sink.")
+        # Imported here so the other engines do not start the multiprocessing machinery
+        from sharding import simulate_sharded
 
-    # Calculate average energy consumption
-    avg_energy_per_robot = total_energy_consumed / num_robots if num_robots > 0 else 0.0
+        if seed is None:
+            seed = random.getrandbits(64)
+        stats = simulate_sharded(num_robots, num_actions, seed=seed, workers=workers, engine=shard_engine)
+        print_summary(stats)
+        return stats
+    if engine == "fleet":
+        records = simulate_fleet(num_robots, num_actions)
+    elif engine == "objects":
+        records = iter_robot_records(num_robots, num_actions, sink)
+    elif engine == "timeline":
+        from scheduler import simulate_timeline
+
+        records = simulate_timeline(num_robots, horizon, sink=sink)
+    else:
+        raise ValueError(f"Unknown engine: {engine}. Use 'objects', 'fleet', 'sharded' or 'timeline'.")
+
+    writers = []
+    if csv_path is not None:
+        writers.append(CsvRecordWriter(csv_path))
+    if columns_dir is not None:
+        writers.append(ColumnarRecordWriter(columns_dir))
+    stats = EnergyStats()
+    # Table data is only kept for runs small enough to display
+    table_data: Optional[List[list]] = [] if num_robots <= table_limit else None
+    try:
+        for record in records:
+            stats.add_record(record)
+            for writer in writers:
+                writer.write(record)
+            if table_data is not None:
+                table_data.append([
+                    record.name,
+                    record.robot_type,
+                    f"{record.initial_energy:.2f}",
+                    f"{record.final_energy:.2f}",
+                    f"{record.energy_consumed:.2f}"
+                ])
+    finally:
+        for writer in writers:
+            writer.close()
+
+    if table_data is not None:
+        print_table(table_data)
+    print_summary(stats)
+    return stats
+
+
+def print_table(table_data: List[list]) -> None:
+    """
+    Print the per-robot results table.
 
-    # Print robot results in a table
+    Args:
+        table_data (List[list]): Name, type, initial, final and consumed energy of each robot.
+    """
     print("\nRobot Simulation Results:")
     headers = ["Robot Name", "Robot Type", "Initial Energy", "Final Energy", "Energy Consumed"]
     print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
+
+def print_summary(stats: EnergyStats) -> None:
+    """
+    Print the simulation summary.
+
+    Args:
+        stats (EnergyStats): Energy consumption statistics of the run.
+    """
+    # Calculate average energy consumption
+    avg_energy_per_robot = stats.mean if stats.count > 0 else 0.0
+
     # Print simulation summary
     print("\nSimulation Summary:")
-    print(f"Total robots: {num_robots}")
-    print(f"Total energy consumed: {total_energy_consumed:.2f}")
+    print(f"Total robots: {stats.count}")
+    print(f"Total energy consumed: {stats.total:.2f}")
     print(f"Average energy consumed per robot: {avg_energy_per_robot:.2f}")
+    if stats.count == 0:
+        return
+    print(f"Energy consumed standard deviation: {stats.std_dev:.2f}")
+    print(
+        f"Energy consumed percentiles (approximate): p50 {stats.percentile(50):.2f}, "
+        f"p90 {stats.percentile(90):.2f}, p99 {stats.percentile(99):.2f}"
+    )
+    for robot_type, type_stats in sorted(stats.by_type.items()):
+        print(
+            f"{robot_type}: {type_stats.count} robots, {type_stats.total:.2f} energy consumed, "
+            f"{type_stats.mean:.2f} average"
+        )
 
 
 # Entry point for the simulation
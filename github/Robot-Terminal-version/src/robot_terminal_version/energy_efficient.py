@@ -7,10 +7,9 @@ class EnergyEfficient:
         Overrides the default power_on behavior for efficiency.
         """
         if not self.is_powered_on:
-            print(
-                f"{self.name} is powered on in saving mode to reduce energy usage. Energy level: {self.energy_level:.2f}"
-            )
+            if self.sink.enabled:
+                self.sink.emit("power_on_saving", self.name, energy=self.energy_level)
             self.is_powered_on = True
             self.energy_level -= 5.0
-        else:
-            print(f"{self.name} is already powered on")
\ No newline at end of file
+        elif self.sink.enabled:
+            self.sink.emit("already_on", self.name)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import json
+from typing import IO, List, Optional, Union
+
+
+class EventSink:
+    """Base class for destinations of robot events (power-on, moves, mode switches)."""
+
+    # Robots skip building events entirely when the sink is disabled
+    enabled = True
+
+    def emit(self, event: str, robot: str, **fields) -> None:
+        """
+        Record one event.
+
+        Args:
+            event (str): Event name, e.g. 'fly' or 'power_on'.
+            robot (str): Name of the robot the event happened to.
+            **fields: Event details, e.g. the energy level at the time of the event.
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Write any buffered events."""
+
+    def close(self) -> None:
+        """Flush the sink and release its resources."""
+        self.flush()
+
+    def __enter__(self) -> "EventSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class NullSink(EventSink):
+    """Sink that discards every event, for benchmarks and large simulations."""
+
+    enabled = False
+
+    def emit(self, event: str, robot: str, **fields) -> None:
+        """Discard the event."""
+
+
+class ConsoleSink(EventSink):
+    """Sink that prints a human-readable message for every event (the default)."""
+
+    MESSAGES = {
+        "simulate": "\nSimulating {robot} ({type})",
+        "power_on": "Powering on {robot}. Initial energy level: {energy:.2f}. Every start uses 10 percent of energy fuel",
+        "power_on_saving": "{robot} is powered on in saving mode to reduce energy usage. Energy level: {energy:.2f}",
+        "already_on": "{robot} is already powered on",
+        "fly": "{robot} is flying in the sky",
+        "fly_failed": "{robot} can't fly. Insufficient energy fuel or robot is turned off.",
+        "roll": "{robot} is rolling on wheels.",
+        "roll_failed": "{robot} cannot roll: insufficient energy fuel or powered off.",
+        "switch_mode": "{robot} switched to {mode} mode.",
+        "invalid_mode": "{robot}: Invalid mode {mode}.",
+        "recharge": "{robot} recharged. Energy level: {energy:.2f}",
+    }
+
+    def emit(self, event: str, robot: str, **fields) -> None:
+        """Print the message of the event."""
+        print(self.MESSAGES[event].format(robot=robot, **fields))
+
+
+class JsonLinesSink(EventSink):
+    """
+    Sink that writes one JSON object per event, batching writes for an auditable event log.
+
+    Events are kept in memory and written in a single call once buffer_size of them
+    have accumulated, and on flush() or close().
+    """
+
+    def __init__(self, target: Union[str, IO[str]], buffer_size: int = 1024):
+        """
+        Initialize the sink.
+
+        Args:
+            target (Union[str, IO[str]]): Path of the log file (overwritten), or an open text stream.
+            buffer_size (int, optional): Number of events written per batch. Defaults to 1024.
+        """
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1.")
+        self._owns_stream = isinstance(target, str)
+        self.stream = open(target, "w", encoding="utf-8") if self._owns_stream else target
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+
+    def emit(self, event: str, robot: str, **fields) -> None:
+        """Buffer the event as a JSON line, writing the batch when the buffer is full."""
+        self._buffer.append(json.dumps({"event": event, "robot": robot, **fields}))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered events in one call."""
+        if self._buffer:
+            self.stream.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Flush the events and close the log file if the sink opened it."""
+        self.flush()
+        if self._owns_stream:
+            self.stream.close()
+
+
+_default_sink: EventSink = ConsoleSink()
+
+
+def get_default_sink() -> EventSink:
+    """
+    Get the sink used by robots created without an explicit sink.
+
+    Returns:
+        EventSink: The default sink.
+    """
+    return _default_sink
+
+
+def set_default_sink(sink: Optional[EventSink]) -> None:
+    """
+    Set the sink used by robots created without an explicit sink.
+
+    Args:
+        sink (Optional[EventSink]): The new default sink, or None to restore the console sink.
+    """
+    global _default_sink
+    _default_sink = sink if sink is not None else ConsoleSink()
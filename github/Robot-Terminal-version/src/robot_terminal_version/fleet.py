@@ -0,0 +1,155 @@
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+from simulation import MODES, SWITCH_PROBABILITY, draw_robot_types
+
+# Type codes index simulation.ROBOT_TYPES, mode codes index simulation.MODES
+FLYING, WHEELED, HYBRID = range(3)
+MODE_FLYING, MODE_ROLLING = range(2)
+
+# Energy rules of the object model (Robot, EnergyEfficient, Flying_Robot, Wheeled_Robot)
+POWER_ON_COST = 10.0
+EFFICIENT_POWER_ON_COST = 5.0
+MOVE_COST = np.array([5.0, 3.0])  # indexed by mode: flying, rolling
+
+
+class Fleet:
+    """
+    Struct-of-arrays robot fleet with vectorized power-on, move and switch-mode rules.
+
+    Every robot is one index into parallel NumPy arrays instead of one Python object, so a
+    rule is applied to the whole fleet (or a masked subset) in a single array operation.
+    Flying and wheeled robots are stored with the mode matching their only way of moving,
+    so the move cost of every robot is read from its mode alone.
+    """
+
+    def __init__(self, types: np.ndarray, energy_level: float = 50.00):
+        """
+        Initialize a powered-off fleet with the given robot types.
+
+        Args:
+            types (np.ndarray): Type code (FLYING, WHEELED or HYBRID) of every robot.
+            energy_level (float, optional): Initial energy level of every robot. Defaults to 50.00.
+        """
+        self.types = np.asarray(types, dtype=np.int8)
+        size = len(self.types)
+        self.names = np.char.add("Robot-", np.arange(1, size + 1).astype(str))
+        self.energy = np.full(size, energy_level, dtype=np.float64)
+        self.powered = np.zeros(size, dtype=bool)
+        # Hybrid robots start flying, like Hybrid_Robot.__init__
+        self.modes = np.where(self.types == WHEELED, MODE_ROLLING, MODE_FLYING).astype(np.int8)
+
+    @classmethod
+    def from_random(cls, num_robots: int, rng=random) -> "Fleet":
+        """
+        Create a fleet with random types, drawn exactly as iter_robot_records draws them.
+
+        Args:
+            num_robots (int): Number of robots.
+            rng (optional): Source of random.choice. Defaults to the global random module.
+
+        Returns:
+            Fleet: The new fleet.
+        """
+        return cls(np.frombuffer(draw_robot_types(num_robots, rng), dtype=np.int8))
+
+    def __len__(self) -> int:
+        """Return the number of robots in the fleet."""
+        return len(self.types)
+
+    def power_on(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Power on the selected robots that are still off.
+
+        Hybrid robots use the EnergyEfficient rule (5 units), the others the Robot rule (10 units).
+
+        Args:
+            mask (np.ndarray, optional): Robots to power on. Defaults to the whole fleet.
+
+        Returns:
+            np.ndarray: Mask of the robots that were powered on by this call.
+        """
+        started = ~self.powered if mask is None else mask & ~self.powered
+        cost = np.where(self.types[started] == HYBRID, EFFICIENT_POWER_ON_COST, POWER_ON_COST)
+        self.energy[started] -= cost
+        self.powered[started] = True
+        return started
+
+    def switch_mode(self, mask: np.ndarray, modes: np.ndarray) -> None:
+        """
+        Switch the mode of the selected hybrid robots.
+
+        Args:
+            mask (np.ndarray): Robots to switch; non-hybrid robots are ignored.
+            modes (np.ndarray): New mode code of every selected robot (same length as the mask).
+        """
+        selected = mask & (self.types == HYBRID)
+        self.modes[selected] = modes[selected]
+
+    def move(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Move the selected robots, each by the cost of its current mode.
+
+        A robot only moves when it is powered on and has enough energy for the move.
+
+        Args:
+            mask (np.ndarray, optional): Robots to move. Defaults to the whole fleet.
+
+        Returns:
+            np.ndarray: Mask of the robots that moved.
+        """
+        cost = MOVE_COST[self.modes]
+        moved = self.powered & (self.energy >= cost)
+        if mask is not None:
+            moved &= mask
+        self.energy[moved] -= cost[moved]
+        return moved
+
+    def draw_switches(self, num_actions: int, rng=random) -> np.ndarray:
+        """
+        Draw the mode switches of every hybrid robot, consuming rng in the object model's order.
+
+        iter_robot_records simulates robots one after another, and a hybrid robot draws
+        random() (and, for a switch, choice()) before each of its moves, so the draws of
+        one robot are contiguous. This loop over hybrid robots and actions exists only to
+        reproduce that order, so the results stay identical to the object model for the
+        same seed; it does no simulation work. The switches it returns are applied to the
+        whole fleet at once by simulate.
+
+        Args:
+            num_actions (int): Number of actions per robot.
+            rng (optional): Source of random() and choice(). Defaults to the global random module.
+
+        Returns:
+            np.ndarray: Array of shape (num_actions, len(fleet)) holding the new mode code
+            before each action, or -1 where the robot keeps its mode.
+        """
+        switches = np.full((num_actions, len(self)), -1, dtype=np.int8)
+        draw, choose, modes = rng.random, rng.choice, list(MODES)
+        for index in np.flatnonzero(self.types == HYBRID).tolist():
+            for action in range(num_actions):
+                if draw() < SWITCH_PROBABILITY:
+                    switches[action, index] = MODES.index(choose(modes))
+        return switches
+
+    def simulate(self, num_actions: int, rng=random) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Power on every robot and run num_actions rounds of mode switches and moves.
+
+        Args:
+            num_actions (int): Number of actions per robot.
+            rng (optional): Source of the random draws. Defaults to the global random module.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Initial and final energy level of every robot.
+        """
+        initial = self.energy.copy()
+        self.power_on()
+        switches = self.draw_switches(num_actions, rng)
+        for action in range(num_actions):
+            planned = switches[action]
+            self.switch_mode(planned >= 0, planned)
+            self.move()
+        return initial, self.energy.copy()
@@ -11,7 +11,8 @@ class Flying_Robot(Robot):
         Checks if the robot is powered on and has sufficient energy.
         """
         if self.is_powered_on and self.energy_level >= 5.0:
-            print(f"{self.name} is flying in the sky")
+            if self.sink.enabled:
+                self.sink.emit("fly", self.name, energy=self.energy_level)
             self.energy_level -= 5.0
-        else:
-            print(f"{self.name} can't fly. Insufficient energy fuel or robot is turned off.")
+        elif self.sink.enabled:
+            self.sink.emit("fly_failed", self.name, energy=self.energy_level)
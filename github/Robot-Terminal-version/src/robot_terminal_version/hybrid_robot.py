@@ -1,20 +1,28 @@
+from typing import TYPE_CHECKING, Optional
+
 from energy_efficient import EnergyEfficient
+from events import EventSink
 from flying_robot import Flying_Robot
 from wheeled_robot import Wheeled_Robot
 
+if TYPE_CHECKING:
+    from scheduler import Event, Scheduler
+
 
 class Hybrid_Robot(EnergyEfficient, Flying_Robot, Wheeled_Robot):
     """Robot that can switch between flying and rolling modes with energy-efficient power-on."""
 
-    def __init__(self, name: str, energy_level: float = 50.00):
+    def __init__(self, name: str, energy_level: float = 50.00, sink: Optional[EventSink] = None):
         """
         Initialize a hybrid robot with a name, energy level, and default mode.
 
         Args:
             name (str): The robot's unique identifier.
             energy_level (float, optional): Initial energy level. Defaults to 50.00.
+            sink (Optional[EventSink], optional): Destination of the robot's events.
+                Defaults to the sink returned by get_default_sink().
         """
-        super().__init__(name, energy_level)
+        super().__init__(name, energy_level, sink)
         self.mode = "flying"
 
     def switch_mode(self, mode: str) -> None:
@@ -26,9 +34,24 @@ class Hybrid_Robot(EnergyEfficient, Flying_Robot, Wheeled_Robot):
         """
         if mode in ["flying", "rolling"]:
             self.mode = mode
-            print(f"{self.name} switched to {mode} mode.")
-        else:
-            print(f"{self.name}: Invalid mode {mode}.")
+            if self.sink.enabled:
+                self.sink.emit("switch_mode", self.name, mode=mode)
+        elif self.sink.enabled:
+            self.sink.emit("invalid_mode", self.name, mode=mode)
+
+    def schedule_switch_mode(self, scheduler: "Scheduler", time: float, mode: str) -> "Event":
+        """
+        Schedule a mode switch at a simulated time.
+
+        Args:
+            scheduler (Scheduler): The discrete-event scheduler.
+            time (float): Simulated time of the switch.
+            mode (str): The mode to switch to ('flying' or 'rolling').
+
+        Returns:
+            Event: The scheduled event, which can be cancelled.
+        """
+        return scheduler.schedule(time, self.switch_mode, mode)
 
     def move(self) -> None:
         """
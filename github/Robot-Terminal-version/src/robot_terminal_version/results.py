@@ -0,0 +1,356 @@
+import csv
+import json
+import math
+import os
+import sys
+from array import array
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Union
+
+
+class RobotRecord(NamedTuple):
+    """Simulation result of one robot."""
+
+    name: str
+    robot_type: str
+    initial_energy: float
+    final_energy: float
+    energy_consumed: float
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so any quantile is
+    returned within relative_accuracy of a true value while memory only grows with the
+    logarithm of the value range. Sketches with the same accuracy merge by adding counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy (float, optional): Relative error bound of the quantiles. Defaults to 0.01.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        self.zeros = 0
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the sketch.
+
+        Args:
+            value (float): The value.
+        """
+        self.count += 1
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._positive[key] = self._positive.get(key, 0) + 1
+        elif value < 0:
+            key = math.ceil(math.log(-value) / self._log_gamma)
+            self._negative[key] = self._negative.get(key, 0) + 1
+        else:
+            self.zeros += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Add the values of another sketch to this one.
+
+        Args:
+            other (QuantileSketch): Sketch with the same relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        self.count += other.count
+        self.zeros += other.zeros
+        for buckets, other_buckets in ((self._positive, other._positive), (self._negative, other._negative)):
+            for key, count in other_buckets.items():
+                buckets[key] = buckets.get(key, 0) + count
+
+    def _bucket_value(self, key: int) -> float:
+        """Return the value representing a bucket, within the relative accuracy of all its values."""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile of the added values.
+
+        Args:
+            q (float): Quantile between 0 and 1, e.g. 0.99 for the 99th percentile.
+
+        Returns:
+            float: The estimate, or NaN if the sketch is empty.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1.")
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negative values, from the most negative (largest bucket) up
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self._positive))
+
+
+class EnergyStats:
+    """
+    Online energy consumption statistics that never hold the individual records.
+
+    Tracks the count, total, minimum and maximum, the mean and variance with Welford's
+    algorithm, percentiles with a QuantileSketch, and the same statistics per robot type.
+    Statistics of separate runs (e.g. shards) are combined with merge().
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, track_types: bool = True):
+        """
+        Initialize empty statistics.
+
+        Args:
+            relative_accuracy (float, optional): Relative error bound of the percentiles. Defaults to 0.01.
+            track_types (bool, optional): Whether to keep statistics per robot type. Defaults to True.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.by_type: Optional[Dict[str, EnergyStats]] = {} if track_types else None
+
+    def add(self, energy_consumed: float, robot_type: Optional[str] = None) -> None:
+        """
+        Add the energy consumed by one robot.
+
+        Args:
+            energy_consumed (float): Energy the robot consumed.
+            robot_type (Optional[str], optional): Class name of the robot, for the per-type statistics.
+        """
+        self.count += 1
+        self.total += energy_consumed
+        delta = energy_consumed - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (energy_consumed - self.mean)
+        self.minimum = min(self.minimum, energy_consumed)
+        self.maximum = max(self.maximum, energy_consumed)
+        self.sketch.add(energy_consumed)
+        if self.by_type is not None and robot_type is not None:
+            if robot_type not in self.by_type:
+                self.by_type[robot_type] = EnergyStats(self.sketch.relative_accuracy, track_types=False)
+            self.by_type[robot_type].add(energy_consumed)
+
+    def add_record(self, record: RobotRecord) -> None:
+        """
+        Add the energy consumed by the robot of a record.
+
+        Args:
+            record (RobotRecord): The robot's result.
+        """
+        self.add(record.energy_consumed, record.robot_type)
+
+    def merge(self, other: "EnergyStats") -> "EnergyStats":
+        """
+        Add the statistics of another run to these ones (Chan et al. parallel variance).
+
+        Args:
+            other (EnergyStats): Statistics to merge.
+
+        Returns:
+            EnergyStats: These statistics, updated.
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+        if self.by_type is not None and other.by_type is not None:
+            for robot_type, stats in other.by_type.items():
+                if robot_type not in self.by_type:
+                    self.by_type[robot_type] = EnergyStats(self.sketch.relative_accuracy, track_types=False)
+                self.by_type[robot_type].merge(stats)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the energy consumed per robot (0.0 without robots)."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        """Population standard deviation of the energy consumed per robot."""
+        return math.sqrt(self.variance)
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a percentile of the energy consumed per robot.
+
+        Args:
+            p (float): Percentile between 0 and 100.
+
+        Returns:
+            float: The estimate, or NaN without robots.
+        """
+        return self.sketch.quantile(p / 100)
+
+
+class CsvRecordWriter:
+    """Writer that streams records to a CSV file, one row per robot."""
+
+    def __init__(self, target: Union[str, IO[str]]):
+        """
+        Initialize the writer and write the header row.
+
+        Args:
+            target (Union[str, IO[str]]): Path of the CSV file (overwritten), or an open text stream.
+        """
+        self._owns_stream = isinstance(target, str)
+        self.stream = open(target, "w", newline="", encoding="utf-8") if self._owns_stream else target
+        self._writer = csv.writer(self.stream)
+        self._writer.writerow(RobotRecord._fields)
+
+    def write(self, record: RobotRecord) -> None:
+        """Write the row of a record."""
+        self._writer.writerow(record)
+
+    def close(self) -> None:
+        """Flush the rows and close the file if the writer opened it."""
+        self.stream.flush()
+        if self._owns_stream:
+            self.stream.close()
+
+    def __enter__(self) -> "CsvRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ColumnarRecordWriter:
+    """
+    Writer that streams records to a directory with one file per column.
+
+    Energies are raw float64 files and robot types are uint8 codes, appended in batches of
+    batch_size rows, so each column loads directly with e.g. numpy.fromfile. Names are one
+    per line in name.txt. schema.json, written on close, lists the columns, their dtypes,
+    the byte order, the row count and the labels of the type codes.
+    """
+
+    FLOAT_COLUMNS = ("initial_energy", "final_energy", "energy_consumed")
+
+    def __init__(self, directory: str, batch_size: int = 65536):
+        """
+        Initialize the writer, creating the directory and truncating its column files.
+
+        Args:
+            directory (str): Output directory.
+            batch_size (int, optional): Rows buffered before they are appended to the files. Defaults to 65536.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.batch_size = batch_size
+        self.rows = 0
+        self._type_codes: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._types = bytearray()
+        self._floats = {column: array("d") for column in self.FLOAT_COLUMNS}
+        self._files = {
+            "name": open(os.path.join(directory, "name.txt"), "w", encoding="utf-8"),
+            "robot_type": open(os.path.join(directory, "robot_type.u8"), "wb"),
+        }
+        for column in self.FLOAT_COLUMNS:
+            self._files[column] = open(os.path.join(directory, f"{column}.f64"), "wb")
+
+    def write(self, record: RobotRecord) -> None:
+        """Buffer a record, appending the batch to the column files when it is full."""
+        code = self._type_codes.setdefault(record.robot_type, len(self._type_codes))
+        if code > 255:
+            raise ValueError("At most 256 robot types can be written.")
+        self._names.append(record.name)
+        self._types.append(code)
+        self._floats["initial_energy"].append(record.initial_energy)
+        self._floats["final_energy"].append(record.final_energy)
+        self._floats["energy_consumed"].append(record.energy_consumed)
+        if len(self._types) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append the buffered rows to the column files."""
+        if not self._types:
+            return
+        self._files["name"].write("\n".join(self._names) + "\n")
+        self._files["robot_type"].write(self._types)
+        for column, values in self._floats.items():
+            self._files[column].write(values.tobytes())
+        self.rows += len(self._types)
+        self._names.clear()
+        self._types.clear()
+        for column in self.FLOAT_COLUMNS:
+            self._floats[column] = array("d")
+
+    def close(self) -> None:
+        """Write the remaining rows and the schema, and close the column files."""
+        self.flush()
+        for file in self._files.values():
+            file.close()
+        schema = {
+            "rows": self.rows,
+            "byteorder": sys.byteorder,
+            "columns": {
+                "name": {"file": "name.txt", "dtype": "str"},
+                "robot_type": {"file": "robot_type.u8", "dtype": "uint8",
+                               "labels": sorted(self._type_codes, key=self._type_codes.get)},
+                **{column: {"file": f"{column}.f64", "dtype": "float64"} for column in self.FLOAT_COLUMNS},
+            },
+        }
+        with open(os.path.join(self.directory, "schema.json"), "w", encoding="utf-8") as file:
+            json.dump(schema, file, indent=2)
+
+    def __enter__(self) -> "ColumnarRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def aggregate(records: Iterable[RobotRecord], stats: Optional[EnergyStats] = None) -> EnergyStats:
+    """
+    Consume a stream of records into online statistics.
+
+    Args:
+        records (Iterable[RobotRecord]): The records.
+        stats (Optional[EnergyStats], optional): Statistics to update. Defaults to new statistics.
+
+    Returns:
+        EnergyStats: The updated statistics.
+    """
+    if stats is None:
+        stats = EnergyStats()
+    for record in records:
+        stats.add_record(record)
+    return stats
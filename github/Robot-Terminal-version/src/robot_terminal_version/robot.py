@@ -1,41 +1,92 @@
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional
+
+from events import EventSink, get_default_sink
+
+if TYPE_CHECKING:
+    from scheduler import Event, Scheduler
 
 
 class Robot(ABC):
     """Base class for all robot types, providing power and energy management."""
 
-    def __init__(self, name: str, energy_level: float = 50.00):
+    def __init__(self, name: str, energy_level: float = 50.00, sink: Optional[EventSink] = None):
         """
         Initialize a robot with a name and energy level.
 
         Args:
             name (str): The robot's unique identifier.
             energy_level (float, optional): Initial energy level. Defaults to 100.00.
+            sink (Optional[EventSink], optional): Destination of the robot's events.
+                Defaults to the sink returned by get_default_sink().
         """
         self.name = name
         self.energy_level = energy_level
         self.is_powered_on = False
+        self.capacity = energy_level
+        self.energy_recharged = 0.0
+        self.sink = sink if sink is not None else get_default_sink()
 
     def power_on(self) -> None:
         """
         Power on the robot, consuming 10% of initial energy.
 
-        Prints status and updates energy level if not already powered on.
+        Emits a status event and updates energy level if not already powered on.
         """
         if not self.is_powered_on:
-            print(
-                f"Powering on {self.name}. Initial energy level: {self.energy_level:.2f}. Every start uses 10 percent of energy fuel"
-            )
+            if self.sink.enabled:
+                self.sink.emit("power_on", self.name, energy=self.energy_level)
             self.is_powered_on = True
             self.energy_level -= 10.0
-        else:
-            print(f"{self.name} is already powered on")
+        elif self.sink.enabled:
+            self.sink.emit("already_on", self.name)
 
     @abstractmethod
     def move(self) -> None:
         """Abstract method to define robot movement. Must be implemented by subclasses."""
         pass
 
+    def recharge(self, amount: Optional[float] = None) -> None:
+        """
+        Recharge the robot, never above its initial energy level.
+
+        Args:
+            amount (Optional[float], optional): Energy to add. Defaults to a full recharge.
+        """
+        target = self.capacity if amount is None else min(self.capacity, self.energy_level + amount)
+        if target > self.energy_level:
+            self.energy_recharged += target - self.energy_level
+            self.energy_level = target
+        if self.sink.enabled:
+            self.sink.emit("recharge", self.name, energy=self.energy_level)
+
+    def schedule_move(self, scheduler: "Scheduler", time: float) -> "Event":
+        """
+        Schedule a move at a simulated time.
+
+        Args:
+            scheduler (Scheduler): The discrete-event scheduler.
+            time (float): Simulated time of the move.
+
+        Returns:
+            Event: The scheduled event, which can be cancelled.
+        """
+        return scheduler.schedule(time, self.move)
+
+    def schedule_recharge(self, scheduler: "Scheduler", time: float, amount: Optional[float] = None) -> "Event":
+        """
+        Schedule a recharge at a simulated time.
+
+        Args:
+            scheduler (Scheduler): The discrete-event scheduler.
+            time (float): Simulated time of the recharge.
+            amount (Optional[float], optional): Energy to add. Defaults to a full recharge.
+
+        Returns:
+            Event: The scheduled event, which can be cancelled.
+        """
+        return scheduler.schedule(time, self.recharge, amount)
+
     def get_energy_level(self) -> float:
         """
         Get the current energy level of the robot.
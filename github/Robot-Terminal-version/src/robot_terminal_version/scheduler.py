@@ -0,0 +1,241 @@
+import heapq
+import itertools
+import random
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+from events import EventSink, get_default_sink
+from results import RobotRecord
+from robot import Robot
+from simulation import ROBOT_TYPES, create_robot, maybe_switch_mode
+
+# A scheduled event: (time, sequence number, callback, arguments). The unique sequence
+# number breaks ties in scheduling order, so callbacks are never compared.
+Event = Tuple[float, int, Callable, tuple]
+
+
+class Scheduler:
+    """
+    Discrete-event scheduler that runs callbacks in simulated-time order.
+
+    Pending events are kept in a binary heap, so scheduling and running an event both
+    cost O(log n) for n pending events. Cancelled events are skipped when they reach the
+    front of the heap rather than searched for; the sequence numbers of pending events
+    are tracked so cancelling an event that already ran, or was already cancelled, is
+    a no-op.
+    """
+
+    def __init__(self, start: float = 0.0):
+        """
+        Initialize an empty scheduler.
+
+        Args:
+            start (float, optional): Initial simulated time. Defaults to 0.0.
+        """
+        self.now = start
+        self.processed = 0
+        self._queue: List[Event] = []
+        self._sequence = itertools.count()
+        self._pending: Set[int] = set()
+        self._cancelled: Set[int] = set()
+
+    def __len__(self) -> int:
+        """Return the number of pending events, excluding cancelled ones not yet skipped."""
+        return len(self._queue) - len(self._cancelled)
+
+    def schedule(self, time: float, callback: Callable, *args) -> Event:
+        """
+        Schedule a callback at a simulated time.
+
+        Args:
+            time (float): Simulated time of the event; not earlier than the current time.
+            callback (Callable): Function called with args when the event runs.
+            *args: Arguments of the callback.
+
+        Returns:
+            Event: The scheduled event, which can be passed to cancel().
+        """
+        if time < self.now:
+            raise ValueError(f"Cannot schedule an event at {time}, before the current time {self.now}.")
+        event = (time, next(self._sequence), callback, args)
+        heapq.heappush(self._queue, event)
+        self._pending.add(event[1])
+        return event
+
+    def schedule_in(self, delay: float, callback: Callable, *args) -> Event:
+        """
+        Schedule a callback after a delay from the current simulated time.
+
+        Args:
+            delay (float): Non-negative delay.
+            callback (Callable): Function called with args when the event runs.
+            *args: Arguments of the callback.
+
+        Returns:
+            Event: The scheduled event, which can be passed to cancel().
+        """
+        return self.schedule(self.now + delay, callback, *args)
+
+    def cancel(self, event: Event) -> None:
+        """
+        Cancel a pending event. Events that already ran or were cancelled are ignored.
+
+        Args:
+            event (Event): Event returned by schedule() or schedule_in().
+        """
+        if event[1] in self._pending:
+            self._pending.discard(event[1])
+            self._cancelled.add(event[1])
+
+    def run(self, until: Optional[float] = None, max_events: Optional[int] = None) -> int:
+        """
+        Run events in time order.
+
+        Args:
+            until (Optional[float], optional): Stop before the first event after this time,
+                and advance the clock to it. Defaults to running until no event is pending.
+            max_events (Optional[int], optional): Stop after running this many events.
+
+        Returns:
+            int: Number of events run by this call.
+        """
+        queue, pending, cancelled, pop = self._queue, self._pending, self._cancelled, heapq.heappop
+        count = 0
+        while queue and (until is None or queue[0][0] <= until):
+            if max_events is not None and count >= max_events:
+                # Stopped early: the clock stays at the last event run
+                self.processed += count
+                return count
+            time, sequence, callback, args = pop(queue)
+            if cancelled and sequence in cancelled:
+                cancelled.discard(sequence)
+                continue
+            pending.discard(sequence)
+            self.now = time
+            callback(*args)
+            count += 1
+        if until is not None and until > self.now:
+            self.now = until
+        self.processed += count
+        return count
+
+
+class RobotTimeline:
+    """
+    Behaviour of a fleet of robots over simulated time.
+
+    Every robot powers on at a random time within the first move interval, then tries to
+    move at exponentially distributed intervals. Before each move a hybrid robot may
+    switch mode. A robot that cannot move schedules a full recharge, which takes
+    recharge_time, and resumes moving afterwards.
+    """
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        move_interval: float = 1.0,
+        recharge_time: float = 5.0,
+        rng=random,
+    ):
+        """
+        Initialize the timeline.
+
+        Args:
+            scheduler (Scheduler): Scheduler the robots' events are scheduled on.
+            move_interval (float, optional): Mean time between two moves of a robot. Defaults to 1.0.
+            recharge_time (float, optional): Time a full recharge takes. Defaults to 5.0.
+            rng (optional): Source of the random draws. Defaults to the global random module.
+        """
+        if move_interval <= 0 or recharge_time < 0:
+            raise ValueError("move_interval must be positive and recharge_time non-negative.")
+        self.scheduler = scheduler
+        self.move_rate = 1.0 / move_interval
+        self.move_interval = move_interval
+        self.recharge_time = recharge_time
+        self.rng = rng
+        self.robots: List[Robot] = []
+
+    def add_robot(self, robot: Robot) -> None:
+        """
+        Add a robot, scheduling its power-on and first move.
+
+        Args:
+            robot (Robot): The robot.
+        """
+        self.robots.append(robot)
+        start = self.scheduler.now + self.rng.uniform(0.0, self.move_interval)
+        self.scheduler.schedule(start, self.start, robot)
+
+    def add_random_robots(self, num_robots: int, sink: Optional[EventSink] = None) -> None:
+        """
+        Add robots of random types, named Robot-1, Robot-2, ...
+
+        Args:
+            num_robots (int): Number of robots.
+            sink (Optional[EventSink], optional): Destination of the robots' events.
+                Defaults to the sink returned by get_default_sink().
+        """
+        if sink is None:
+            sink = get_default_sink()
+        choices = list(ROBOT_TYPES)
+        first = len(self.robots) + 1
+        for i in range(num_robots):
+            self.add_robot(create_robot(ROBOT_TYPES.index(self.rng.choice(choices)), f"Robot-{first + i}", sink))
+
+    def start(self, robot: Robot) -> None:
+        """Power on a robot and schedule its first move."""
+        robot.power_on()
+        self.scheduler.schedule_in(self.rng.expovariate(self.move_rate), self.step, robot)
+
+    def step(self, robot: Robot) -> None:
+        """Move a robot (switching a hybrid's mode first), then schedule its next move or a recharge."""
+        maybe_switch_mode(robot, self.rng)
+        energy_level = robot.energy_level
+        robot.move()
+        if robot.energy_level < energy_level:
+            self.scheduler.schedule_in(self.rng.expovariate(self.move_rate), self.step, robot)
+        else:
+            robot.schedule_recharge(self.scheduler, self.scheduler.now + self.recharge_time)
+            self.scheduler.schedule_in(self.recharge_time, self.step, robot)
+
+    def records(self) -> Iterator[RobotRecord]:
+        """
+        Yield the result of every robot at the current simulated time.
+
+        Energy consumed includes the energy that was recharged.
+
+        Yields:
+            RobotRecord: The result of each robot, in the order they were added.
+        """
+        for robot in self.robots:
+            consumed = robot.capacity + robot.energy_recharged - robot.energy_level
+            yield RobotRecord(robot.name, type(robot).__name__, robot.capacity, robot.energy_level, consumed)
+
+
+def simulate_timeline(
+    num_robots: int = 50,
+    horizon: float = 100.0,
+    move_interval: float = 1.0,
+    recharge_time: float = 5.0,
+    sink: Optional[EventSink] = None,
+    rng=random,
+) -> Iterator[RobotRecord]:
+    """
+    Simulate a group of robots over a simulated time horizon with the discrete-event scheduler.
+
+    Args:
+        num_robots (int, optional): Number of robots to simulate. Defaults to 50.
+        horizon (float, optional): Simulated time to run for. Defaults to 100.0.
+        move_interval (float, optional): Mean time between two moves of a robot. Defaults to 1.0.
+        recharge_time (float, optional): Time a full recharge takes. Defaults to 5.0.
+        sink (Optional[EventSink], optional): Destination of the robots' events.
+            Defaults to the sink returned by get_default_sink().
+        rng (optional): Source of the random draws. Defaults to the global random module.
+
+    Yields:
+        RobotRecord: The result of each robot at the end of the horizon, in order.
+    """
+    scheduler = Scheduler()
+    timeline = RobotTimeline(scheduler, move_interval, recharge_time, rng=rng)
+    timeline.add_random_robots(num_robots, sink)
+    scheduler.run(until=horizon)
+    yield from timeline.records()
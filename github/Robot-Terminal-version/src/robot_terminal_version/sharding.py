@@ -0,0 +1,106 @@
+import hashlib
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+from events import NullSink
+from results import EnergyStats, aggregate
+from simulation import iter_robot_records, simulate_fleet
+
+
+# Robots per shard. Shards are fixed slices of the fleet, never sized by the worker count,
+# so every robot is simulated with the same random stream however many workers run.
+SHARD_SIZE = 10_000
+
+
+def shard_seed(master_seed: int, shard: int) -> int:
+    """
+    Derive the seed of a shard's random stream from the master seed.
+
+    The seed is a hash of both values, so the streams of different shards are independent
+    and reproducible in any process (unlike hash(), which is salted per process).
+
+    Args:
+        master_seed (int): Seed of the whole simulation.
+        shard (int): Index of the shard.
+
+    Returns:
+        int: 64-bit seed for the shard's random.Random.
+    """
+    digest = hashlib.sha256(f"{master_seed}/{shard}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def simulate_shard(task: Tuple[int, int, int, int, str]) -> EnergyStats:
+    """
+    Simulate one shard of robots with its own random stream.
+
+    Runs in a worker process; robots are simulated by iter_robot_records or simulate_fleet
+    with the shard's stream, and events are discarded.
+
+    Args:
+        task (Tuple[int, int, int, int, str]): Shard index, number of robots in the shard,
+            actions per robot, master seed and engine ('objects' or 'fleet').
+
+    Returns:
+        EnergyStats: Energy statistics of the shard.
+    """
+    shard, num_robots, num_actions, master_seed, engine = task
+    rng = random.Random(shard_seed(master_seed, shard))
+    first = shard * SHARD_SIZE + 1
+    if engine == "fleet":
+        return aggregate(simulate_fleet(num_robots, num_actions, rng, first))
+    return aggregate(iter_robot_records(num_robots, num_actions, NullSink(), rng, first))
+
+
+def shard_tasks(num_robots: int, num_actions: int, seed: int, engine: str) -> Iterator[Tuple[int, int, int, int, str]]:
+    """
+    Split a simulation into fixed-size shards.
+
+    Args:
+        num_robots (int): Number of robots to simulate.
+        num_actions (int): Number of actions per robot.
+        seed (int): Master seed.
+        engine (str): 'objects' or 'fleet'.
+
+    Yields:
+        Tuple[int, int, int, int, str]: The task of every shard, in order.
+    """
+    for shard, start in enumerate(range(0, num_robots, SHARD_SIZE)):
+        yield shard, min(SHARD_SIZE, num_robots - start), num_actions, seed, engine
+
+
+def simulate_sharded(
+    num_robots: int = 50, num_actions: int = 3, seed: int = 42, workers: Optional[int] = None, engine: str = "objects"
+) -> EnergyStats:
+    """
+    Simulate robots split into shards across a process pool and merge their statistics.
+
+    Every shard draws from its own stream seeded by shard_seed(seed, shard), and shard
+    results are merged in shard order, so the statistics are identical for any number of
+    workers. They differ from a single-process simulate_robots run, which shares one stream.
+
+    Args:
+        num_robots (int, optional): Number of robots to simulate. Defaults to 50.
+        num_actions (int, optional): Number of actions per robot. Defaults to 3.
+        seed (int, optional): Master seed. Defaults to 42.
+        workers (Optional[int], optional): Worker processes; 1 runs the shards in this process.
+            Defaults to the number of CPUs.
+        engine (str, optional): 'objects' or 'fleet' (requires NumPy) for every shard. Defaults to 'objects'.
+
+    Returns:
+        EnergyStats: Merged energy statistics of all shards.
+    """
+    if engine not in ("objects", "fleet"):
+        raise ValueError(f"Unknown engine: {engine}. Use 'objects' or 'fleet'.")
+    tasks = shard_tasks(num_robots, num_actions, seed, engine)
+    total = EnergyStats()
+    if workers == 1:
+        for task in tasks:
+            total.merge(simulate_shard(task))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map yields results in shard order, whichever worker finishes first
+        for stats in executor.map(simulate_shard, tasks):
+            total.merge(stats)
+    return total
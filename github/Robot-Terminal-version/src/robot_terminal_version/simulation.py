@@ -0,0 +1,142 @@
+import random
+from typing import Iterator, Optional, Tuple
+
+from events import EventSink, get_default_sink
+from flying_robot import Flying_Robot
+from wheeled_robot import Wheeled_Robot
+from hybrid_robot import Hybrid_Robot
+from results import RobotRecord
+from robot import Robot
+
+
+# Robot type keys, in the order simulations draw them with random.choice
+ROBOT_TYPES = ("flying", "wheeled", "hybrid")
+# Robot class of each type key
+ROBOT_CLASSES = {"flying": Flying_Robot, "wheeled": Wheeled_Robot, "hybrid": Hybrid_Robot}
+# Class name of each type code (index into ROBOT_TYPES)
+TYPE_NAMES = tuple(ROBOT_CLASSES[robot_type].__name__ for robot_type in ROBOT_TYPES)
+# Hybrid robot modes, in the order simulations draw them with random.choice
+MODES = ("flying", "rolling")
+# Chance a hybrid robot switches mode before a move
+SWITCH_PROBABILITY = 0.3
+
+
+def draw_robot_types(num_robots: int, rng=random) -> bytearray:
+    """
+    Draw a random type for every robot, one rng.choice per robot.
+
+    Args:
+        num_robots (int): Number of robots.
+        rng (optional): Source of the random draws. Defaults to the global random module.
+
+    Returns:
+        bytearray: Type code (index into ROBOT_TYPES) of every robot.
+    """
+    choices = list(ROBOT_TYPES)
+    return bytearray(ROBOT_TYPES.index(rng.choice(choices)) for _ in range(num_robots))
+
+
+def create_robot(code: int, name: str, sink: Optional[EventSink] = None) -> Robot:
+    """
+    Create a robot from its type code.
+
+    Args:
+        code (int): Type code (index into ROBOT_TYPES).
+        name (str): The robot's unique identifier.
+        sink (Optional[EventSink], optional): Destination of the robot's events.
+
+    Returns:
+        Robot: The new robot.
+    """
+    return ROBOT_CLASSES[ROBOT_TYPES[code]](name, sink=sink)
+
+
+def maybe_switch_mode(robot: Robot, rng=random) -> None:
+    """
+    Switch a hybrid robot to a random mode with SWITCH_PROBABILITY; other robots draw nothing.
+
+    Args:
+        robot (Robot): The robot about to move.
+        rng (optional): Source of the random draws. Defaults to the global random module.
+    """
+    if isinstance(robot, Hybrid_Robot):
+        if rng.random() < SWITCH_PROBABILITY:
+            robot.switch_mode(rng.choice(list(MODES)))
+
+
+def simulate_robot(robot: Robot, num_actions: int, rng=random) -> Tuple[float, float]:
+    """
+    Power on a robot and run its actions, switching a hybrid's mode at random before each move.
+
+    Args:
+        robot (Robot): The robot.
+        num_actions (int): Number of actions.
+        rng (optional): Source of the random draws. Defaults to the global random module.
+
+    Returns:
+        Tuple[float, float]: Initial and final energy level of the robot.
+    """
+    initial_energy = robot.get_energy_level()
+    robot.power_on()
+    for _ in range(num_actions):
+        maybe_switch_mode(robot, rng)
+        robot.move()
+    return initial_energy, robot.get_energy_level()
+
+
+def iter_robot_records(
+    num_robots: int = 50, num_actions: int = 3, sink: Optional[EventSink] = None, rng=random, first: int = 1
+) -> Iterator[RobotRecord]:
+    """
+    Simulate a group of robot objects, yielding each robot's result as soon as it is done.
+
+    Robot types are drawn up front (as one byte per robot) but each robot object is only
+    created when it is simulated, so memory does not grow with the number of robots.
+
+    Args:
+        num_robots (int, optional): Number of robots to simulate. Defaults to 50.
+        num_actions (int, optional): Number of actions per robot. Defaults to 3.
+        sink (Optional[EventSink], optional): Destination of the per-robot and per-action events.
+            Defaults to the sink returned by get_default_sink().
+        rng (optional): Source of the random draws. Defaults to the global random module.
+        first (int, optional): Number in the name of the first robot. Defaults to 1.
+
+    Yields:
+        RobotRecord: The result of each robot, in order.
+    """
+    if sink is None:
+        sink = get_default_sink()
+
+    for i, code in enumerate(draw_robot_types(num_robots, rng)):
+        robot = create_robot(code, f"Robot-{first + i}", sink)
+        if sink.enabled:
+            sink.emit("simulate", robot.name, type=type(robot).__name__)
+        initial_energy, final_energy = simulate_robot(robot, num_actions, rng)
+        yield RobotRecord(robot.name, type(robot).__name__, initial_energy, final_energy, initial_energy - final_energy)
+    sink.flush()
+
+
+def simulate_fleet(num_robots: int = 50, num_actions: int = 3, rng=random, first: int = 1) -> Iterator[RobotRecord]:
+    """
+    Simulate a group of robots with the vectorized fleet engine.
+
+    Robots are stored as parallel NumPy arrays and every rule is applied to the whole
+    fleet at once, so no per-action output is printed. Random draws are consumed in the
+    same order as iter_robot_records, so the results are identical for the same seed.
+
+    Args:
+        num_robots (int, optional): Number of robots to simulate. Defaults to 50.
+        num_actions (int, optional): Number of actions per robot. Defaults to 3.
+        rng (optional): Source of the random draws. Defaults to the global random module.
+        first (int, optional): Number in the name of the first robot. Defaults to 1.
+
+    Yields:
+        RobotRecord: The result of each robot, in order.
+    """
+    # Imported here so the object model does not require NumPy
+    from fleet import Fleet
+
+    fleet = Fleet.from_random(num_robots, rng)
+    initial, final = fleet.simulate(num_actions, rng)
+    for i, (code, start, end) in enumerate(zip(fleet.types.tolist(), initial.tolist(), final.tolist())):
+        yield RobotRecord(f"Robot-{first + i}", TYPE_NAMES[code], start, end, start - end)
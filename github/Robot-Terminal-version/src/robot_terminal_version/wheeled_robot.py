@@ -11,7 +11,8 @@ class Wheeled_Robot(Robot):
         Checks if the robot is powered on and has sufficient energy.
         """
         if self.is_powered_on and self.energy_level >= 3.0:
-            print(f"{self.name} is rolling on wheels.")
+            if self.sink.enabled:
+                self.sink.emit("roll", self.name, energy=self.energy_level)
             self.energy_level -= 3.0
-        else:
-            print(f"{self.name} cannot roll: insufficient energy fuel or powered off.")
+        elif self.sink.enabled:
+            self.sink.emit("roll_failed", self.name, energy=self.energy_level)
@@ -0,0 +1,24 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "robot_terminal_version"))
+
+from events import NullSink
+from simulation import iter_robot_records, simulate_fleet
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42, 2024])
+@pytest.mark.parametrize("num_robots, num_actions", [(50, 3), (200, 12), (30, 40), (1, 1), (0, 3)])
+def test_fleet_matches_objects(seed, num_robots, num_actions):
+    random.seed(seed)
+    expected = list(iter_robot_records(num_robots, num_actions, sink=NullSink()))
+    random.seed(seed)
+    assert list(simulate_fleet(num_robots, num_actions)) == expected
+
+
+def test_fleet_matches_objects_with_own_stream():
+    expected = list(iter_robot_records(500, 8, sink=NullSink(), rng=random.Random(7)))
+    assert list(simulate_fleet(500, 8, rng=random.Random(7))) == expected
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "robot_terminal_version"))
+
+from scheduler import Scheduler
+
+
+def test_events_run_in_time_then_scheduling_order():
+    scheduler, log = Scheduler(), []
+    for time, name in [(2.0, "c"), (1.0, "a"), (2.0, "d"), (1.0, "b")]:
+        scheduler.schedule(time, log.append, name)
+    assert scheduler.run() == 4 and log == ["a", "b", "c", "d"] and scheduler.now == 2.0
+
+
+def test_cancel_skips_pending_events_and_len_excludes_them():
+    scheduler, log = Scheduler(), []
+    first = scheduler.schedule(1.0, log.append, "first")
+    second = scheduler.schedule(2.0, log.append, "second")
+    scheduler.cancel(second)
+    scheduler.cancel(second)
+    assert len(scheduler) == 1
+    assert scheduler.run() == 1 and log == ["first"] and len(scheduler) == 0
+
+
+def test_cancel_after_run_is_a_no_op():
+    scheduler, log = Scheduler(), []
+    events = [scheduler.schedule(float(t), log.append, t) for t in range(100)]
+    scheduler.run(until=49.0)
+    for event in events[:50]:
+        scheduler.cancel(event)
+    assert len(scheduler) == 50
+    scheduler.cancel(events[75])
+    assert len(scheduler) == 49
+    assert scheduler.run() == 49 and log == [t for t in range(100) if t != 75] and len(scheduler) == 0
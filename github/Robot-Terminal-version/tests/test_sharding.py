@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC / "robot_terminal_version"))
+sys.path.insert(0, str(SRC))
+
+import sharding
+from events import NullSink
+from robot_terminal_version import simulate_robots
+from sharding import simulate_sharded
+
+
+def summary(stats):
+    """Return the parts of EnergyStats that must not depend on how shards are scheduled."""
+    by_type = {robot_type: (s.count, s.total) for robot_type, s in stats.by_type.items()}
+    percentiles = [stats.percentile(p) for p in (1, 10, 50, 90, 99)]
+    return stats.count, stats.total, stats.mean, stats.std_dev, stats.minimum, stats.maximum, percentiles, by_type
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    """Split runs into many shards without simulating tens of thousands of robots."""
+    monkeypatch.setattr(sharding, "SHARD_SIZE", 100)
+
+
+@pytest.mark.parametrize("engine", ["objects", "fleet"])
+def test_same_totals_for_any_worker_count(small_shards, engine):
+    expected = summary(simulate_sharded(1234, 5, seed=7, workers=1, engine=engine))
+    for workers in (2, 3):
+        assert summary(simulate_sharded(1234, 5, seed=7, workers=workers, engine=engine)) == expected
+
+
+def test_shard_engines_agree(small_shards):
+    objects = simulate_sharded(1234, 5, seed=7, workers=1, engine="objects")
+    fleet = simulate_sharded(1234, 5, seed=7, workers=1, engine="fleet")
+    assert summary(fleet) == summary(objects)
+    assert objects.count == 1234
+
+
+def test_sharded_engine_rejects_a_sink():
+    with pytest.raises(ValueError):
+        simulate_robots(10, engine="sharded", sink=NullSink())
@@ -0,0 +1,66 @@
+# Imports import_module to load a submodule the first time one of its names is accessed.
+from importlib import import_module
+
+# Maps every name exported by the package to the submodule that defines it. Nothing is imported with the package
+# itself: `import matrixspark` is nearly free, `matrixspark.Matrix` loads only the core modules, and the heavier parts
+# (process pools, NumPy kernels, the solvers) load on first use.
+_EXPORTS = {
+    "Matrix": "core",
+    "CompressedStorage": "compressed",
+    "add_matrices": "operations",
+    "subtract_matrices": "operations",
+    "elementwise_multiply": "operations",
+    "elementwise_maximum": "operations",
+    "elementwise_minimum": "operations",
+    "elementwise_apply": "operations",
+    "elementwise_inplace": "operations",
+    "matmul": "operations",
+    "matrix_power": "operations",
+    "compute_determinant": "operations",
+    "compute_transpose": "operations",
+    "transposed_view": "operations",
+    "deferred": "lazy",
+    "set_workers": "parallel",
+    "BlockMatrix": "block",
+    "cg": "solvers",
+    "gmres": "solvers",
+    "bicgstab": "solvers",
+    "power_iteration": "solvers",
+    "reverse_cuthill_mckee": "reorder",
+    "approximate_minimum_degree": "reorder",
+    "permute": "reorder",
+    "bandwidth": "reorder",
+    "read_matrix_market": "ingest",
+    "read_coo": "ingest",
+    "pretty_print": "utils",
+}
+# Lists the submodules that can be reached as attributes of the package (e.g. matrixspark.solvers).
+_SUBMODULES = ("block", "compressed", "core", "decomposition", "indexing", "ingest", "lazy", "operations", "parallel",
+               "persist", "reorder", "solvers", "utils")
+
+# Lists the exported names for `from matrixspark import *`.
+__all__ = sorted(_EXPORTS)
+
+
+# Defines the module-level attribute hook (PEP 562), called only for names not yet defined in the package.
+def __getattr__(name):
+    # Loads the submodule that defines an exported name, and caches the name in the package.
+    if name in _EXPORTS:
+        # Reads the name from its submodule.
+        value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        # Caches it, so later accesses skip this hook.
+        globals()[name] = value
+        # Returns the value.
+        return value
+    # Loads a submodule accessed as an attribute (importing it also binds it in the package).
+    if name in _SUBMODULES:
+        # Returns the submodule.
+        return import_module(f".{name}", __name__)
+    # Raises an AttributeError for any other name.
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+# Defines the listing of the package's attributes, including the names that are not loaded yet.
+def __dir__():
+    # Returns the defined names together with the exported names and submodules.
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
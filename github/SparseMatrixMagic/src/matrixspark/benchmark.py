@@ -0,0 +1,515 @@
+# Imports the argparse module to read benchmark parameters from the command line.
+import argparse
+# Imports the json module to write machine-readable results and read the stored baseline.
+import json
+# Imports the math module to estimate the factorial cost of the legacy determinant.
+import math
+# Imports the os module to read the number of available CPU cores.
+import os
+# Imports the platform module to record the machine the results were measured on.
+import platform
+# Imports the random module to generate reproducible random sparse matrices.
+import random
+# Imports subprocess to measure import times in fresh interpreters.
+import subprocess
+# Imports the sys module to exit with a failure status when a regression is found.
+import sys
+# Imports the time module to measure elapsed wall-clock time with a high-resolution timer.
+import time
+# Imports the tracemalloc module to measure how much memory the matrix storage allocates.
+import tracemalloc
+
+# Imports the Matrix class from the core module to create sparse matrices for the benchmark.
+from .core import Matrix
+# Imports the functions from the operations module that are being benchmarked.
+from .operations import add_matrices, compute_determinant, compute_transpose, elementwise_multiply, matmul
+
+# Defines the sparsity patterns of the regression suite.
+PATTERNS = ("random", "banded", "power-law")
+# Defines the largest size whose determinant is measured by the regression suite (elimination fill-in grows quickly).
+DETERMINANT_MAX_SIZE = 500
+# Defines the default slowdown (as a fraction of the baseline time) tolerated before a result counts as a regression.
+TOLERANCE = 0.25
+# Defines the time below which measurements are too noisy to count as regressions.
+NOISE_FLOOR = 0.001
+# Defines the statements whose import time the import check measures, each in a fresh interpreter.
+IMPORT_STATEMENTS = (
+    "import matrixspark",
+    "from matrixspark import Matrix",
+    "from matrixspark import Matrix; Matrix(2, 2, {(0, 0): 1})([1, 1])",
+    "from matrixspark import matmul",
+)
+# Defines the modules that importing the package (or a serial product) must not load; they load on first use.
+HEAVY_MODULES = ("numpy", "concurrent.futures", "multiprocessing", "colorama")
+# Defines the default time budget of every import statement, in seconds.
+IMPORT_BUDGET = 0.05
+
+
+# Defines a function that builds a random sparse matrix with the given shape and fraction of non-zero elements.
+def random_sparse(rows, cols, density, seed=0):
+    # Creates a dedicated random generator so every run with the same seed produces the same matrix.
+    rng = random.Random(seed)
+    # Computes how many non-zero elements the matrix should contain (at least one for non-empty shapes).
+    nnz = max(1, round(rows * cols * density)) if rows and cols else 0
+    # Initializes the dictionary that will hold the non-zero elements.
+    values = {}
+    # Keeps drawing random positions until the requested number of distinct non-zero elements exists.
+    while len(values) < nnz:
+        # Stores a random non-zero integer at a random position (i, j).
+        values[(rng.randrange(rows), rng.randrange(cols))] = rng.randint(1, 9)
+    # Returns the random sparse matrix.
+    return Matrix(rows, cols, values)
+
+
+# Defines a function that builds a banded sparse matrix: every element within the half-bandwidth of the diagonal is
+# stored, with the bandwidth chosen so the fraction of non-zero elements is close to the given density.
+def banded_sparse(rows, cols, density, seed=0):
+    # Creates a dedicated random generator so every run with the same seed produces the same matrix.
+    rng = random.Random(seed)
+    # Computes the half-bandwidth that gives about density * cols elements per row.
+    half = max(0, round((density * cols - 1) / 2))
+    # Initializes the dictionary that will hold the non-zero elements.
+    values = {}
+    # Iterates over every row.
+    for i in range(rows):
+        # Iterates over the columns of the band that lie inside the matrix.
+        for j in range(max(0, i - half), min(cols, i + half + 1)):
+            # Stores a random non-zero integer.
+            values[(i, j)] = rng.randint(1, 9)
+    # Returns the banded sparse matrix.
+    return Matrix(rows, cols, values)
+
+
+# Defines a function that builds a sparse matrix whose row lengths follow a power law: the k-th longest row holds about
+# 1 / (k + 1) ** alpha of the elements, like the degree distribution of web or social graphs. The rows are shuffled.
+def power_law_sparse(rows, cols, density, seed=0, alpha=1.0):
+    # Creates a dedicated random generator so every run with the same seed produces the same matrix.
+    rng = random.Random(seed)
+    # Computes how many non-zero elements the matrix should contain in total.
+    nnz = max(1, round(rows * cols * density)) if rows and cols else 0
+    # Computes the unnormalized weight of every row rank.
+    weights = [1 / (k + 1) ** alpha for k in range(rows)]
+    # Computes the sum of the weights, to scale them to the total.
+    total = sum(weights)
+    # Assigns the row lengths to the rows in a random order.
+    order = list(range(rows))
+    # Shuffles the rows so the long ones are spread over the matrix.
+    rng.shuffle(order)
+    # Initializes the dictionary that will hold the non-zero elements.
+    values = {}
+    # Iterates over the rows with their weights.
+    for i, weight in zip(order, weights):
+        # Computes the row length, at least one element and at most one full row.
+        length = min(cols, max(1, round(nnz * weight / total)))
+        # Stores random non-zero integers in distinct random columns of the row.
+        for j in rng.sample(range(cols), length):
+            # Stores the element.
+            values[(i, j)] = rng.randint(1, 9)
+    # Returns the power-law sparse matrix.
+    return Matrix(rows, cols, values)
+
+
+# Defines a function that builds a square matrix with the given sparsity pattern, size and density.
+def make_matrix(pattern, size, density, seed=0):
+    # Builds the banded pattern.
+    if pattern == "banded":
+        # Returns the banded matrix.
+        return banded_sparse(size, size, density, seed)
+    # Builds the power-law pattern.
+    if pattern == "power-law":
+        # Returns the power-law matrix.
+        return power_law_sparse(size, size, density, seed)
+    # Returns the uniformly random pattern.
+    return random_sparse(size, size, density, seed)
+
+
+# Defines the original matmul implementation, kept only as the reference point of the benchmark.
+def legacy_matmul(a, b):
+    # Checks if the number of columns in matrix a matches the number of rows in matrix b.
+    if a.cols != b.rows:
+        # Raises a ValueError if the dimensions are incompatible for matrix multiplication.
+        raise ValueError("Matrix A's columns must match Matrix B's rows for multiplication.")
+    # Creates a new Matrix instance for the result.
+    result = Matrix(a.rows, b.cols)
+    # Iterates over every non-zero element of a, then every column and every row of b (O(nnz(a) * rows(b) * cols(b))).
+    for (i, j), a_val in a.data.items():
+        # Iterates over all column indices of matrix b.
+        for k in range(b.cols):
+            # Iterates over all row indices of matrix b.
+            for m in range(b.rows):
+                # Probes matrix b for a non-zero element at position (m, k).
+                if (m, k) in b.data:
+                    # Accumulates the product into the result at position (i, k).
+                    result[i, k] = result[i, k] + a_val * b[m, k]
+    # Returns the resulting matrix.
+    return result
+
+
+# Defines the original determinant implementation (recursive cofactor expansion), kept as the reference point.
+def legacy_determinant(matrix):
+    # Handles the base case where the matrix is 1x1.
+    if matrix.rows == 1:
+        # Returns the single element of a 1x1 matrix as its determinant.
+        return matrix[0, 0]
+    # Initializes the determinant value to 0.
+    det = 0
+    # Expands along the first row.
+    for col in range(matrix.cols):
+        # Skips zero elements of the first row.
+        if matrix[0, col] != 0:
+            # Allocates a new Matrix for the minor that excludes row 0 and the current column.
+            minor = Matrix(matrix.rows - 1, matrix.cols - 1)
+            # Copies every element outside row 0 and the current column into the minor.
+            for i in range(1, matrix.rows):
+                # Iterates over all column indices of the original matrix.
+                for j in range(matrix.cols):
+                    # Copies the element if it is stored and not in the excluded column.
+                    if j != col and (i, j) in matrix.data:
+                        # Stores the element at its shifted position in the minor.
+                        minor[i - 1, j if j < col else j - 1] = matrix[i, j]
+            # Adds the contribution of the element: (-1)^col * element * determinant of the minor.
+            det += ((-1) ** col) * matrix[0, col] * legacy_determinant(minor)
+    # Returns the computed determinant value.
+    return det
+
+
+# Defines a function that times a callable and returns the best wall-clock time over several repeats.
+def best_time(func, *args, repeat=3):
+    # Initializes the best time to infinity so the first measurement always replaces it.
+    best = float("inf")
+    # Runs the callable the requested number of times.
+    for _ in range(repeat):
+        # Records the start time.
+        start = time.perf_counter()
+        # Calls the function being measured.
+        func(*args)
+        # Keeps the smallest elapsed time, which is the least disturbed by other processes.
+        best = min(best, time.perf_counter() - start)
+    # Returns the best elapsed time in seconds.
+    return best
+
+
+# Defines the matmul benchmark comparing the row-indexed engine with the legacy triple loop.
+def benchmark_matmul(sizes, densities, legacy_limit, repeat):
+    # Prints the header of the results table.
+    print(f"{'size':>7} {'density':>8} {'nnz':>9} {'matmul (s)':>11} {'legacy (s)':>11} {'speedup':>8}")
+    # Iterates over every requested matrix size.
+    for size in sizes:
+        # Iterates over every requested density.
+        for density in densities:
+            # Builds the left operand with a fixed seed.
+            a = random_sparse(size, size, density, seed=1)
+            # Builds the right operand with a different fixed seed.
+            b = random_sparse(size, size, density, seed=2)
+            # Times the row-indexed matmul implementation.
+            fast = best_time(matmul, a, b, repeat=repeat)
+            # Estimates the work of the legacy implementation, which is nnz(a) * rows(b) * cols(b) dictionary probes.
+            legacy_work = len(a.data) * b.rows * b.cols
+            # Times the legacy implementation only when it can finish in reasonable time.
+            slow = best_time(legacy_matmul, a, b, repeat=1) if legacy_work <= legacy_limit else None
+            # Formats the legacy time, or marks it as skipped.
+            slow_text = f"{slow:11.4f}" if slow is not None else f"{'skipped':>11}"
+            # Formats the speedup, or leaves it empty when the legacy run was skipped.
+            speedup_text = f"{slow / fast:7.1f}x" if slow is not None and fast > 0 else f"{'-':>8}"
+            # Prints one row of the results table.
+            print(f"{size:>7} {density:>8} {len(a.data):>9} {fast:11.4f} {slow_text} {speedup_text}")
+
+
+# Defines the determinant benchmark comparing sparse LU elimination with the legacy cofactor expansion.
+def benchmark_determinant(sizes, densities, legacy_limit, repeat):
+    # Prints the header of the results table.
+    print(f"{'size':>7} {'density':>8} {'nnz':>9} {'lu (s)':>11} {'legacy (s)':>11} {'speedup':>8}")
+    # Iterates over every requested matrix size.
+    for size in sizes:
+        # Iterates over every requested density.
+        for density in densities:
+            # Builds the matrix with a fixed seed, adding the identity so sparse matrices are not trivially singular.
+            matrix = random_sparse(size, size, density, seed=1)
+            # Iterates over the diagonal.
+            for i in range(size):
+                # Adds 10 to the diagonal element.
+                matrix[i, i] = matrix[i, i] + 10
+            # Times the LU determinant in floating point, which is how large matrices are handled.
+            fast = best_time(compute_determinant, matrix, False, repeat=repeat)
+            # Estimates the work of the legacy implementation, which grows like n! for dense matrices.
+            legacy_work = math.factorial(size) * size
+            # Times the legacy implementation only when it can finish in reasonable time.
+            slow = best_time(legacy_determinant, matrix, repeat=1) if legacy_work <= legacy_limit else None
+            # Formats the legacy time, or marks it as skipped.
+            slow_text = f"{slow:11.4f}" if slow is not None else f"{'skipped':>11}"
+            # Formats the speedup, or leaves it empty when the legacy run was skipped.
+            speedup_text = f"{slow / fast:7.1f}x" if slow is not None and fast > 0 else f"{'-':>8}"
+            # Prints one row of the results table.
+            print(f"{size:>7} {density:>8} {len(matrix.data):>9} {fast:11.4f} {slow_text} {speedup_text}")
+
+
+# Defines the parallel benchmark measuring the speedup from 1 to N workers on a large random sparse matrix.
+def benchmark_parallel(size, density, max_workers, repeat):
+    # Builds the left operand with a fixed seed and freezes it, as parallel runs work on CSR buffers.
+    a = random_sparse(size, size, density, seed=1).freeze()
+    # Builds the right operand with a different fixed seed.
+    b = random_sparse(size, size, density, seed=2).freeze()
+    # Builds a vector with one element per column.
+    vector = [float(j % 7) for j in range(size)]
+    # Lists the operations to measure, each as a function of the number of workers.
+    cases = {
+        "matmul": lambda workers: matmul(a, b, workers=workers),
+        "add_matrices": lambda workers: add_matrices(a, b, workers=workers),
+        "elementwise_multiply": lambda workers: elementwise_multiply(a, b, workers=workers),
+        "matvec": lambda workers: a(vector, workers=workers),
+    }
+    # Prints the benchmark parameters.
+    print(f"size={size} density={density} nnz={a.nnz} cores={os.cpu_count()}")
+    # Prints the header of the results table.
+    print(f"{'operation':>22} {'workers':>8} {'time (s)':>10} {'speedup':>8}")
+    # Iterates over the operations.
+    for name, case in cases.items():
+        # Initializes the serial time, which is the reference of the speedup.
+        serial = None
+        # Iterates over the worker counts.
+        for workers in range(1, max_workers + 1):
+            # Runs the operation once so the worker pool is started before timing.
+            case(workers)
+            # Times the operation.
+            elapsed = best_time(case, workers, repeat=repeat)
+            # Remembers the serial time.
+            serial = elapsed if serial is None else serial
+            # Prints one row of the results table.
+            print(f"{name:>22} {workers:>8} {elapsed:10.4f} {serial / elapsed:7.2f}x")
+
+
+# Defines the memory benchmark comparing the dictionary storage with the frozen CSR storage.
+def benchmark_memory(sizes, densities):
+    # Prints the header of the results table.
+    print(f"{'size':>7} {'density':>8} {'nnz':>9} {'dict (MB)':>10} {'csr (MB)':>9} {'ratio':>7}")
+    # Iterates over every requested matrix size.
+    for size in sizes:
+        # Iterates over every requested density.
+        for density in densities:
+            # Starts tracing memory allocations.
+            tracemalloc.start()
+            # Builds the matrix in dictionary form.
+            matrix = random_sparse(size, size, density, seed=1)
+            # Reads the memory held by the dictionary form.
+            dict_bytes = tracemalloc.get_traced_memory()[0]
+            # Compresses the matrix into CSR storage, which drops the dictionary.
+            matrix.freeze("csr")
+            # Reads the memory held by the CSR form.
+            csr_bytes = tracemalloc.get_traced_memory()[0]
+            # Stops tracing memory allocations.
+            tracemalloc.stop()
+            # Prints one row of the results table.
+            print(f"{size:>7} {density:>8} {matrix.compressed().nnz:>9} {dict_bytes / 2 ** 20:10.2f} "
+                  f"{csr_bytes / 2 ** 20:9.2f} {dict_bytes / max(csr_bytes, 1):6.1f}x")
+
+
+# Defines the regression suite: times every operation over the grid of sizes, densities and patterns and returns one
+# result dictionary per measurement.
+def benchmark_suite(sizes, densities, patterns, repeat):
+    # Initializes the list of results.
+    results = []
+    # Prints the header of the results table.
+    print(f"{'operation':>22} {'pattern':>10} {'size':>7} {'density':>8} {'nnz':>9} {'time (s)':>10}")
+    # Iterates over every requested pattern.
+    for pattern in patterns:
+        # Iterates over every requested matrix size.
+        for size in sizes:
+            # Iterates over every requested density.
+            for density in densities:
+                # Builds the left operand with a fixed seed.
+                a = make_matrix(pattern, size, density, seed=1)
+                # Builds the right operand with a different fixed seed.
+                b = make_matrix(pattern, size, density, seed=2)
+                # Builds a vector with one element per column.
+                vector = [float(j % 7) for j in range(size)]
+                # Lists the operations to measure, each as a function without arguments.
+                cases = {
+                    "matmul": lambda: matmul(a, b),
+                    "add_matrices": lambda: add_matrices(a, b),
+                    "elementwise_multiply": lambda: elementwise_multiply(a, b),
+                    "compute_transpose": lambda: compute_transpose(a),
+                    "matvec": lambda: a(vector),
+                }
+                # Adds the determinant for sizes that finish in reasonable time.
+                if size <= DETERMINANT_MAX_SIZE:
+                    # Builds a copy with a dominant diagonal so sparse matrices are not trivially singular.
+                    square = Matrix(size, size, dict(a.data))
+                    # Iterates over the diagonal.
+                    for i in range(size):
+                        # Adds 10 to the diagonal element.
+                        square[i, i] = square[i, i] + 10
+                    # Measures the floating-point LU determinant.
+                    cases["compute_determinant"] = lambda: compute_determinant(square, False)
+                # Iterates over the operations.
+                for operation, case in cases.items():
+                    # Times the operation.
+                    elapsed = best_time(case, repeat=repeat)
+                    # Records the result.
+                    results.append({"operation": operation, "pattern": pattern, "size": size, "density": density,
+                                    "nnz": a.nnz, "seconds": elapsed})
+                    # Prints one row of the results table.
+                    print(f"{operation:>22} {pattern:>10} {size:>7} {density:>8} {a.nnz:>9} {elapsed:10.4f}")
+    # Returns the results.
+    return results
+
+
+# Defines a function that writes the results as JSON, together with a description of the machine.
+def write_results(results, path):
+    # Builds the document.
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    # Opens the file for writing.
+    with open(path, "w") as file:
+        # Writes the document, indented so baselines diff cleanly under version control.
+        json.dump(document, file, indent=2)
+
+
+# Defines a function that compares the results with a baseline written by write_results and returns the regressions:
+# measurements that are more than tolerance (e.g. 0.25 = 25%) slower than the baseline. Measurements missing from the
+# baseline, and measurements faster than NOISE_FLOOR, are reported but never count as regressions.
+def compare_baseline(results, path, tolerance=TOLERANCE):
+    # Opens the baseline file.
+    with open(path) as file:
+        # Indexes the baseline measurements by operation, pattern, size and density.
+        baseline = {(r["operation"], r["pattern"], r["size"], r["density"]): r["seconds"]
+                    for r in json.load(file)["results"]}
+    # Initializes the list of regressions.
+    regressions = []
+    # Prints the header of the comparison table.
+    print(f"{'operation':>22} {'pattern':>10} {'size':>7} {'density':>8} {'baseline':>10} {'now':>10} {'change':>8}")
+    # Iterates over the results.
+    for result in results:
+        # Reads the baseline time of the same measurement.
+        before = baseline.get((result["operation"], result["pattern"], result["size"], result["density"]))
+        # Formats the baseline time, or marks the measurement as new.
+        before_text = f"{before:10.4f}" if before is not None else f"{'new':>10}"
+        # Computes the relative change, or leaves it empty for new measurements.
+        change = result["seconds"] / before - 1 if before else None
+        # Formats the relative change.
+        change_text = f"{change:+7.0%}" if change is not None else f"{'-':>8}"
+        # Records the regression if the measurement slowed down by more than the tolerance and is long enough to trust.
+        if change is not None and change > tolerance and result["seconds"] >= NOISE_FLOOR:
+            # Adds the result with its baseline time.
+            regressions.append(dict(result, baseline=before))
+            # Marks the row.
+            change_text += " !"
+        # Prints one row of the comparison table.
+        print(f"{result['operation']:>22} {result['pattern']:>10} {result['size']:>7} {result['density']:>8} "
+              f"{before_text} {result['seconds']:10.4f} {change_text}")
+    # Returns the regressions.
+    return regressions
+
+
+# Defines a function that runs every statement of IMPORT_STATEMENTS in fresh interpreters and returns the failures:
+# statements slower than budget (best of repeat runs, timed inside the interpreter so its startup is not counted) or
+# that load one of HEAVY_MODULES. Short-lived command-line tools pay this cost in every process.
+def benchmark_imports(budget=IMPORT_BUDGET, repeat=5):
+    # Builds the code run by every interpreter: it times the statement and lists the heavy modules it loaded.
+    probe = ("import json, sys, time\nstart = time.perf_counter()\nexec(sys.argv[1])\n"
+             "print(json.dumps([time.perf_counter() - start, [m for m in sys.argv[2:] if m in sys.modules]]))")
+    # Makes the package importable from the directory that contains it.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [os.path.dirname(os.path.dirname(os.path.abspath(__file__))), os.environ.get("PYTHONPATH")])))
+    # Initializes the list of failures.
+    failures = []
+    # Prints the header of the table.
+    print(f"{'statement':<70} {'ms':>8}  heavy modules loaded")
+    # Iterates over the statements.
+    for statement in IMPORT_STATEMENTS:
+        # Runs the statement repeat times, keeping the fastest run.
+        runs = [json.loads(subprocess.run([sys.executable, "-c", probe, statement, *HEAVY_MODULES], env=env,
+                                          capture_output=True, text=True, check=True).stdout)
+                for _ in range(repeat)]
+        # Reads the fastest time and the heavy modules loaded.
+        seconds, modules = min(runs)
+        # Prints the row.
+        print(f"{statement:<70} {seconds * 1000:8.2f}  {', '.join(modules) or '-'}")
+        # Records the statement if it is over budget or loaded a heavy module.
+        if seconds > budget or modules:
+            # Adds the failure.
+            failures.append((statement, seconds, modules))
+    # Returns the failures.
+    return failures
+
+
+# Runs the benchmark when the file is executed as a script.
+if __name__ == "__main__":
+    # Creates the command-line parser.
+    parser = argparse.ArgumentParser(description="Benchmark matrixspark operations and storage.")
+    # Adds the benchmark to run: matmul speed against the legacy implementation, or dictionary vs CSR memory.
+    parser.add_argument("suite", nargs="?", choices=["matmul", "determinant", "parallel", "memory", "suite", "imports"],
+                        default="matmul")
+    # Adds the list of square matrix sizes to benchmark (each suite has its own default).
+    parser.add_argument("--sizes", type=int, nargs="+")
+    # Adds the list of densities (fraction of non-zero elements) to benchmark (each suite has its own default).
+    parser.add_argument("--densities", type=float, nargs="+")
+    # Adds the maximum legacy work (dictionary probes) before the legacy run is skipped.
+    parser.add_argument("--legacy-limit", type=int, default=20_000_000)
+    # Adds the number of repeats for each measurement.
+    parser.add_argument("--repeat", type=int, default=3)
+    # Adds the largest number of workers of the parallel benchmark.
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    # Adds the sparsity patterns of the regression suite.
+    parser.add_argument("--patterns", nargs="+", choices=PATTERNS, default=list(PATTERNS))
+    # Adds the file the regression suite writes its JSON results to.
+    parser.add_argument("--json")
+    # Adds the baseline JSON file the regression suite compares against.
+    parser.add_argument("--baseline")
+    # Adds the tolerated slowdown before a result counts as a regression.
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    # Adds the time budget of every import statement of the import check, in seconds.
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET)
+    # Parses the command-line arguments.
+    args = parser.parse_args()
+    # Runs the determinant benchmark if it was requested, scaling from 3x3 to 500x500 by default.
+    if args.suite == "determinant":
+        # Compares sparse LU elimination with the legacy cofactor expansion.
+        benchmark_determinant(args.sizes or [3, 5, 8, 9, 10, 50, 100, 200, 500], args.densities or [0.05, 1.0],
+                              args.legacy_limit, args.repeat)
+    # Runs the parallel benchmark if it was requested, on the first size and density given.
+    elif args.suite == "parallel":
+        # Measures the speedup from 1 to --max-workers workers.
+        benchmark_parallel((args.sizes or [5000])[0], (args.densities or [0.002])[0], args.max_workers, args.repeat)
+    # Runs the regression suite if it was requested.
+    elif args.suite == "suite":
+        # Measures every operation over the grid of sizes, densities and patterns.
+        results = benchmark_suite(args.sizes or [100, 1000], args.densities or [0.001, 0.01], args.patterns,
+                                  args.repeat)
+        # Writes the results as JSON if a file was given.
+        if args.json:
+            # Writes the results.
+            write_results(results, args.json)
+        # Compares the results with the baseline if one was given.
+        if args.baseline:
+            # Finds the regressions.
+            regressions = compare_baseline(results, args.baseline, args.tolerance)
+            # Exits with a failure status when a measurement regressed, so CI can catch it.
+            if regressions:
+                # Prints the number of regressions.
+                print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}.")
+                # Exits with status 1.
+                sys.exit(1)
+    # Runs the import check if it was requested.
+    elif args.suite == "imports":
+        # Measures every import statement.
+        failures = benchmark_imports(args.budget, args.repeat)
+        # Exits with a failure status when a statement is over budget or loads a heavy module, so CI can catch it.
+        if failures:
+            # Prints the number of failures.
+            print(f"{len(failures)} import statement(s) over the {args.budget * 1000:.0f} ms budget or loading "
+                  f"heavy modules.")
+            # Exits with status 1.
+            sys.exit(1)
+    # Runs the memory benchmark if it was requested.
+    elif args.suite == "memory":
+        # Compares the memory of the dictionary and CSR storage.
+        benchmark_memory(args.sizes or [100, 1000], args.densities or [0.001, 0.01, 0.05])
+    # Otherwise runs the matmul benchmark.
+    else:
+        # Runs the matmul benchmark with the parsed parameters.
+        benchmark_matmul(args.sizes or [10, 50, 100, 500, 1000], args.densities or [0.001, 0.01, 0.1],
+                         args.legacy_limit, args.repeat)
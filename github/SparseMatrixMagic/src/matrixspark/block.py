@@ -0,0 +1,342 @@
+# Imports array to store the block offsets in a compact typed buffer.
+from array import array
+# Imports bisect_left to binary-search the sorted block columns of a block row.
+from bisect import bisect_left
+# Imports mul to compute the dot products of tile rows with map.
+from operator import mul
+
+# Imports the compressed storage, used to convert block matrices to and from the scalar CSR form.
+from .compressed import CompressedStorage, _check_out, _index_array, _value_array
+# Imports the Matrix class, which block matrices are converted from and to.
+from .core import Matrix
+
+
+# Defines a block compressed sparse row (BSR) matrix: the matrix is split into tiles of r x c elements, and only the
+# tiles holding non-zero elements are stored, each as r * c contiguous values in row-major order. Block rows are
+# compressed like CSR rows, so there is one column index per tile instead of one per element. Meshes with 3x3 or
+# 6x6 couplings need 9 or 36 times fewer indices than the CSR form, and the kernels work on whole tiles.
+class BlockMatrix:
+    # Constructor method to wrap already-compressed block buffers.
+    def __init__(self, rows, cols, blocksize, indptr, indices, values):
+        # Reads the tile shape.
+        r, c = blocksize
+        # Checks that the tiles cover the matrix exactly.
+        if r <= 0 or c <= 0 or rows % r or cols % c:
+            # Raises a ValueError for block sizes that do not divide the shape.
+            raise ValueError(f"Block size {blocksize} must divide the matrix shape ({rows}, {cols}).")
+        # Stores the number of rows of the matrix.
+        self.rows = rows
+        # Stores the number of columns of the matrix.
+        self.cols = cols
+        # Stores the tile shape as (rows, columns).
+        self.blocksize = (r, c)
+        # Stores the offsets where each block row starts; it has one more entry than there are block rows.
+        self.indptr = indptr
+        # Stores the block column of every stored tile, sorted within each block row.
+        self.indices = indices
+        # Stores the values of every tile, r * c per tile in row-major order, aligned with indices.
+        self.values = values
+
+    # Defines a class method that splits a Matrix (in any storage format) into tiles of the given shape.
+    @classmethod
+    def from_matrix(cls, matrix, blocksize=(3, 3)):
+        # Reads the tile shape.
+        r, c = blocksize
+        # Checks that the tiles cover the matrix exactly.
+        if r <= 0 or c <= 0 or matrix.rows % r or matrix.cols % c:
+            # Raises a ValueError for block sizes that do not divide the shape.
+            raise ValueError(f"Block size {blocksize} must divide the matrix shape ({matrix.rows}, {matrix.cols}).")
+        # Initializes the tiles of every block row, keyed by block column.
+        tiles = [{} for _ in range(matrix.rows // r)]
+        # Iterates over the stored elements of the matrix.
+        for (i, j), value in matrix.items():
+            # Reads the tiles of the element's block row.
+            row = tiles[i // r]
+            # Creates the element's tile filled with zeros on first use.
+            if j // c not in row:
+                # Stores the zero tile.
+                row[j // c] = [0] * (r * c)
+            # Stores the element at its position inside the tile.
+            row[j // c][(i % r) * c + j % c] = value
+        # Returns the block matrix built from the tiles.
+        return cls._pack(matrix.rows, matrix.cols, (r, c), tiles)
+
+    # Defines a class method that packs one {block column: tile values} dictionary per block row into a block matrix.
+    @classmethod
+    def _pack(cls, rows, cols, blocksize, tiles):
+        # Initializes the block row offsets with the start of the first block row.
+        indptr = array("q", [0])
+        # Initializes the block column indices.
+        indices = _index_array(cols)
+        # Initializes the list of tile values.
+        values = []
+        # Iterates over the block rows in order.
+        for row in tiles:
+            # Iterates over the row's tiles in block column order.
+            for bj in sorted(row):
+                # Stores the tile only if it holds a non-zero element (products may cancel out).
+                if any(row[bj]):
+                    # Appends the block column.
+                    indices.append(bj)
+                    # Appends the tile's values.
+                    values.extend(row[bj])
+            # Records where the next block row starts.
+            indptr.append(len(indices))
+        # Returns the block matrix with its values in the most compact buffer.
+        return cls(rows, cols, blocksize, indptr, indices, _value_array(values))
+
+    # Defines a property that returns the number of stored tiles.
+    @property
+    def nblocks(self):
+        # Returns the length of the block column index buffer.
+        return len(self.indices)
+
+    # Defines a property that returns the number of stored values, zeros inside stored tiles included.
+    @property
+    def nnz(self):
+        # Returns the number of tiles times the tile size.
+        return len(self.values)
+
+    # Defines a property that returns the memory held by the index and value buffers, in bytes.
+    @property
+    def nbytes(self):
+        # Adds the byte size of every buffer (Python object values count as one pointer each).
+        return sum(len(buffer) * getattr(buffer, "itemsize", 8) for buffer in (self.indptr, self.indices, self.values))
+
+    # Defines how to read an element with matrix[i, j].
+    def __getitem__(self, idx):
+        # Unpacks the index tuple into row (i) and column (j) indices.
+        i, j = idx
+        # Reads the tile shape.
+        r, c = self.blocksize
+        # Reads the range of tiles of the element's block row.
+        start, stop = self.indptr[i // r], self.indptr[i // r + 1]
+        # Binary-searches the element's block column among the tiles of the row.
+        k = bisect_left(self.indices, j // c, start, stop)
+        # Returns the element if its tile is stored, otherwise 0.
+        return self.values[k * r * c + (i % r) * c + j % c] if k < stop and self.indices[k] == j // c else 0
+
+    # Defines a method that converts the block matrix into a frozen CSR Matrix, dropping the zeros inside tiles.
+    def to_matrix(self):
+        # Reads the tile shape.
+        r, c = self.blocksize
+        # Initializes the row and column index buffers and the value list of the stored non-zero elements.
+        row_indices, col_indices, values = array("q"), array("q"), []
+        # Iterates over the block rows.
+        for bi in range(self.rows // r):
+            # Iterates over the tiles of the block row.
+            for k in range(self.indptr[bi], self.indptr[bi + 1]):
+                # Iterates over the positions of the tile.
+                for offset in range(r * c):
+                    # Reads the value at the position.
+                    value = self.values[k * r * c + offset]
+                    # Keeps only non-zero values.
+                    if value != 0:
+                        # Stores the row index.
+                        row_indices.append(bi * r + offset // c)
+                        # Stores the column index.
+                        col_indices.append(self.indices[k] * c + offset % c)
+                        # Stores the value.
+                        values.append(value)
+        # Returns the frozen matrix built from the coordinates.
+        return Matrix.from_storage(CompressedStorage.from_coo(self.rows, self.cols, row_indices, col_indices,
+                                                              _value_array(values)))
+
+    # Defines the matrix-vector product (matrix(vector)): every stored tile multiplies one slice of the vector. NumPy
+    # input runs all tile products in one vectorized pass; list input is overwritten into out if it is given.
+    def __call__(self, vector, out=None):
+        # Checks that the vector has one element per column.
+        if len(vector) != self.cols:
+            # Raises a ValueError if the vector has the wrong length.
+            raise ValueError("Vector length must match matrix column count.")
+        # Uses the vectorized kernel for NumPy arrays.
+        if hasattr(vector, "ndim"):
+            # Returns the result of the vectorized kernel.
+            return bsr_matvec_numpy(self, vector, out)
+        # Returns the result of the pure Python kernel.
+        return bsr_matvec(self, vector, out)
+
+    # Defines a method that returns the transpose as a block matrix with transposed tiles.
+    def transpose(self):
+        # Returns the result of the transpose kernel.
+        return bsr_transpose(self)
+
+    # Defines the matrix multiplication operator for two block matrices.
+    def __matmul__(self, other):
+        # Multiplies block matrices with the tiled kernel.
+        if isinstance(other, BlockMatrix):
+            # Returns the product.
+            return bsr_matmul(self, other)
+        # Applies the matrix to vectors.
+        return self(other)
+
+
+# Defines the pure Python matrix-vector kernel: one small dense product per stored tile.
+def bsr_matvec(matrix, vector, out=None):
+    # Reads the tile shape.
+    r, c = matrix.blocksize
+    # Reads the buffers into local variables for faster access in the loop.
+    indptr, indices, values = matrix.indptr, matrix.indices, matrix.values
+    # Uses a new result list with one entry per row, unless a preallocated buffer was given.
+    if out is None:
+        # Allocates the result list.
+        out = [0] * matrix.rows
+    # Otherwise checks the preallocated buffer, which is overwritten.
+    else:
+        # Checks the length of the buffer.
+        _check_out(out, matrix.rows)
+        # Sets every entry of the buffer to 0.
+        out[:] = [0] * matrix.rows
+    # Iterates over the block rows.
+    for bi in range(matrix.rows // r):
+        # Iterates over the tiles of the block row.
+        for k in range(indptr[bi], indptr[bi + 1]):
+            # Reads the slice of the vector that the tile multiplies.
+            x = vector[indices[k] * c:indices[k] * c + c]
+            # Reads the position of the tile's first value.
+            offset = k * r * c
+            # Iterates over the rows of the tile.
+            for ii in range(r):
+                # Adds the dot product of the tile row with the vector slice to the result.
+                out[bi * r + ii] += sum(map(mul, values[offset + ii * c:offset + ii * c + c], x))
+    # Returns the resulting vector.
+    return out
+
+
+# Defines the NumPy matrix-vector kernel: the tiles are viewed as an (nblocks, r, c) array, multiplied with the
+# gathered vector slices in one batched product and summed per block row.
+def bsr_matvec_numpy(matrix, vector, out=None):
+    # Imports NumPy here, since it is only needed (and already loaded by the caller) for NumPy input.
+    import numpy as np
+    # Reads the tile shape.
+    r, c = matrix.blocksize
+    # Views the block row offsets as an array without copying them.
+    indptr = np.asarray(matrix.indptr)
+    # Views the tiles as a 3-D array (typed buffers are not copied).
+    tiles = np.asarray(matrix.values).reshape(-1, r, c)
+    # Gathers the vector slice of every tile (shape nblocks x c).
+    slices = vector.reshape(-1, c)[np.asarray(matrix.indices)]
+    # Multiplies every tile with its slice (shape nblocks x r).
+    products = np.einsum("kij,kj->ki", tiles, slices)
+    # Computes the result type of the products.
+    dtype = np.result_type(tiles.dtype, vector.dtype)
+    # Uses a new result array unless a preallocated buffer was given.
+    if out is None:
+        # Allocates the result.
+        out = np.empty(matrix.rows, dtype=dtype)
+    # Otherwise checks that the preallocated buffer has one entry per row.
+    elif out.shape != (matrix.rows,):
+        # Raises a ValueError if the buffer has the wrong shape.
+        raise ValueError(f"Output buffer shape must be {(matrix.rows,)} for this input.")
+    # Views the result as one row of r elements per block row.
+    result = out.reshape(-1, r)
+    # Clears the result, since block rows without tiles are not written below.
+    result[...] = 0
+    # Finds the block rows that have at least one tile.
+    nonempty = np.flatnonzero(indptr[1:] != indptr[:-1])
+    # Sums the tile products of every non-empty block row.
+    if len(nonempty):
+        # Writes the sums into the result.
+        result[nonempty] = np.add.reduceat(products, indptr[nonempty], axis=0)
+    # Returns the result.
+    return out
+
+
+# Defines the transpose kernel: a counting sort of the tiles by block column, with every tile transposed.
+def bsr_transpose(matrix):
+    # Reads the tile shape.
+    r, c = matrix.blocksize
+    # Reads the number of block columns, which become block rows.
+    n_block_cols = matrix.cols // c
+    # Counts the tiles of every block column.
+    counts = [0] * (n_block_cols + 1)
+    # Iterates over the block column indices.
+    for bj in matrix.indices:
+        # Counts the tile one slot ahead, so the prefix sum gives the start offsets.
+        counts[bj + 1] += 1
+    # Turns the counts into start offsets.
+    for bj in range(n_block_cols):
+        # Adds the previous offset.
+        counts[bj + 1] += counts[bj]
+    # Copies the offsets as the block row offsets of the transpose.
+    indptr = array("q", counts)
+    # Allocates the block column indices of the transpose.
+    indices = _index_array(matrix.rows, [0] * len(matrix.indices))
+    # Allocates the tile values of the transpose, in the same buffer type.
+    values = (array(matrix.values.typecode, matrix.values) if hasattr(matrix.values, "typecode")
+              else list(matrix.values))
+    # Iterates over the block rows of the matrix, so every block row of the transpose receives its tiles in order.
+    for bi in range(matrix.rows // r):
+        # Iterates over the tiles of the block row.
+        for k in range(matrix.indptr[bi], matrix.indptr[bi + 1]):
+            # Takes the next free slot of the tile's block column.
+            slot = counts[matrix.indices[k]]
+            # Advances the slot.
+            counts[matrix.indices[k]] += 1
+            # Stores the block row as the block column of the transposed tile.
+            indices[slot] = bi
+            # Copies the tile transposed (element (ii, jj) of the tile goes to (jj, ii)).
+            for ii in range(r):
+                # Iterates over the columns of the tile.
+                for jj in range(c):
+                    # Copies the element.
+                    values[slot * r * c + jj * r + ii] = matrix.values[k * r * c + ii * c + jj]
+    # Returns the transpose, whose tiles are c x r.
+    return BlockMatrix(matrix.cols, matrix.rows, (c, r), indptr, indices, values)
+
+
+# Defines the tiled matrix multiplication kernel (Gustavson's algorithm over block rows): every tile of a block row of
+# a is multiplied with the tiles of the matching block row of b, and the tile products are accumulated per block column.
+def bsr_matmul(a, b):
+    # Checks that the matrices can be multiplied.
+    if a.cols != b.rows:
+        # Raises a ValueError if the dimensions are incompatible.
+        raise ValueError("Matrix A's columns must match Matrix B's rows for multiplication.")
+    # Checks that the tiles line up along the inner dimension.
+    if a.blocksize[1] != b.blocksize[0]:
+        # Raises a ValueError if the tile shapes are incompatible.
+        raise ValueError("Block sizes must match along the inner dimension for multiplication.")
+    # Reads the tile shapes: a has r x m tiles and b has m x c tiles.
+    (r, m), c = a.blocksize, b.blocksize[1]
+    # Reads the buffers of both matrices.
+    a_indptr, a_indices, a_values = a.indptr, a.indices, a.values
+    # Reads the buffers of b.
+    b_indptr, b_indices, b_values = b.indptr, b.indices, b.values
+    # Initializes the accumulated tiles of every block row of the result.
+    tiles = []
+    # Iterates over the block rows of a.
+    for bi in range(a.rows // r):
+        # Initializes the accumulators of the block row, keyed by block column.
+        row = {}
+        # Iterates over the tiles of the block row of a.
+        for ka in range(a_indptr[bi], a_indptr[bi + 1]):
+            # Reads the block row of b that the tile multiplies.
+            bk = a_indices[ka]
+            # Reads the tile of a.
+            left = a_values[ka * r * m:(ka + 1) * r * m]
+            # Iterates over the tiles of that block row of b.
+            for kb in range(b_indptr[bk], b_indptr[bk + 1]):
+                # Reads the tile of b.
+                right = b_values[kb * m * c:(kb + 1) * m * c]
+                # Reads (or creates) the accumulator of the block column.
+                target = row.get(b_indices[kb])
+                # Creates the accumulator filled with zeros on first use.
+                if target is None:
+                    # Stores the zero tile.
+                    target = row[b_indices[kb]] = [0] * (r * c)
+                # Adds the product of the two tiles to the accumulator.
+                for ii in range(r):
+                    # Iterates over the inner dimension.
+                    for kk in range(m):
+                        # Reads the element of a, skipping zeros inside the tile.
+                        value = left[ii * m + kk]
+                        # Skips zero elements.
+                        if value:
+                            # Iterates over the columns of the tile of b.
+                            for jj in range(c):
+                                # Accumulates the product.
+                                target[ii * c + jj] += value * right[kk * c + jj]
+        # Stores the block row.
+        tiles.append(row)
+    # Returns the product packed into a block matrix of r x c tiles.
+    return BlockMatrix._pack(a.rows, b.cols, (r, c), tiles)
@@ -0,0 +1,903 @@
+# Imports the array type to store indices and values in compact, typed buffers instead of Python dictionaries.
+from array import array
+# Imports bisect_left to binary-search the sorted column (or row) indices of a compressed row (or column).
+from bisect import bisect_left
+# Imports accumulate to turn per-row counts into starting offsets.
+from itertools import accumulate
+# Imports the arithmetic operators used by the named element-wise operations.
+from operator import add, mul, sub
+
+# Defines the largest value a signed 64-bit integer buffer can hold.
+_INT64_MAX = 2 ** 63 - 1
+# Defines how many temporary products the NumPy kernel computes per pass, bounding its scratch memory.
+NUMPY_CHUNK = 2 ** 22
+# Maps the name of every built-in element-wise operation to the function applied to pairs of elements.
+BINARY_OPS = {"add": add, "subtract": sub, "multiply": mul, "maximum": max, "minimum": min}
+
+
+# Defines a helper that creates an index buffer wide enough for indices up to the given bound.
+def _index_array(bound, initial=()):
+    # Uses 4-byte integers when every index fits, which halves the index memory compared to 8-byte integers.
+    return array("i" if bound < 2 ** 31 else "q", initial)
+
+
+# Maps every supported dtype to the typecode of the array buffer holding its values (None: a list of Python objects,
+# since the array module has no complex type and "object" keeps exact values such as Fraction).
+DTYPES = {"int32": "i", "int64": "q", "float32": "f", "float64": "d", "complex128": None, "object": None}
+# Maps the Python types and short names accepted as dtypes to their dtype.
+_DTYPE_ALIASES = {int: "int64", float: "float64", complex: "complex128", object: "object", "int": "int64",
+                  "float": "float64", "complex": "complex128"}
+# Maps every numeric dtype to the function that converts a value to it.
+_CASTS = {"int32": int, "int64": int, "float32": float, "float64": float, "complex128": complex}
+# Maps every buffer typecode to its dtype.
+_TYPECODE_DTYPES = {"i": "int32", "q": "int64", "f": "float32", "d": "float64"}
+
+
+# Defines a function that checks a dtype argument and returns its canonical name (None stays None, meaning inferred).
+def normalize_dtype(dtype):
+    # Resolves Python types and short names.
+    dtype = _DTYPE_ALIASES.get(dtype, dtype)
+    # Checks that the dtype is supported.
+    if dtype is not None and dtype not in DTYPES:
+        # Raises a ValueError for unknown dtypes.
+        raise ValueError(f"Unknown dtype '{dtype}', expected one of {', '.join(DTYPES)}.")
+    # Returns the canonical name.
+    return dtype
+
+
+# Defines a function that converts a value to a dtype (values of the "object" dtype are kept as they are).
+def cast_value(value, dtype):
+    # Returns the converted value.
+    return _CASTS[dtype](value) if dtype in _CASTS else value
+
+
+# Defines a function that infers the dtype of a collection of values the way _value_array stores them by default.
+def infer_dtype(values):
+    # Reads the set of value types.
+    types = {type(value) for value in values}
+    # Returns int64 for integers only, float64 for integers and floats, complex128 when complex values are mixed in.
+    for dtype, allowed in (("int64", {int}), ("float64", {int, float}), ("complex128", {int, float, complex})):
+        # Returns the first dtype that covers every value type.
+        if types <= allowed:
+            # Returns the dtype.
+            return dtype
+    # Returns object for anything else (e.g. Fraction).
+    return "object"
+
+
+# Defines a function that returns the dtype of a value buffer: from its typecode, or inferred for Python objects.
+def dtype_of(buffer):
+    # Reads the typecode of the buffer.
+    typecode = typecode_of(buffer)
+    # Returns the dtype of typed buffers, otherwise infers it from the values.
+    return _TYPECODE_DTYPES.get(typecode) or infer_dtype(buffer)
+
+
+# Defines a function that returns the dtype of the result of an operation on values of the given dtypes: object wins,
+# then complex128; float32 is kept only when every operand is float32 (like NumPy, mixing float32 with integers
+# gives float64); integers widen to int64 if any operand is int64.
+def promote_dtypes(*dtypes):
+    # Reads the set of dtypes.
+    kinds = set(dtypes)
+    # Keeps Python objects if any operand holds them.
+    if "object" in kinds:
+        # Returns the object dtype.
+        return "object"
+    # Returns complex128 if any operand is complex.
+    if "complex128" in kinds:
+        # Returns the complex dtype.
+        return "complex128"
+    # Returns a float dtype if any operand is a float.
+    if kinds & {"float32", "float64"}:
+        # Returns float32 only for float32 operands.
+        return "float32" if kinds == {"float32"} else "float64"
+    # Returns the widest integer dtype.
+    return "int64" if "int64" in kinds else "int32"
+
+
+# Defines a helper that stores values in the most compact typed buffer able to hold all of them exactly, or in the
+# buffer of the given dtype (converting every value to it).
+def _value_array(values, dtype=None):
+    # Uses the buffer of the requested dtype.
+    if dtype is not None:
+        # Reads the conversion of the dtype.
+        cast = _CASTS.get(dtype)
+        # Converts the values (object values are kept as they are).
+        values = map(cast, values) if cast else values
+        # Returns an array buffer for dtypes that have one, otherwise a list.
+        return array(DTYPES[dtype], values) if DTYPES[dtype] else list(values)
+    # Converts the values to a list so they can be inspected more than once.
+    values = list(values)
+    # Checks whether every value is a plain integer that fits in a signed 64-bit buffer.
+    if all(type(value) is int and -_INT64_MAX - 1 <= value <= _INT64_MAX for value in values):
+        # Returns a buffer of 8-byte signed integers.
+        return array("q", values)
+    # Checks whether every value is a plain integer or float, which a double buffer holds without changing its meaning.
+    if all(type(value) in (int, float) for value in values):
+        # Returns a buffer of 8-byte floats.
+        return array("d", values)
+    # Keeps any other values (e.g. Fraction or complex) as Python objects in a list.
+    return values
+
+
+# Defines a function that returns the typecode of a typed buffer (array or memoryview), or None for Python objects.
+def typecode_of(buffer):
+    # Reads the array typecode, or the memoryview format, if the buffer has one.
+    return getattr(buffer, "typecode", None) or (buffer.format if isinstance(buffer, memoryview) else None)
+
+
+# Defines a helper that slices a buffer without copying it when it supports the buffer protocol.
+def _buffer_slice(buffer, start, stop):
+    # Slices a memoryview of typed buffers (zero-copy), or the buffer itself for lists of Python objects.
+    return memoryview(buffer)[start:stop] if isinstance(buffer, (array, memoryview)) else buffer[start:stop]
+
+
+# Defines a helper that checks that position (i, j) lies inside a matrix of the given shape. Element reads, element
+# writes and compression all use it, so a position rejected by one is rejected by all of them.
+def check_index(rows, cols, i, j):
+    # Checks both indices against their dimension.
+    if not (0 <= i < rows and 0 <= j < cols):
+        # Raises an IndexError for positions out of range, like slicing does.
+        raise IndexError(f"Index ({i}, {j}) is out of range for a matrix of shape ({rows}, {cols}).")
+
+
+# Defines an array-backed compressed sparse row (CSR) or compressed sparse column (CSC) storage.
+class CompressedStorage:
+    # Constructor method to wrap already-compressed index and value buffers.
+    def __init__(self, fmt, rows, cols, indptr, indices, values):
+        # Checks that the requested format is one of the two supported compressed formats.
+        if fmt not in ("csr", "csc"):
+            # Raises a ValueError for unknown formats.
+            raise ValueError(f"Unknown compressed format '{fmt}', expected 'csr' or 'csc'.")
+        # Stores the format name ('csr' compresses rows, 'csc' compresses columns).
+        self.fmt = fmt
+        # Stores the number of rows of the matrix.
+        self.rows = rows
+        # Stores the number of columns of the matrix.
+        self.cols = cols
+        # Stores the offsets where each compressed row (or column) starts; it has one more entry than there are rows (or columns).
+        self.indptr = indptr
+        # Stores the column (or row) index of every stored element, sorted within each compressed row (or column).
+        self.indices = indices
+        # Stores the value of every stored element, aligned with indices.
+        self.values = values
+        # Stores the file the buffers are memory-mapped from, if any (set by persist.load_storage).
+        self.path = None
+        # Stores the group of storages over the same value buffer (slicing views, transposes) as a one-element list
+        # counting the live ones, or None while the buffer is private (see shared).
+        self._group = None
+
+    # Defines a property that reports whether another live storage reads the same value buffer, in which case in-place
+    # updates copy it first (see detach). Views leave the group when they are garbage-collected, so a matrix stops
+    # copying once its slices and transposes are gone.
+    @property
+    def shared(self):
+        # Returns True if the group holds another storage.
+        return self._group is not None and self._group[0] > 1
+
+    # Defines a helper that adds a new storage over this storage's buffers to its group.
+    def _join(self, other):
+        # Starts a group holding this storage on first use.
+        if self._group is None:
+            # Creates the group.
+            self._group = [1]
+        # Counts the new storage.
+        self._group[0] += 1
+        # Attaches the new storage to the group.
+        other._group = self._group
+
+    # Defines the finalizer, which removes the storage from its group when it is garbage-collected.
+    def __del__(self):
+        # Leaves the group if the buffer was shared.
+        if self._group is not None:
+            # Uncounts the storage.
+            self._group[0] -= 1
+
+    # Defines a class method that compresses a dictionary of non-zero elements keyed by (i, j).
+    @classmethod
+    def from_dict(cls, rows, cols, data, fmt="csr", dtype=None):
+        # Checks every position first, so an invalid key never reaches the buffers.
+        for i, j in data:
+            # Raises an IndexError for a position outside the matrix.
+            check_index(rows, cols, i, j)
+        # Sorts the keys by row then column for CSR, or by column then row for CSC.
+        keys = sorted(data) if fmt == "csr" else sorted(data, key=lambda key: (key[1], key[0]))
+        # Picks the number of compressed rows (or columns) and the bound of the stored indices.
+        n_major, n_minor = (rows, cols) if fmt == "csr" else (cols, rows)
+        # Picks which half of each key is the compressed (major) index and which is the stored (minor) index.
+        major_pos, minor_pos = (0, 1) if fmt == "csr" else (1, 0)
+        # Initializes the per-row (or per-column) counters, with one extra slot for the prefix sum.
+        indptr = array("q", bytes(8 * (n_major + 1)))
+        # Counts the stored elements of every compressed row (or column).
+        for key in keys:
+            # Increments the counter that follows the element's row (or column).
+            indptr[key[major_pos] + 1] += 1
+        # Turns the counts into starting offsets with a running sum.
+        for m in range(n_major):
+            # Adds the offset of the previous row (or column) to the current one.
+            indptr[m + 1] += indptr[m]
+        # Stores the minor index of every element in sorted order.
+        indices = _index_array(n_minor, (key[minor_pos] for key in keys))
+        # Stores the value of every element in the same order, in the buffer of the dtype (inferred if None).
+        values = _value_array((data[key] for key in keys), dtype)
+        # Returns the compressed storage.
+        return cls(fmt, rows, cols, indptr, indices, values)
+
+    # Defines a class method that compresses coordinate (COO) arrays of row indices, column indices and values.
+    # Duplicate positions are summed and zero results dropped; the input arrays are not modified.
+    @classmethod
+    def from_coo(cls, rows, cols, row_indices, col_indices, values, fmt="csr"):
+        # Picks the compressed (major) and stored (minor) index arrays for the format.
+        majors, minors = (row_indices, col_indices) if fmt == "csr" else (col_indices, row_indices)
+        # Picks the number of compressed rows (or columns) and the bound of the stored indices.
+        n_major, n_minor = (rows, cols) if fmt == "csr" else (cols, rows)
+        # Initializes the per-row (or per-column) counters, with one extra slot for the prefix sum.
+        indptr = array("q", bytes(8 * (n_major + 1)))
+        # Counts the elements of every compressed row (or column).
+        for major in majors:
+            # Increments the counter that follows the element's row (or column).
+            indptr[major + 1] += 1
+        # Turns the counts into starting offsets with a running sum.
+        for m in range(n_major):
+            # Adds the offset of the previous row (or column) to the current one.
+            indptr[m + 1] += indptr[m]
+        # Copies the starting offsets into the insertion cursors of every row (or column).
+        cursor = array("q", indptr)
+        # Allocates the index buffer, filled with zeros so every slot can be assigned out of order.
+        indices = _index_array(n_minor)
+        # Fills the index buffer with zeros.
+        indices.frombytes(bytes(indices.itemsize * len(majors)))
+        # Allocates the value buffer with the same type as the input values.
+        out_values = array(typecode_of(values), values) if typecode_of(values) else list(values)
+        # Scatters every element into its row (or column), a linear-time counting sort.
+        for k in range(len(majors)):
+            # Reads the destination slot of the element.
+            dest = cursor[majors[k]]
+            # Stores the element's minor index.
+            indices[dest] = minors[k]
+            # Stores the element's value.
+            out_values[dest] = values[k]
+            # Advances the insertion cursor of that row (or column).
+            cursor[majors[k]] = dest + 1
+        # Releases the cursors before the compaction pass.
+        del cursor
+        # Initializes the write position of the compaction pass.
+        write = 0
+        # Initializes the start of the current row (or column) before compaction.
+        start = 0
+        # Iterates over every compressed row (or column).
+        for m in range(n_major):
+            # Reads the end of the row (or column) before compaction.
+            end = indptr[m + 1]
+            # Orders the row's elements by minor index (the sort is stable, so duplicates keep their input order).
+            order = sorted(range(start, end), key=indices.__getitem__)
+            # Reads the row's minor indices in sorted order.
+            row_indices = [indices[k] for k in order]
+            # Reads the row's values in sorted order.
+            row_values = [out_values[k] for k in order]
+            # Records where the compacted row starts.
+            indptr[m] = write
+            # Initializes the position within the sorted row.
+            k = 0
+            # Walks the sorted row, merging runs of the same minor index.
+            while k < len(row_indices):
+                # Reads the minor index of the run.
+                minor = row_indices[k]
+                # Starts the run's sum with its first value.
+                total = row_values[k]
+                # Moves past the first element of the run.
+                k += 1
+                # Adds every duplicate of the same position.
+                while k < len(row_indices) and row_indices[k] == minor:
+                    # Adds the duplicate's value.
+                    total += row_values[k]
+                    # Moves past the duplicate.
+                    k += 1
+                # Keeps the element only if its sum is non-zero.
+                if total != 0:
+                    # Writes the minor index at the compacted position.
+                    indices[write] = minor
+                    # Writes the summed value at the compacted position.
+                    out_values[write] = total
+                    # Advances the compacted position.
+                    write += 1
+            # Moves to the next row (or column).
+            start = end
+        # Records the end of the last compacted row (or column).
+        indptr[n_major] = write
+        # Drops the slots freed by merged duplicates and zeros.
+        del indices[write:]
+        # Drops the value slots freed by merged duplicates and zeros.
+        del out_values[write:]
+        # Returns the compressed storage.
+        return cls(fmt, rows, cols, indptr, indices, out_values)
+
+    # Defines a property that returns the number of stored elements.
+    @property
+    def nnz(self):
+        # Returns the length of the index buffer, which has one entry per stored element.
+        return len(self.indices)
+
+    # Defines a property that estimates the memory used by the index and value buffers in bytes.
+    @property
+    def nbytes(self):
+        # Adds the size of the two index buffers.
+        total = len(self.indptr) * self.indptr.itemsize + len(self.indices) * self.indices.itemsize
+        # Adds the size of the value buffer, assuming a pointer per element for object values.
+        total += len(self.values) * getattr(self.values, "itemsize", 8)
+        # Returns the estimated number of bytes.
+        return total
+
+    # Defines a method that returns the value at position (i, j), defaulting to 0 if it is not stored.
+    def get(self, i, j):
+        # Picks the compressed (major) and stored (minor) index for this format.
+        major, minor = (i, j) if self.fmt == "csr" else (j, i)
+        # Reads where the compressed row (or column) starts.
+        start = self.indptr[major]
+        # Reads where the compressed row (or column) ends.
+        end = self.indptr[major + 1]
+        # Binary-searches the sorted minor indices of the row (or column).
+        k = bisect_left(self.indices, minor, start, end)
+        # Returns the stored value when the index was found, otherwise 0 (sparse matrix convention).
+        return self.values[k] if k < end and self.indices[k] == minor else 0
+
+    # Defines a method that yields every stored element as ((i, j), value).
+    def items(self):
+        # Reads the buffers into local variables for faster access in the loop.
+        indptr, indices, values = self.indptr, self.indices, self.values
+        # Iterates over every compressed row (or column).
+        for major in range(len(indptr) - 1):
+            # Iterates over the stored elements of that row (or column).
+            for k in range(indptr[major], indptr[major + 1]):
+                # Yields the element with its (row, column) position for either format.
+                yield ((major, indices[k]) if self.fmt == "csr" else (indices[k], major)), values[k]
+
+    # Defines a method that expands the storage back into a dictionary keyed by (i, j).
+    def to_dict(self):
+        # Returns a dictionary built from every stored element.
+        return dict(self.items())
+
+    # Defines a method that returns rows start to stop-1 of a CSR storage, sharing the index and value buffers.
+    def row_block(self, start, stop):
+        # Checks that the storage compresses rows, since only then a block of rows is contiguous.
+        if self.fmt != "csr":
+            # Raises a ValueError for CSC storage.
+            raise ValueError("Row blocks are only defined for CSR storage.")
+        # Returns the block of compressed rows.
+        return self._major_block(start, stop)
+
+    # Defines a method that returns columns start to stop - 1 of a CSC storage as a new CSC storage, sharing buffers
+    # like row_block does for CSR.
+    def column_block(self, start, stop):
+        # Checks that the storage compresses columns, since only then a block of columns is contiguous.
+        if self.fmt != "csc":
+            # Raises a ValueError for CSR storage.
+            raise ValueError("Column blocks are only defined for CSC storage.")
+        # Returns the block of compressed columns.
+        return self._major_block(start, stop)
+
+    # Defines a helper that returns compressed rows (CSR) or columns (CSC) start to stop - 1 as a new storage.
+    def _major_block(self, start, stop):
+        # Reads the offset of the block's first stored element.
+        low = self.indptr[start]
+        # Reads the offset just past the block's last stored element.
+        high = self.indptr[stop]
+        # Rebases the block's offsets so they start at 0 (this copies only stop - start + 1 offsets).
+        indptr = array("q", (offset - low for offset in self.indptr[start:stop + 1]))
+        # Computes the shape of the block, which keeps the full minor dimension.
+        rows, cols = (stop - start, self.cols) if self.fmt == "csr" else (self.rows, stop - start)
+        # Builds the block, whose index and value buffers are zero-copy slices of the original buffers.
+        block = CompressedStorage(self.fmt, rows, cols, indptr,
+                                  _buffer_slice(self.indices, low, high), _buffer_slice(self.values, low, high))
+        # Adds the block to the group of storages sharing the values.
+        self._join(block)
+        # Returns the block.
+        return block
+
+    # Defines a method that reinterprets the buffers with another format and shape without copying them (the CSR
+    # buffers of a matrix are the CSC buffers of its transpose), adding it to the storage's sharing group.
+    def share(self, fmt, rows, cols):
+        # Builds the storage over the same buffers.
+        storage = CompressedStorage(fmt, rows, cols, self.indptr, self.indices, self.values)
+        # Adds the new storage to the group of storages sharing the values.
+        self._join(storage)
+        # Returns the new storage.
+        return storage
+
+    # Defines a method that returns the storage with a private copy of its value buffer, used before an in-place
+    # update of values shared with other storages. The index buffers stay shared, since they are never written in place.
+    def detach(self):
+        # Copies the values into a buffer of the same type.
+        values = array(typecode_of(self.values), self.values) if typecode_of(self.values) else list(self.values)
+        # Returns the storage with the copied values.
+        return CompressedStorage(self.fmt, self.rows, self.cols, self.indptr, self.indices, values)
+
+    # Defines a method that converts the storage to the other compressed format (CSR to CSC or CSC to CSR).
+    def convert(self):
+        # Picks the format of the result.
+        fmt = "csc" if self.fmt == "csr" else "csr"
+        # Picks the number of compressed rows (or columns) of the result, which is the bound of the current minor indices.
+        n_major = self.cols if self.fmt == "csr" else self.rows
+        # Initializes the per-row (or per-column) counters of the result.
+        indptr = array("q", bytes(8 * (n_major + 1)))
+        # Counts how many elements land in every compressed row (or column) of the result.
+        for minor in self.indices:
+            # Increments the counter that follows the element's new major index.
+            indptr[minor + 1] += 1
+        # Turns the counts into starting offsets with a running sum.
+        for m in range(n_major):
+            # Adds the offset of the previous row (or column) to the current one.
+            indptr[m + 1] += indptr[m]
+        # Copies the starting offsets into the insertion cursors of every row (or column).
+        cursor = array("q", indptr)
+        # Allocates the result's index buffer, bounded by the current number of compressed rows (or columns).
+        indices = _index_array(len(self.indptr) - 1)
+        # Fills the index buffer with zeros so every slot can be assigned out of order.
+        indices.frombytes(bytes(indices.itemsize * self.nnz))
+        # Allocates the result's value buffer with the same type as the current one.
+        values = array(typecode_of(self.values), self.values) if typecode_of(self.values) else list(self.values)
+        # Iterates over every current compressed row (or column) in order, so the new minor indices come out sorted.
+        for major in range(len(self.indptr) - 1):
+            # Iterates over the stored elements of that row (or column).
+            for k in range(self.indptr[major], self.indptr[major + 1]):
+                # Reads the destination slot of the element in the result.
+                dest = cursor[self.indices[k]]
+                # Stores the current major index as the element's new minor index.
+                indices[dest] = major
+                # Stores the element's value in the destination slot.
+                values[dest] = self.values[k]
+                # Advances the insertion cursor of that row (or column).
+                cursor[self.indices[k]] = dest + 1
+        # Returns the converted storage.
+        return CompressedStorage(fmt, self.rows, self.cols, indptr, indices, values)
+
+
+# Defines a function that builds the CSR storage of the transpose of a matrix given as ((i, j), value) items in any
+# order, in linear time: a counting sort by row followed by a stable counting sort by column leaves the elements of
+# every column (a row of the transpose) in increasing row order, with no comparison sort.
+def transpose_items(rows, cols, items, dtype=None):
+    # Reads the elements into a list, since they are walked more than once.
+    elements = list(items)
+    # Initializes the per-row and per-column counters, with one extra slot for the prefix sums.
+    row_counts, col_counts = [0] * (rows + 1), [0] * (cols + 1)
+    # Counts the elements of every row and every column in one pass.
+    for (i, j), value in elements:
+        # Increments the counter that follows the element's row.
+        row_counts[i + 1] += 1
+        # Increments the counter that follows the element's column.
+        col_counts[j + 1] += 1
+    # Turns the row counts into starting offsets, the insertion cursors of the first sort.
+    cursor = list(accumulate(row_counts))
+    # Allocates the elements ordered by row.
+    by_row = [None] * len(elements)
+    # Scatters every element into its row.
+    for element in elements:
+        # Reads the element's row.
+        i = element[0][0]
+        # Stores the element in the next free slot of its row.
+        by_row[cursor[i]] = element
+        # Advances the slot of the row.
+        cursor[i] += 1
+    # Releases the unordered list.
+    del elements
+    # Turns the column counts into starting offsets, the row offsets of the transpose.
+    indptr = array("q", accumulate(col_counts))
+    # Copies the starting offsets into the insertion cursors of every column.
+    cursor = array("q", indptr)
+    # Allocates the index buffer of the transpose, whose indices are the original rows.
+    indices = _index_array(rows)
+    # Fills the index buffer with zeros so every slot can be assigned out of order.
+    indices.frombytes(bytes(indices.itemsize * len(by_row)))
+    # Allocates the values in the order of the transpose.
+    values = [0] * len(by_row)
+    # Scatters the elements, in row order, into their columns (the stable second sort).
+    for (i, j), value in by_row:
+        # Reads the destination slot of the element.
+        dest = cursor[j]
+        # Stores the element's row as its column in the transpose.
+        indices[dest] = i
+        # Stores the value.
+        values[dest] = value
+        # Advances the insertion cursor of the column.
+        cursor[j] = dest + 1
+    # Returns the CSR storage of the transpose, whose shape is (cols, rows).
+    return CompressedStorage("csr", cols, rows, indptr, indices, _value_array(values, dtype))
+
+
+# Defines a function that stacks CSR row blocks (e.g. computed by different workers) into one CSR storage.
+def stack_rows(blocks, cols):
+    # Initializes the row offsets with the start of the first row.
+    indptr = array("q", [0])
+    # Initializes the column index buffer.
+    indices = _index_array(cols)
+    # Iterates over the blocks in row order.
+    for block in blocks:
+        # Reads the offset where the block's elements start in the stacked buffers.
+        base = indptr[-1]
+        # Appends the block's row offsets, shifted by the number of elements already stacked.
+        indptr.extend(offset + base for offset in block.indptr[1:])
+        # Appends the block's column indices.
+        indices.extend(iter(block.indices))
+    # Checks whether every block stores its values in the same typed buffer.
+    if blocks and len({typecode_of(block.values) for block in blocks}) == 1 and typecode_of(blocks[0].values):
+        # Concatenates the typed buffers directly.
+        values = array(typecode_of(blocks[0].values))
+        # Appends the values of every block.
+        for block in blocks:
+            # Appends the block's values.
+            values.extend(block.values)
+    # Otherwise picks the most compact buffer able to hold the values of all blocks.
+    else:
+        # Concatenates the values of every block.
+        values = _value_array(value for block in blocks for value in block.values)
+    # Returns the stacked storage.
+    return CompressedStorage("csr", len(indptr) - 1, cols, indptr, indices, values)
+
+
+# Defines a helper that checks that a preallocated output buffer has one entry per row.
+def _check_out(out, rows):
+    # Raises a ValueError if the buffer has the wrong length.
+    if len(out) != rows:
+        # Reports the expected length.
+        raise ValueError(f"Output buffer length must match matrix row count ({rows}).")
+
+
+# Defines the CSR matrix-vector kernel: one dot product per compressed row.
+def csr_matvec(storage, vector, out=None):
+    # Reads the buffers into local variables for faster access in the loop.
+    indptr, indices, values = storage.indptr, storage.indices, storage.values
+    # Uses a new result list with one entry per row, unless a preallocated buffer was given.
+    if out is None:
+        # Allocates the result list.
+        out = [0] * storage.rows
+    # Otherwise checks the preallocated buffer, which is overwritten row by row.
+    else:
+        # Checks the length of the buffer.
+        _check_out(out, storage.rows)
+    # Iterates over every row.
+    for i in range(storage.rows):
+        # Initializes the running sum of the row.
+        total = 0
+        # Iterates over the stored elements of the row.
+        for k in range(indptr[i], indptr[i + 1]):
+            # Adds the product of the matrix element and the matching vector element.
+            total += values[k] * vector[indices[k]]
+        # Stores the row's dot product in the result.
+        out[i] = total
+    # Returns the resulting vector.
+    return out
+
+
+# Defines the CSC matrix-vector kernel: every column is scaled by one vector element and scattered into the result.
+def csc_matvec(storage, vector, out=None):
+    # Reads the buffers into local variables for faster access in the loop.
+    indptr, indices, values = storage.indptr, storage.indices, storage.values
+    # Uses a new result list with one entry per row, unless a preallocated buffer was given.
+    if out is None:
+        # Allocates the result list.
+        out = [0] * storage.rows
+    # Otherwise clears the preallocated buffer, since the kernel accumulates into it.
+    else:
+        # Checks the length of the buffer.
+        _check_out(out, storage.rows)
+        # Resets every entry to 0.
+        out[:] = [0] * storage.rows
+    # Iterates over every column.
+    for j in range(storage.cols):
+        # Reads the vector element that scales the column.
+        x = vector[j]
+        # Iterates over the stored elements of the column.
+        for k in range(indptr[j], indptr[j + 1]):
+            # Adds the scaled element to the result entry of its row.
+            out[indices[k]] += values[k] * x
+    # Returns the resulting vector.
+    return out
+
+
+# Defines the batched CSR kernel for a list of vectors, writing into preallocated result lists when given.
+def csr_matmat(storage, vectors, out=None):
+    # Uses new result lists, one per vector, unless preallocated buffers were given.
+    if out is None:
+        # Allocates one result list per vector.
+        out = [[0] * storage.rows for _ in vectors]
+    # Otherwise checks that there is one preallocated buffer per vector.
+    elif len(out) != len(vectors):
+        # Raises a ValueError if the number of buffers is wrong.
+        raise ValueError("Output buffer must hold one result per input vector.")
+    # Iterates over the vectors and their result lists together.
+    for vector, result in zip(vectors, out):
+        # Overwrites the result list with the vector's product (pure-Python dot products are fastest one vector at a time).
+        csr_matvec(storage, vector, result)
+    # Returns the result lists.
+    return out
+
+
+# Defines the vectorized CSR kernel for NumPy input of shape (cols,) or (n, cols): all products in one pass.
+def csr_matmat_numpy(storage, vectors, out=None):
+    # Imports NumPy here, since it is only needed (and already loaded by the caller) for NumPy input.
+    import numpy as np
+    # Views the index buffers as NumPy arrays without copying them.
+    indptr = np.asarray(storage.indptr)
+    # Views the column index buffer as a NumPy array without copying it.
+    indices = np.asarray(storage.indices)
+    # Views the value buffer as a NumPy array (typed buffers are not copied).
+    values = np.asarray(storage.values)
+    # Treats a single vector as a batch of one so both shapes share the same code.
+    batch = vectors if vectors.ndim == 2 else vectors[np.newaxis, :]
+    # Computes the result type of the products.
+    dtype = np.result_type(values.dtype, batch.dtype)
+    # Uses a new result array unless a preallocated buffer was given.
+    if out is None:
+        # Allocates the result with one row of results per input vector.
+        out = np.empty((batch.shape[0], storage.rows) if vectors.ndim == 2 else storage.rows, dtype=dtype)
+    # Otherwise checks that the preallocated buffer has the shape of the result.
+    elif out.shape != ((batch.shape[0], storage.rows) if vectors.ndim == 2 else (storage.rows,)):
+        # Raises a ValueError if the buffer has the wrong shape.
+        raise ValueError(f"Output buffer shape must be {(batch.shape[0], storage.rows)} for this input.")
+    # Views the result as a batch as well, sharing the output's memory.
+    result = out if vectors.ndim == 2 else out[np.newaxis, :]
+    # Clears the result, since rows without stored elements are not written below.
+    result[...] = 0
+    # Finds the rows that have at least one stored element.
+    nonempty = np.flatnonzero(indptr[1:] != indptr[:-1])
+    # Computes every row's dot products when the matrix has stored elements.
+    if len(nonempty):
+        # Picks how many vectors to process per pass so the temporary products stay around NUMPY_CHUNK elements.
+        step = max(1, NUMPY_CHUNK // len(indices))
+        # Iterates over the batch in chunks of vectors.
+        for start in range(0, batch.shape[0], step):
+            # Gathers the vector elements matching every stored element (shape nnz x chunk) in the result type.
+            products = batch[start:start + step].T[indices].astype(dtype, copy=False)
+            # Multiplies every stored element into its gathered row, in place.
+            products *= values[:, np.newaxis]
+            # Sums the products of every non-empty row and writes them into the result.
+            result[start:start + step, nonempty] = np.add.reduceat(products, indptr[nonempty], axis=0).T
+    # Returns the result.
+    return out
+
+
+# Defines a helper that packs per-row dictionaries of non-zero sums into a CSR storage.
+def _pack_rows(rows, cols, row_dicts):
+    # Initializes the row offsets with the start of the first row.
+    indptr = array("q", [0])
+    # Initializes the list of column indices.
+    indices = []
+    # Initializes the list of values.
+    values = []
+    # Iterates over the per-row dictionaries in row order.
+    for row in row_dicts:
+        # Iterates over the row's columns in sorted order.
+        for j in sorted(row):
+            # Stores the element only if it is non-zero (sums and products may cancel out).
+            if row[j] != 0:
+                # Appends the column index.
+                indices.append(j)
+                # Appends the value.
+                values.append(row[j])
+        # Records where the next row starts.
+        indptr.append(len(indices))
+    # Returns the packed CSR storage.
+    return CompressedStorage("csr", rows, cols, indptr, _index_array(cols, indices), _value_array(values))
+
+
+# Defines the CSR matrix multiplication kernel (Gustavson's algorithm over compressed rows).
+def csr_matmul(a, b):
+    # Defines a generator that computes the result one row at a time.
+    def rows():
+        # Iterates over every row of a.
+        for i in range(a.rows):
+            # Initializes the sparse accumulator of the row.
+            accumulator = {}
+            # Iterates over the stored elements a[i, j] of the row.
+            for k in range(a.indptr[i], a.indptr[i + 1]):
+                # Reads the column j and value of the element.
+                j, a_val = a.indices[k], a.values[k]
+                # Iterates over the stored elements b[j, m] of row j of b.
+                for p in range(b.indptr[j], b.indptr[j + 1]):
+                    # Adds the product to the running sum of the result position (i, m).
+                    accumulator[b.indices[p]] = accumulator.get(b.indices[p], 0) + a_val * b.values[p]
+            # Yields the finished row.
+            yield accumulator
+    # Packs the rows into a CSR storage and returns it.
+    return _pack_rows(a.rows, b.cols, rows())
+
+
+# Defines a helper that resolves a binary operation, given by name (see BINARY_OPS) or as a function of two values
+# (e.g. a NumPy ufunc), to (function, intersect): intersect is True for operations that are 0 as soon as one operand
+# is 0, whose result only has elements stored in both operands.
+def _binary_op(op):
+    # Looks up a named operation.
+    if isinstance(op, str):
+        # Checks that the name is known.
+        if op not in BINARY_OPS:
+            # Raises a ValueError listing the known names.
+            raise ValueError(f"Unknown element-wise operation '{op}', expected one of {sorted(BINARY_OPS)}.")
+        # Returns the function, and whether it only keeps common elements.
+        return BINARY_OPS[op], op == "multiply"
+    # Checks that the function keeps the positions stored in neither operand at 0, so the result stays sparse.
+    if op(0, 0) != 0:
+        # Raises a ValueError for functions such as lambda x, y: x + y + 1.
+        raise ValueError("Element-wise operations must map (0, 0) to 0 to keep the result sparse.")
+    # Returns the function, which is applied to every element stored in either operand.
+    return op, False
+
+
+# Defines the sorted-merge kernel of element-wise operations: the sorted indices of row i of a and b (or column i, for
+# two CSC storages) are walked together with two cursors, so every stored element is read once and no per-row
+# dictionary is built. Results that are exactly 0 (e.g. x - x) are pruned, so no zero is stored.
+def compressed_merge(a, b, op, dtype=None):
+    # Resolves the operation.
+    function, intersect = _binary_op(op)
+    # Reads the buffers into local variables for faster access in the loop.
+    a_ptr, a_idx, a_val = a.indptr, a.indices, a.values
+    # Reads the buffers of b as well.
+    b_ptr, b_idx, b_val = b.indptr, b.indices, b.values
+    # Initializes the offsets with the start of the first row (or column).
+    indptr = array("q", [0])
+    # Initializes the lists of indices and values of the result.
+    indices, values = [], []
+    # Iterates over every compressed row (or column).
+    for i in range(len(a_ptr) - 1):
+        # Reads the cursors and ends of the row in both operands.
+        p, p_end, q, q_end = a_ptr[i], a_ptr[i + 1], b_ptr[i], b_ptr[i + 1]
+        # Advances through both rows while either has elements left.
+        while p < p_end or q < q_end:
+            # Reads the next index of each row, past the end for an exhausted row.
+            j = a_idx[p] if p < p_end else -1
+            # Reads the next index of b's row.
+            k = b_idx[q] if q < q_end else -1
+            # Combines the elements stored at the same index in both rows.
+            if j == k:
+                # Applies the operation.
+                value = function(a_val[p], b_val[q])
+                # Advances both cursors.
+                p += 1
+                q += 1
+            # Takes the element only stored in a when its index comes first.
+            elif k < 0 or 0 <= j < k:
+                # Advances a's cursor.
+                p += 1
+                # Skips the element when the result only has common elements.
+                if intersect:
+                    # Continues with the next element.
+                    continue
+                # Applies the operation with 0 for b.
+                value = function(a_val[p - 1], 0)
+            # Otherwise takes the element only stored in b.
+            else:
+                # Advances b's cursor.
+                q += 1
+                # Skips the element when the result only has common elements.
+                if intersect:
+                    # Continues with the next element.
+                    continue
+                # Applies the operation with 0 for a, and uses the index of b's element.
+                value, j = function(0, b_val[q - 1]), k
+            # Stores the result unless it cancelled out to exactly 0.
+            if value != 0:
+                # Appends the index.
+                indices.append(j)
+                # Appends the value.
+                values.append(value)
+        # Records where the next row (or column) starts.
+        indptr.append(len(indices))
+    # Returns the result in the format of the operands.
+    return CompressedStorage(a.fmt, a.rows, a.cols, indptr,
+                             _index_array(a.cols if a.fmt == "csr" else a.rows, indices), _value_array(values, dtype))
+
+
+# Defines the in-place variant of compressed_merge: it writes the result into a's value buffer when the result has
+# exactly a's stored elements (e.g. A += B where B's elements are stored in A, or A *= B without cancellations), and
+# returns False without changing anything otherwise (or when the buffer is read-only or cannot hold the new values).
+def compressed_merge_into(a, b, op):
+    # Resolves the operation.
+    function, intersect = _binary_op(op)
+    # Reads the buffers into local variables for faster access in the loop.
+    a_ptr, a_idx, a_val = a.indptr, a.indices, a.values
+    # Reads the buffers of b as well.
+    b_ptr, b_idx, b_val = b.indptr, b.indices, b.values
+    # Leaves read-only buffers (e.g. memory-mapped files) unchanged.
+    if isinstance(a_val, memoryview) and a_val.readonly:
+        # Returns False.
+        return False
+    # Checks whether the operation leaves elements only stored in a unchanged (x + 0 == x and x - 0 == x).
+    keeps_a = op in ("add", "subtract")
+    # Initializes the list of (position in a's buffers, new value) writes.
+    updates = []
+    # Iterates over every compressed row (or column).
+    for i in range(len(a_ptr) - 1):
+        # Reads the cursors and ends of the row in both operands.
+        p, p_end, q, q_end = a_ptr[i], a_ptr[i + 1], b_ptr[i], b_ptr[i + 1]
+        # Advances through the row of a, matching the row of b.
+        while p < p_end:
+            # Reads the index of a's element.
+            j = a_idx[p]
+            # Skips b's elements before it, which would be new elements unless the operation only keeps common ones.
+            while q < q_end and b_idx[q] < j:
+                # Returns False if the element would have to be inserted.
+                if not intersect and function(0, b_val[q]) != 0:
+                    # Returns False.
+                    return False
+                # Advances b's cursor.
+                q += 1
+            # Combines the elements stored at the same index in both rows.
+            if q < q_end and b_idx[q] == j:
+                # Records the new value.
+                updates.append((p, function(a_val[p], b_val[q])))
+                # Advances b's cursor.
+                q += 1
+            # Otherwise applies the operation with 0 for b unless it leaves the element unchanged.
+            elif not keeps_a:
+                # Records the new value.
+                updates.append((p, 0 if intersect else function(a_val[p], 0)))
+            # Advances a's cursor.
+            p += 1
+        # Checks b's remaining elements, which are past a's last element.
+        while q < q_end:
+            # Returns False if the element would have to be inserted.
+            if not intersect and function(0, b_val[q]) != 0:
+                # Returns False.
+                return False
+            # Advances b's cursor.
+            q += 1
+    # Returns False if an element cancelled out, since removing it changes the structure.
+    if any(value == 0 for _, value in updates):
+        # Returns False.
+        return False
+    # Converts the new values to the buffer's type first, so a failure leaves the buffer unchanged.
+    if typecode_of(a_val):
+        # Returns False when the buffer cannot hold a value (e.g. a float written to an integer buffer).
+        try:
+            # Builds the converted values.
+            new_values = array(typecode_of(a_val), (value for _, value in updates))
+        # Catches values of the wrong type or out of range.
+        except (TypeError, OverflowError):
+            # Returns False.
+            return False
+    # Otherwise keeps the values as they are for buffers of Python objects.
+    else:
+        # Reads the new values.
+        new_values = [value for _, value in updates]
+    # Writes the new values into the buffer.
+    for (p, _), value in zip(updates, new_values):
+        # Stores the value.
+        a_val[p] = value
+    # Returns True.
+    return True
+
+
+# Defines a function that returns a copy of a compressed storage without the elements whose magnitude is at most
+# threshold, in the same format and value type (used to keep intermediate products sparse).
+def drop_small(storage, threshold):
+    # Initializes the offsets with the start of the first row (or column).
+    indptr = array("q", [0])
+    # Initializes the index buffer, bounded like the storage's own indices.
+    indices = _index_array(storage.cols if storage.fmt == "csr" else storage.rows)
+    # Initializes the value buffer with the storage's type.
+    values = array(typecode_of(storage.values)) if typecode_of(storage.values) else []
+    # Iterates over every compressed row (or column).
+    for major in range(len(storage.indptr) - 1):
+        # Iterates over the stored elements of that row (or column).
+        for k in range(storage.indptr[major], storage.indptr[major + 1]):
+            # Keeps the element if it is large enough.
+            if abs(storage.values[k]) > threshold:
+                # Appends the index.
+                indices.append(storage.indices[k])
+                # Appends the value.
+                values.append(storage.values[k])
+        # Records where the next row (or column) starts.
+        indptr.append(len(indices))
+    # Returns the pruned storage.
+    return CompressedStorage(storage.fmt, storage.rows, storage.cols, indptr, indices, values)
+
+
+# Defines the CSR addition kernel.
+def csr_add(a, b):
+    # Returns the merged sum.
+    return compressed_merge(a, b, "add")
+
+
+# Defines the CSR element-wise multiplication kernel.
+def csr_multiply(a, b):
+    # Returns the merged product, which only has elements stored in both operands.
+    return compressed_merge(a, b, "multiply")
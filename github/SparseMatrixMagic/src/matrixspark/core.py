@@ -1,22 +1,258 @@
+# Imports contextmanager to build the batch_update() context manager from a generator.
+from contextlib import contextmanager
+# Imports sys to check whether the parallel module has been loaded.
+import sys
+
+# Imports the compressed (CSR/CSC) storage and its matrix-vector kernels, used once a matrix has been frozen.
+from .compressed import (CompressedStorage, _value_array, cast_value, check_index, csc_matvec, csr_matmat,
+                        csr_matmat_numpy, csr_matvec, dtype_of, infer_dtype, normalize_dtype, typecode_of)
+
+
+# Maps the name of every cached derived quantity to the operations function that computes it.
+_DERIVED = {
+    "row_sums": "compute_row_sums",
+    "nnz_per_row": "compute_nnz_per_row",
+    "frobenius_norm": "compute_frobenius_norm",
+    "one_norm": "compute_one_norm",
+    "inf_norm": "compute_inf_norm",
+    "row_index": "compute_row_index",
+    "col_index": "compute_col_index",
+}
+# Lists the derived quantities that are discarded (rather than updated) when an element changes.
+_NORMS = ("frobenius_norm", "one_norm", "inf_norm")
+# Stores the full name of the parallel module, which is only imported once an operation may run in parallel.
+_PARALLEL = f"{__package__}.parallel"
+
+
+# Defines a helper that returns the number of workers of a matrix-vector product, without importing the parallel module
+# when it cannot be needed: one worker was requested, or the default is still 1 because set_workers (which loads the
+# module) was never called.
+def _resolve_workers(workers, nnz):
+    # Runs serially without importing anything.
+    if workers == 1 or (workers is None and _PARALLEL not in sys.modules):
+        # Returns one worker.
+        return 1
+    # Imports the parallel module when needed.
+    from .parallel import resolve_workers
+    # Returns the number of workers, which is 1 (serial) for small matrices.
+    return resolve_workers(workers, nnz)
+
+
 # Defines a Matrix class to represent a sparse matrix using a dictionary for non-zero elements.
 class Matrix:
-    # Constructor method to initialize a Matrix instance.
-    def __init__(self, rows, cols, values=None):
+    # Constructor method to initialize a Matrix instance. dtype fixes the type of the values ("int32", "int64",
+    # "float32", "float64", "complex128" or "object"): values are converted when written, and frozen storage uses the
+    # matching typed buffer (float32 halves the value memory of float64). By default the type is inferred.
+    def __init__(self, rows, cols, values=None, dtype=None):
         # Stores the number of rows in the matrix as an instance variable.
         self.rows = rows
         # Stores the number of columns in the matrix as an instance variable.
         self.cols = cols
-        # Initializes the data dictionary to store non-zero elements; uses provided values if given, otherwise an empty dictionary.
-        self.data = values if values else {}
+        # Initializes the compressed storage as None; the matrix starts in dictionary form and is compressed by freeze().
+        self._storage = None
+        # Initializes the cache of the storage in the other compressed format (CSC for a CSR matrix and vice versa).
+        self._converted_storage = None
+        # Initializes the cache of the CSR form of a dictionary matrix, used by the kernels until the next write.
+        self._csr_cache = None
         # Initializes a cache for the determinant as None, to be computed later if needed.
         self._determinant_cache = None
         # Initializes a cache for the transpose as None, to be computed later if needed.
         self._transpose_cache = None
+        # Initializes the cache of other derived quantities (row sums, non-zeros per row, norms), keyed by name.
+        self._derived_cache = {}
+        # Initializes the nesting depth of batch_update() blocks; writes inside a block defer cache maintenance.
+        self._batch_depth = 0
+        # Initializes the flag recording that a batch_update() block wrote to the matrix.
+        self._batch_dirty = False
+        # Stores the dtype of the values, or None to infer it from the values.
+        self._dtype = normalize_dtype(dtype)
+        # Converts the provided values to the dtype if one was given.
+        if values and self._dtype is not None:
+            # Builds a converted copy of the values.
+            values = {key: cast_value(value, self._dtype) for key, value in values.items()}
+        # Initializes the data dictionary to store non-zero elements; uses provided values if given, otherwise an empty dictionary.
+        self.data = values if values else {}
+
+    # Defines a class method that wraps an existing compressed storage in a frozen Matrix without copying it.
+    @classmethod
+    def from_storage(cls, storage):
+        # Creates an empty matrix with the storage's dimensions.
+        matrix = cls(storage.rows, storage.cols)
+        # Drops the empty dictionary, since the elements live in the compressed storage.
+        matrix._data = None
+        # Attaches the compressed storage.
+        matrix._storage = storage
+        # Keeps the dtype of int32 and float32 buffers, which inference from the values would widen after a thaw.
+        matrix._dtype = dtype_of(storage.values) if typecode_of(storage.values) in ("i", "f") else None
+        # Returns the frozen matrix.
+        return matrix
+
+    # Defines a property that returns the dtype of the values: the one given to the constructor, otherwise the type
+    # of the compressed buffer, or the type inferred from the values of a dictionary matrix.
+    @property
+    def dtype(self):
+        # Returns the explicit dtype if there is one.
+        if self._dtype is not None:
+            # Returns the dtype.
+            return self._dtype
+        # Returns the buffer's dtype when frozen, otherwise infers it from the values.
+        return dtype_of(self._storage.values) if self._data is None else infer_dtype(self._data.values())
+
+    # Defines a method that returns a copy of the matrix with its values converted to another dtype, in the same format.
+    def astype(self, dtype):
+        # Returns a dictionary matrix built from the converted values for dictionary matrices.
+        if self._data is not None:
+            # Returns the new matrix, dropping values that became zero (e.g. 0.5 converted to an integer).
+            return Matrix(self.rows, self.cols, {key: value for key, value in self._data.items()
+                                                 if cast_value(value, normalize_dtype(dtype)) != 0}, dtype)
+        # Reads the compressed storage.
+        storage = self._storage
+        # Converts the value buffer, sharing the index buffers.
+        values = _value_array(storage.values, normalize_dtype(dtype))
+        # Rebuilds the storage if some values became zero, so no zeros are stored.
+        if 0 in values:
+            # Returns a frozen matrix compressed from the non-zero converted values.
+            result = Matrix.from_storage(CompressedStorage.from_dict(
+                self.rows, self.cols, {key: value for key, value in storage.items()
+                                       if cast_value(value, normalize_dtype(dtype)) != 0}, storage.fmt, dtype))
+        # Otherwise wraps the converted values with the same indices.
+        else:
+            # Builds the frozen matrix.
+            result = Matrix.from_storage(CompressedStorage(storage.fmt, self.rows, self.cols, storage.indptr,
+                                                           storage.indices, values))
+        # Records the dtype.
+        result._dtype = normalize_dtype(dtype)
+        # Returns the converted matrix.
+        return result
+
+    # Defines a method that saves the matrix to a binary file (header followed by the compressed index and value arrays).
+    def save(self, path):
+        # Imports the file writer when needed, as __getattr__ does for the operations module.
+        from .persist import save_storage
+        # Writes the compressed storage, compressing a dictionary matrix to CSR first.
+        save_storage(self._storage if self._storage is not None else self.compressed("csr"), path)
+
+    # Defines a class method that opens a file written by save() as a frozen matrix backed by a read-only memory map.
+    # Loading only reads the header, and processes that load the same file share one page-cached copy.
+    @classmethod
+    def load(cls, path):
+        # Imports the file loader when needed, as __getattr__ does for the operations module.
+        from .persist import load_storage
+        # Returns a frozen matrix whose buffers are views into the mapped file.
+        return cls.from_storage(load_storage(path))
+
+    # Defines the data property, the dictionary of non-zero elements keyed by (i, j).
+    @property
+    def data(self):
+        # If the matrix is frozen, expands the compressed storage back into a dictionary (lazy conversion).
+        if self._data is None:
+            # Replaces the compressed storage by its dictionary form, since callers may modify the dictionary directly.
+            self._data = self._storage.to_dict()
+            # Drops the compressed storage, which would no longer follow changes to the dictionary.
+            self._storage = None
+            # Drops the converted storage as well.
+            self._converted_storage = None
+        # Returns the data dictionary.
+        return self._data
+
+    # Defines the setter of the data property, used to replace all non-zero elements at once.
+    @data.setter
+    def data(self, values):
+        # Stores the new dictionary of non-zero elements.
+        self._data = values
+        # Drops the compressed storage, which no longer matches the dictionary.
+        self._storage = None
+        # Drops the converted storage as well.
+        self._converted_storage = None
+        # Drops the CSR form of the previous dictionary.
+        self._csr_cache = None
+        # Invalidates every cache, since all elements were replaced.
+        self._invalidate_caches()
+
+    # Defines a property that reports how the elements are stored: 'dok' (dictionary of keys), 'csr' or 'csc'.
+    @property
+    def format(self):
+        # Returns 'dok' while the matrix is a dictionary, otherwise the compressed format name.
+        return "dok" if self._storage is None else self._storage.fmt
 
-    # Defines how to access matrix elements using indexing (e.g., matrix[i, j]).
+    # Defines a method that compresses the matrix into CSR or CSC storage once construction is finished.
+    def freeze(self, fmt="csr"):
+        # Checks whether the matrix is already stored in the requested format.
+        if self._storage is not None and self._storage.fmt == fmt:
+            # Returns the matrix unchanged.
+            return self
+        # Builds the requested format from the dictionary, or by converting the current compressed storage.
+        storage = self.compressed(fmt)
+        # Drops the dictionary (or previous storage) so only the compact buffers are kept in memory.
+        self._data = None
+        # Attaches the compressed storage.
+        self._storage = storage
+        # Drops the converted storage of the previous format.
+        self._converted_storage = None
+        # Drops the CSR form of the dictionary, which is now the storage itself if CSR was requested.
+        self._csr_cache = None
+        # Returns the matrix to allow chaining, e.g. Matrix(...).freeze().
+        return self
+
+    # Defines a method that returns the elements as a compressed storage in the given format without changing the matrix.
+    def compressed(self, fmt="csr"):
+        # Builds the storage directly from the dictionary if the matrix is not frozen.
+        if self._storage is None:
+            # Returns a freshly compressed storage for CSC, which the kernels do not request on every call.
+            if fmt != "csr":
+                # Returns the storage.
+                return CompressedStorage.from_dict(self.rows, self.cols, self._data, fmt, self._dtype)
+            # Compresses the dictionary on first use, and keeps the result until the next write (see __setitem__), as
+            # the transpose is cached, so repeated matrix-vector products do not recompress the whole matrix.
+            if self._csr_cache is None:
+                # Caches the CSR storage.
+                self._csr_cache = CompressedStorage.from_dict(self.rows, self.cols, self._data, "csr", self._dtype)
+            # Returns the cached storage.
+            return self._csr_cache
+        # Returns the storage itself when it already has the requested format.
+        if self._storage.fmt == fmt:
+            # Returns the primary compressed storage.
+            return self._storage
+        # Converts the storage to the other format on first use.
+        if self._converted_storage is None:
+            # Caches the converted storage, which stays valid for as long as the matrix is frozen.
+            self._converted_storage = self._storage.convert()
+        # Returns the converted storage.
+        return self._converted_storage
+
+    # Defines a property that returns the number of stored non-zero elements.
+    @property
+    def nnz(self):
+        # Returns the size of the dictionary, or the number of elements in the compressed storage when frozen.
+        return len(self._data) if self._data is not None else self._storage.nnz
+
+    # Defines a method that yields every stored non-zero element as ((i, j), value), whatever the storage format.
+    def items(self):
+        # Returns the compressed storage's elements when frozen, otherwise the dictionary's items.
+        return self._storage.items() if self._data is None else self._data.items()
+
+    # Defines how to access matrix elements using indexing (e.g., matrix[i, j]). Slices, lists of indices and NumPy
+    # integer arrays select rows and columns instead (e.g. matrix[i, :], matrix[:, j], matrix[rows, cols]) and return a
+    # Matrix; see indexing.py.
     def __getitem__(self, idx):
         # Unpacks the index tuple into row (i) and column (j) indices.
         i, j = idx
+        # Extracts a submatrix when either index is not a single integer.
+        if not isinstance(i, int) or not isinstance(j, int):
+            # Imports the indexing module when needed (it imports this one).
+            from .indexing import extract
+            # Returns the selected rows and columns.
+            return extract(self, i, j)
+        # Counts negative indices from the end, like slicing and Python sequences do (matrix[-1, 0] is the last row).
+        if i < 0 or j < 0:
+            # Shifts each negative index by the size of its dimension.
+            i, j = (i + self.rows if i < 0 else i), (j + self.cols if j < 0 else j)
+        # Checks that the element is inside the matrix, so every storage format rejects the same positions.
+        check_index(self.rows, self.cols, i, j)
+        # If the matrix is frozen, reads the element from the compressed storage with a binary search.
+        if self._data is None:
+            # Returns the stored value, or 0 if the element is not stored.
+            return self._storage.get(i, j)
         # Returns the value at position (i, j) from the data dictionary, defaulting to 0 if not found (sparse matrix convention).
         return self.data.get((i, j), 0)
 
@@ -24,6 +260,20 @@ class Matrix:
     def __setitem__(self, idx, value):
         # Unpacks the index tuple into row (i) and column (j) indices.
         i, j = idx
+        # Counts negative indices from the end, as __getitem__ does, so a write is read back at the same position.
+        if i < 0 or j < 0:
+            # Shifts each negative index by the size of its dimension.
+            i, j = (i + self.rows if i < 0 else i), (j + self.cols if j < 0 else j)
+        # Checks that the element is inside the matrix before touching the data, as __getitem__ does.
+        check_index(self.rows, self.cols, i, j)
+        # Converts the value to the matrix's dtype if it has one.
+        if self._dtype is not None:
+            # Replaces the value by its converted form.
+            value = cast_value(value, self._dtype)
+        # Reads the previous value, which the incremental cache updates need (the data property thaws a frozen matrix).
+        old = self.data.get((i, j), 0)
+        # Drops the CSR form of the dictionary, even inside a batch, since compressed() would otherwise return it.
+        self._csr_cache = None
         # If the value is 0, removes the entry from the data dictionary (sparse matrix stores only non-zero elements).
         if value == 0:
             # Removes the key (i, j) from the data dictionary if it exists, does nothing if it doesn't.
@@ -32,26 +282,212 @@ class Matrix:
         else:
             # Assigns the value to the key (i, j) in the data dictionary.
             self.data[(i, j)] = value
-        # Invalidates the determinant cache since the matrix has changed.
+        # Inside a batch_update() block, only records the write; the caches are invalidated once when the block exits.
+        if self._batch_depth:
+            # Marks the matrix as changed by the batch.
+            self._batch_dirty = True
+            # Skips the per-write cache maintenance.
+            return
+        # Invalidates the determinant cache since the matrix has changed (it cannot be updated incrementally).
         self._determinant_cache = None
-        # Invalidates the transpose cache since the matrix has changed.
+        # Mirrors the write into the cached transpose instead of discarding it.
+        if self._transpose_cache is not None:
+            # Writes the value at the transposed position (j, i).
+            self._transpose_cache[j, i] = value
+        # Updates the cached row sums by the change of the element.
+        if "row_sums" in self._derived_cache:
+            # Adds the difference between the new and the previous value to row i.
+            self._derived_cache["row_sums"][i] += value - old
+        # Updates the cached non-zero counts when the element appears or disappears.
+        if "nnz_per_row" in self._derived_cache and (old == 0) != (value == 0):
+            # Adds 1 for a new non-zero element, or subtracts 1 for a removed one.
+            self._derived_cache["nnz_per_row"][i] += 1 if old == 0 else -1
+        # Updates the cached row and column indexes (used by slicing) with the new value of the element.
+        for name, major, minor in (("row_index", i, j), ("col_index", j, i)):
+            # Skips an index that was never built.
+            if name not in self._derived_cache:
+                # Continues with the next index.
+                continue
+            # Reads the dictionary of the element's row (or column), creating it for a new element.
+            line = self._derived_cache[name].setdefault(major, {})
+            # Removes the element if it became zero, otherwise stores its new value.
+            if value == 0:
+                # Removes the element from the row (or column) if it was stored.
+                line.pop(minor, None)
+            # Stores the new value otherwise.
+            else:
+                # Assigns the value.
+                line[minor] = value
+        # Drops the cached norms, which cannot be updated exactly by a single write.
+        for name in _NORMS:
+            # Removes the norm from the cache if it was computed.
+            self._derived_cache.pop(name, None)
+
+    # Defines a context manager that groups many writes: inside the block, __setitem__ skips all cache maintenance,
+    # and the caches are invalidated once when the outermost block exits (e.g. with matrix.batch_update(): ...).
+    @contextmanager
+    def batch_update(self):
+        # Enters one more level of batching.
+        self._batch_depth += 1
+        # Runs the body of the with block.
+        try:
+            # Returns the matrix as the value of the with statement.
+            yield self
+        # Leaves the level of batching even if the block raised an exception.
+        finally:
+            # Leaves one level of batching.
+            self._batch_depth -= 1
+            # Invalidates the caches once, when the outermost block that wrote to the matrix exits.
+            if not self._batch_depth and self._batch_dirty:
+                # Clears the flag for the next batch.
+                self._batch_dirty = False
+                # Invalidates every cache.
+                self._invalidate_caches()
+
+    # Defines a helper that discards every cached derived quantity.
+    def _invalidate_caches(self):
+        # Invalidates the determinant cache.
+        self._determinant_cache = None
+        # Invalidates the transpose cache.
         self._transpose_cache = None
+        # Invalidates the CSR form of a dictionary matrix.
+        self._csr_cache = None
+        # Invalidates the cache of the other derived quantities.
+        self._derived_cache = {}
 
     # Defines how the matrix can be iterated over, yielding rows as lists.
+    # Each dense row is filled from the row's stored elements instead of reading every cell through __getitem__.
     def __iter__(self):
+        # Starts iterating over the non-empty rows.
+        stored = self.iter_rows()
+        # Reads the first non-empty row, or None if the matrix has no stored elements.
+        pending = next(stored, None)
         # Loops through each row index from 0 to rows-1.
         for i in range(self.rows):
-            # Yields a list representing row i, with elements accessed via __getitem__ for columns 0 to cols-1.
-            yield [self[i, j] for j in range(self.cols)]
+            # Initializes row i with zeros.
+            row = [0] * self.cols
+            # Fills in the stored elements if the next non-empty row is row i.
+            if pending is not None and pending[0] == i:
+                # Iterates over the stored elements of the row.
+                for j, value in pending[1]:
+                    # Writes the element into the dense row.
+                    row[j] = value
+                # Reads the next non-empty row.
+                pending = next(stored, None)
+            # Yields a list representing row i.
+            yield row
+
+    # Defines a generator that yields (i, [(j, value), ...]) for every row holding stored elements, in row order with
+    # the columns of each row in increasing order. Empty rows are skipped, so the cost is O(nnz) (plus the row count
+    # for frozen matrices), not O(rows * cols).
+    def iter_rows(self):
+        # Walks the CSR row offsets when the matrix is frozen (CSC matrices use their cached CSR conversion).
+        if self._data is None:
+            # Reads the CSR storage.
+            storage = self.compressed("csr")
+            # Reads the buffers into local variables for faster access in the loop.
+            indptr, indices, values = storage.indptr, storage.indices, storage.values
+            # Iterates over every row index.
+            for i in range(self.rows):
+                # Skips rows without stored elements.
+                if indptr[i] == indptr[i + 1]:
+                    # Continues with the next row.
+                    continue
+                # Yields the row with its stored elements, which CSR keeps sorted by column.
+                yield i, [(indices[k], values[k]) for k in range(indptr[i], indptr[i + 1])]
+            # Ends the generator.
+            return
+        # Groups the dictionary's elements by row.
+        by_row = {}
+        # Iterates over the stored elements.
+        for (i, j), value in self._data.items():
+            # Appends the element to the list of its row.
+            by_row.setdefault(i, []).append((j, value))
+        # Iterates over the non-empty rows in increasing order.
+        for i in sorted(by_row):
+            # Yields the row with its elements sorted by column.
+            yield i, sorted(by_row[i], key=lambda element: element[0])
+
+    # Defines a generator that yields every stored element as (i, j, value) in row-major order.
+    def iter_nonzeros(self):
+        # Iterates over the non-empty rows.
+        for i, row in self.iter_rows():
+            # Iterates over the stored elements of the row.
+            for j, value in row:
+                # Yields the element.
+                yield i, j, value
 
     # Defines the behavior when the matrix is called as a function, e.g., matrix(vector), for matrix-vector multiplication.
-    def __call__(self, vector):
+    # Also accepts a list of vectors or a 2-D NumPy array of shape (n, cols) to multiply a whole batch at once, and an
+    # optional preallocated out buffer that receives the result instead of a newly allocated one. With workers > 1 (or a
+    # default set by parallel.set_workers), the rows are partitioned across workers.
+    def __call__(self, vector, out=None, workers=None):
+        # Resolves the number of workers, importing the parallel module only if it may be needed.
+        workers = _resolve_workers(workers, self.nnz)
+        # Checks if the input is a NumPy array (detected by its ndim attribute, so NumPy is never imported here).
+        if hasattr(vector, "ndim"):
+            # Checks that the array is one vector or a batch of vectors with one element per matrix column.
+            if vector.ndim not in (1, 2) or vector.shape[-1] != self.cols:
+                # Raises a ValueError if the array has the wrong shape.
+                raise ValueError("Vector length must match matrix column count.")
+            # Runs the vectorized kernel on blocks of rows in a thread pool when more than one worker is used.
+            if workers > 1:
+                # Imports the threaded kernel when needed.
+                from .parallel import parallel_matmat_numpy
+                # Returns the result of the threaded kernel.
+                return parallel_matmat_numpy(self.compressed("csr"), vector, workers, out)
+            # Returns the result of the vectorized kernel over the CSR index arrays.
+            return csr_matmat_numpy(self.compressed("csr"), vector, out)
+        # Checks if the input is a list of vectors (a batch) rather than a single vector.
+        if isinstance(vector, list) and vector and isinstance(vector[0], (list, tuple)):
+            # Checks the length of every vector of the batch.
+            if any(len(v) != self.cols for v in vector):
+                # Raises a ValueError if a vector has incorrect length.
+                raise ValueError("Vector length must match matrix column count.")
+            # Multiplies the vectors one at a time on the process pool when more than one worker is used.
+            if workers > 1:
+                # Imports the parallel kernel when needed.
+                from .parallel import parallel_matvec
+                # Compresses the matrix once for the whole batch.
+                storage = self.compressed("csr")
+                # Uses new result lists unless preallocated buffers were given.
+                out = [[0] * self.rows for _ in vector] if out is None else out
+                # Checks that there is one buffer per vector.
+                if len(out) != len(vector):
+                    # Raises a ValueError if the number of buffers is wrong.
+                    raise ValueError("Output buffer must hold one result per input vector.")
+                # Iterates over the vectors and their result lists together.
+                for v, result in zip(vector, out):
+                    # Overwrites the result list with the product computed by the parallel kernel.
+                    parallel_matvec(storage, v, workers, result)
+                # Returns the result lists.
+                return out
+            # Returns the results of the batched kernel, which reads every row of the matrix once for all vectors.
+            return csr_matmat(self.compressed("csr"), vector, out)
         # Checks if the input is a list and its length matches the number of matrix columns.
         if not isinstance(vector, list) or len(vector) != self.cols:
             # Raises a ValueError if the vector is invalid or has incorrect length.
             raise ValueError("Vector length must match matrix column count.")
-        # Initializes a result list of zeros with length equal to the number of rows.
-        result = [0] * self.rows
+        # Partitions the rows across a process pool when more than one worker is used.
+        if workers > 1:
+            # Imports the parallel kernel when needed.
+            from .parallel import parallel_matvec
+            # Returns the result of the parallel kernel.
+            return parallel_matvec(self.compressed("csr"), vector, workers, out)
+        # If the matrix is frozen, dispatches to the kernel of its compressed format.
+        if self._data is None:
+            # Returns the result of the CSR (row dot products) or CSC (column scatter) kernel.
+            return (csr_matvec if self.format == "csr" else csc_matvec)(self._storage, vector, out)
+        # Initializes a result list of zeros with length equal to the number of rows, or clears the given buffer.
+        result = [0] * self.rows if out is None else out
+        # Resets the given buffer, since the products are accumulated into it.
+        if out is not None:
+            # Checks that the buffer has one entry per row.
+            if len(out) != self.rows:
+                # Raises a ValueError if the buffer has the wrong length.
+                raise ValueError(f"Output buffer length must match matrix row count ({self.rows}).")
+            # Sets every entry of the buffer to 0.
+            out[:] = [0] * self.rows
         # Iterates over each non-zero element in the data dictionary, with (i, j) as the position and value as the element.
         for (i, j), value in self.data.items():
             # Updates the i-th element of the result by adding the product of the matrix element and the j-th vector element.
@@ -59,27 +495,106 @@ class Matrix:
         # Returns the resulting vector from the matrix-vector multiplication.
         return result
 
-    # Defines custom attribute access for dynamic properties like determinant and transpose.
+    # Defines the addition operator, which computes the sum with add_matrices. Inside a lazy.deferred() block, or when
+    # the other operand is already an expression, it builds a lazy expression instead (see lazy.py).
+    def __add__(self, other):
+        # Imports the operations module when needed (it imports this one).
+        from .operations import add_matrices
+        # Returns the sum, or the lazy sum.
+        return add_matrices(self, other)
+
+    # Defines the element-wise multiplication operator, which is lazy under the same conditions as addition.
+    def __mul__(self, other):
+        # Imports the operations module when needed.
+        from .operations import elementwise_multiply
+        # Returns the element-wise product, or the lazy product.
+        return elementwise_multiply(self, other)
+
+    # Defines the subtraction operator, which computes the difference right away (lazy expressions only cover sums
+    # and products, so an expression operand is evaluated first).
+    def __sub__(self, other):
+        # Imports the operations module when needed.
+        from .operations import subtract_matrices
+        # Returns the difference.
+        return subtract_matrices(self, other)
+
+    # Defines the in-place addition operator (A += B), which updates the matrix without allocating a result matrix.
+    def __iadd__(self, other):
+        # Imports the operations module when needed.
+        from .operations import elementwise_inplace
+        # Returns the updated matrix.
+        return elementwise_inplace(self, other, "add")
+
+    # Defines the in-place subtraction operator (A -= B).
+    def __isub__(self, other):
+        # Imports the operations module when needed.
+        from .operations import elementwise_inplace
+        # Returns the updated matrix.
+        return elementwise_inplace(self, other, "subtract")
+
+    # Defines the in-place element-wise multiplication operator (A *= B).
+    def __imul__(self, other):
+        # Imports the operations module when needed.
+        from .operations import elementwise_inplace
+        # Returns the updated matrix.
+        return elementwise_inplace(self, other, "multiply")
+
+    # Defines the matrix multiplication operator: the matrix-vector product for vectors, otherwise the matrix product
+    # computed by matmul, which is lazy under the same conditions as addition.
+    def __matmul__(self, other):
+        # Applies the matrix to vectors (lists or NumPy arrays) right away.
+        if isinstance(other, list) or hasattr(other, "ndim"):
+            # Returns the matrix-vector product.
+            return self(other)
+        # Imports the operations module when needed.
+        from .operations import matmul
+        # Returns the product, or the lazy product.
+        return matmul(self, other)
+
+    # Defines the power operator (A ** k), the k-th matrix power computed by repeated squaring.
+    def __pow__(self, k):
+        # Imports the operations module when needed.
+        from .operations import matrix_power
+        # Returns the power.
+        return matrix_power(self, k)
+
+    # Defines a property that returns a zero-copy transposed view of the matrix (see operations.transposed_view). Unlike
+    # the cached transpose attribute, the view shares the matrix's compressed buffers.
+    @property
+    def T(self):
+        # Imports the operations module when needed.
+        from .operations import transposed_view
+        # Returns the view.
+        return transposed_view(self)
+
+    # Defines custom attribute access for dynamic properties like determinant and transpose. Python only calls it for
+    # attributes that are not found otherwise, e.g. the probes of hasattr, copy and pickle.
     def __getattr__(self, name):
-        # Imports compute_determinant and compute_transpose functions from the operations module when needed.
-        from operations import compute_determinant, compute_transpose
+        # Rejects every other name before importing anything, so failed lookups stay cheap.
+        if name not in _DERIVED and name not in ("determinant", "transpose"):
+            # Raises an AttributeError with a message indicating the attribute doesn't exist.
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        # Imports the operations module when needed, to compute the derived quantities.
+        from . import operations
+        # Checks if the requested attribute is one of the cached derived quantities (row sums, norms, ...).
+        if name in _DERIVED:
+            # Computes the quantity on first access, with the operations function registered for it.
+            if name not in self._derived_cache:
+                # Calls the function and caches the result.
+                self._derived_cache[name] = getattr(operations, _DERIVED[name])(self)
+            # Returns the cached value.
+            return self._derived_cache[name]
         # Checks if the requested attribute is 'determinant'.
         if name == 'determinant':
             # If the determinant cache is None, computes the determinant and stores it in the cache.
             if self._determinant_cache is None:
                 # Calls compute_determinant to calculate the determinant and caches the result.
-                self._determinant_cache = compute_determinant(self)
+                self._determinant_cache = operations.compute_determinant(self)
             # Returns the cached determinant value.
             return self._determinant_cache
-        # Checks if the requested attribute is 'transpose'.
-        elif name == 'transpose':
-            # If the transpose cache is None, computes the transpose and stores it in the cache.
-            if self._transpose_cache is None:
-                # Calls compute_transpose to calculate the transpose and caches the result.
-                self._transpose_cache = compute_transpose(self)
-            # Returns the cached transpose matrix.
-            return self._transpose_cache
-        # If the attribute name is neither 'determinant' nor 'transpose', raises an AttributeError.
-        else:
-            # Raises an AttributeError with a message indicating the attribute doesn't exist.
-            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
\ No newline at end of file
+        # Otherwise the requested attribute is 'transpose'; if the transpose cache is None, computes and caches it.
+        if self._transpose_cache is None:
+            # Calls compute_transpose to calculate the transpose and caches the result.
+            self._transpose_cache = operations.compute_transpose(self)
+        # Returns the cached transpose matrix.
+        return self._transpose_cache
\ No newline at end of file
@@ -0,0 +1,161 @@
+# Imports Fraction to run the elimination in exact rational arithmetic for integer matrices.
+from fractions import Fraction
+# Imports heappush and heappop to always find the remaining column with the fewest non-zero elements.
+from heapq import heappop, heappush
+
+# Defines the threshold used by threshold partial pivoting: any candidate at least this fraction of the largest
+# candidate in the pivot column is numerically acceptable, and among those the sparsest row is chosen.
+PIVOT_THRESHOLD = 0.1
+
+
+# Defines a helper that returns the sign (+1 or -1) of a permutation of range(n) given as a list.
+def _permutation_sign(order):
+    # Initializes the sign of the permutation.
+    sign = 1
+    # Initializes the set of positions already visited.
+    seen = set()
+    # Iterates over every position of the permutation.
+    for start in range(len(order)):
+        # Initializes the length of the cycle that starts at this position.
+        length = 0
+        # Starts walking the cycle.
+        k = start
+        # Walks the cycle until it returns to a visited position (cycles that were already walked have length 0).
+        while k not in seen:
+            # Marks the position as visited.
+            seen.add(k)
+            # Moves to the next position of the cycle.
+            k = order[k]
+            # Counts the element.
+            length += 1
+        # Flips the sign for every cycle of even length (each one is an odd number of transpositions).
+        if length and length % 2 == 0:
+            # Flips the sign.
+            sign = -sign
+    # Returns the sign of the permutation.
+    return sign
+
+
+# Defines a function that computes the determinant of a square matrix by sparse LU elimination.
+def lu_determinant(matrix, exact=None):
+    # Reads the size of the (square) matrix.
+    n = matrix.rows
+    # Copies the non-zero elements into one {column: value} dictionary per row, the working form of the elimination.
+    rows = {}
+    # Iterates over the non-zero elements of the matrix, whatever its storage format.
+    for (i, j), value in matrix.items():
+        # Stores the element in the dictionary of its row.
+        rows.setdefault(i, {})[j] = value
+    # Decides the arithmetic: exact for integer and rational matrices unless the caller chose otherwise.
+    if exact is None:
+        # Uses exact arithmetic only if every element is an integer or a Fraction.
+        exact = all(type(value) in (int, Fraction) for row in rows.values() for value in row.values())
+    # Remembers whether the result can be returned as a plain integer.
+    integral = exact and all(type(value) is int for row in rows.values() for value in row.values())
+    # Converts the elements to the chosen arithmetic.
+    for row in rows.values():
+        # Converts every element of the row to a Fraction (exact) or to floating point (adding 0.0 keeps complex values).
+        for j in row:
+            # Replaces the element with its converted value.
+            row[j] = Fraction(row[j]) if exact else row[j] + 0.0
+    # Defines the zero returned for singular matrices, in the type the elimination would have produced.
+    zero = 0 if integral else (Fraction(0) if exact else 0.0)
+    # Returns 0 right away when a row is empty, since the matrix is then singular.
+    if len(rows) < n:
+        # Returns the zero determinant.
+        return zero
+    # Builds the column index: for every column, the set of rows with a non-zero element in it.
+    col_rows = {j: set() for j in range(n)}
+    # Iterates over every row of the working form.
+    for i, row in rows.items():
+        # Registers the row in the index of every column where it has a non-zero element.
+        for j in row:
+            # Adds the row to the set of column j.
+            col_rows[j].add(i)
+    # Builds a heap of (count, column) so the sparsest remaining column can be picked as the next pivot column.
+    heap = [(len(members), j) for j, members in col_rows.items()]
+    # Arranges the list as a heap.
+    heap.sort()
+    # Initializes the product of the pivots.
+    det = Fraction(1) if exact else 1.0
+    # Initializes the order in which rows were chosen as pivots.
+    row_order = []
+    # Initializes the order in which columns were chosen as pivots.
+    col_order = []
+    # Eliminates one row and one column per step.
+    for _ in range(n):
+        # Pops heap entries until one matches the current count of a remaining column (older entries are stale).
+        while True:
+            # Pops the column with the smallest recorded count.
+            count, c = heappop(heap)
+            # Accepts the entry if the column is still remaining and the count is up to date.
+            if c in col_rows and len(col_rows[c]) == count:
+                # Stops searching.
+                break
+        # Returns 0 when the sparsest remaining column is empty, since the matrix is then singular.
+        if count == 0:
+            # Returns the zero determinant.
+            return zero
+        # Reads the candidate pivot rows of the column.
+        candidates = col_rows.pop(c)
+        # Chooses the pivot row.
+        if exact:
+            # Chooses the sparsest candidate row, since exact arithmetic has no rounding to control (fewest fill-ins).
+            p = min(candidates, key=lambda i: (len(rows[i]), i))
+        # Otherwise uses threshold partial pivoting to keep the floating-point elimination stable.
+        else:
+            # Finds the largest magnitude among the candidates.
+            largest = max(abs(rows[i][c]) for i in candidates)
+            # Chooses the sparsest candidate whose magnitude is within the threshold of the largest one.
+            p = min((i for i in candidates if abs(rows[i][c]) >= PIVOT_THRESHOLD * largest),
+                    key=lambda i: (len(rows[i]), -abs(rows[i][c]), i))
+        # Removes the pivot row from the working form.
+        pivot_row = rows.pop(p)
+        # Reads the pivot value and removes the pivot column from the pivot row.
+        pivot = pivot_row.pop(c)
+        # Multiplies the pivot into the determinant.
+        det *= pivot
+        # Records the pivot row.
+        row_order.append(p)
+        # Records the pivot column.
+        col_order.append(c)
+        # Removes the pivot row from the index of every remaining column it touches.
+        for j in pivot_row:
+            # Removes the row from the set of column j.
+            col_rows[j].discard(p)
+        # Eliminates the pivot column from every other candidate row.
+        for i in candidates:
+            # Skips the pivot row itself.
+            if i == p:
+                # Continues with the next candidate.
+                continue
+            # Reads the row to update.
+            row = rows[i]
+            # Computes the elimination factor and removes the pivot column from the row.
+            factor = row.pop(c) / pivot
+            # Subtracts the scaled pivot row from the row.
+            for j, value in pivot_row.items():
+                # Computes the updated element.
+                updated = row.get(j, 0) - factor * value
+                # Stores the element if it is non-zero.
+                if updated != 0:
+                    # Registers fill-in in the column index when the element is new.
+                    if j not in row:
+                        # Adds the row to the set of column j.
+                        col_rows[j].add(i)
+                    # Stores the updated element.
+                    row[j] = updated
+                # Otherwise drops the element, which cancelled out exactly.
+                elif j in row:
+                    # Removes the element from the row.
+                    del row[j]
+                    # Removes the row from the set of column j.
+                    col_rows[j].discard(i)
+        # Pushes the updated counts of the columns touched by the pivot row back into the heap.
+        for j in pivot_row:
+            # Pushes the new (count, column) entry; the older entry becomes stale.
+            heappush(heap, (len(col_rows[j]), j))
+    # Applies the signs of the row and column permutations chosen by the pivoting.
+    det *= _permutation_sign(row_order) * _permutation_sign(col_order)
+    # Returns the determinant as an integer for integer matrices, otherwise in the arithmetic that was used.
+    return int(det) if integral else det
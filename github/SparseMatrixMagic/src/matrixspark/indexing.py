@@ -0,0 +1,179 @@
+# Imports index to accept any integer-like index (Python or NumPy integers) and reject floats.
+from operator import index
+
+# Imports the Matrix class, which extracted rows, columns and submatrices are returned as.
+from .core import Matrix
+
+
+# Defines a helper that reads one integer index, counting negative indices from the end like Python sequences.
+def _position(key, size):
+    # Converts the index to a Python integer.
+    try:
+        # Reads the integer value of the index.
+        position = index(key)
+    # Rejects indices that are not integers.
+    except TypeError:
+        # Raises a ValueError with the offending index.
+        raise ValueError(f"Matrix indices must be integers, slices or sequences of integers, not {key!r}.") from None
+    # Counts a negative index from the end.
+    if position < 0:
+        # Shifts the index by the size of the dimension.
+        position += size
+    # Checks that the index is inside the dimension.
+    if not 0 <= position < size:
+        # Raises an IndexError for indices out of range.
+        raise IndexError(f"Index {key} is out of range for a dimension of size {size}.")
+    # Returns the index.
+    return position
+
+
+# Defines a helper that turns the index of one dimension into the selected positions (a range for integers and slices,
+# which keeps contiguous selections recognizable, a list otherwise) and whether it was a single integer.
+def _select(key, size):
+    # Reads a slice as the range of the positions it selects.
+    if isinstance(key, slice):
+        # Returns the range.
+        return range(*key.indices(size)), False
+    # Reads NumPy arrays as Python values (detected by their ndim attribute, so NumPy is never imported here).
+    if hasattr(key, "ndim"):
+        # Converts the array to a Python integer (0-d) or list.
+        key = key.tolist()
+    # Reads a sequence of indices.
+    if isinstance(key, (list, tuple, range)):
+        # Reads a boolean mask (one flag per position) as the positions of its True flags.
+        if len(key) == size and key and all(isinstance(flag, bool) for flag in key):
+            # Returns the selected positions.
+            return [position for position, flag in enumerate(key) if flag], False
+        # Returns the positions, in the given order and with repetitions.
+        return [_position(position, size) for position in key], False
+    # Reads a single integer as a range of one position.
+    position = _position(key, size)
+    # Returns the range and marks the index as a single integer.
+    return range(position, position + 1), True
+
+
+# Defines a helper that returns the bounds of a selection of consecutive positions, or None for other selections.
+def _contiguous(positions):
+    # Rejects lists and ranges with gaps or in decreasing order.
+    if not isinstance(positions, range) or (positions.step != 1 and len(positions) > 1):
+        # Returns None.
+        return None
+    # Returns the first position and the position just past the last one.
+    return (positions.start, positions.start + len(positions)) if positions else (0, 0)
+
+
+# Defines a helper that wraps a compressed storage taken from a matrix as a frozen Matrix with the matrix's dtype.
+def _wrap(matrix, storage):
+    # Wraps the storage without copying it.
+    result = Matrix.from_storage(storage)
+    # Keeps the explicit dtype of the matrix.
+    if matrix._dtype is not None:
+        # Records the dtype.
+        result._dtype = matrix._dtype
+    # Returns the matrix.
+    return result
+
+
+# Defines a helper that returns a zero-copy view for contiguous rows of every column (taken from the CSR form) or
+# contiguous columns of every row (taken from the CSC form) of a frozen matrix, or None if no view is possible.
+def _view(matrix, rows, cols):
+    # Dictionary matrices have no buffers to share.
+    if matrix._data is not None:
+        # Returns None.
+        return None
+    # Reads the bounds of the selected rows and columns, if they are contiguous.
+    row_bounds, col_bounds = _contiguous(rows), _contiguous(cols)
+    # Returns a block of compressed rows when every column is selected.
+    if row_bounds is not None and cols == range(matrix.cols):
+        # Returns the rows as a view into the CSR buffers (the CSC form of a matrix caches its CSR conversion).
+        return _wrap(matrix, matrix.compressed("csr").row_block(*row_bounds))
+    # Returns a block of compressed columns when every row is selected.
+    if col_bounds is not None and rows == range(matrix.rows):
+        # Returns the columns as a view into the CSC buffers (the CSR form of a matrix caches its CSC conversion).
+        return _wrap(matrix, matrix.compressed("csc").column_block(*col_bounds))
+    # Returns None for other selections.
+    return None
+
+
+# Defines a helper that maps every selected position to its position(s) in the result, or None when the whole dimension
+# is selected in order (every position keeps its place).
+def _position_map(positions, size):
+    # Skips the map for the whole dimension.
+    if positions == range(size):
+        # Returns None.
+        return None
+    # Initializes the map.
+    mapping = {}
+    # Iterates over the selected positions with their position in the result.
+    for new, old in enumerate(positions):
+        # Appends the result position (a position selected twice appears twice in the result).
+        mapping.setdefault(old, []).append(new)
+    # Returns the map.
+    return mapping
+
+
+# Defines a helper that copies the selected rows and columns into a new matrix. It walks whichever side is cheaper:
+# the selected rows through the row index when they are the smaller fraction of the matrix, otherwise the selected
+# columns through the column index, so the cost is proportional to the elements of the rows (or columns) walked.
+def _copy(matrix, rows, cols):
+    # Walks the columns when the selected fraction of the columns is smaller than that of the rows.
+    by_column = len(cols) * matrix.rows < len(rows) * matrix.cols
+    # Picks the positions walked (majors) and the positions filtered (minors).
+    majors, minors = (cols, rows) if by_column else (rows, cols)
+    # Maps the filtered positions to their positions in the result.
+    minor_map = _position_map(minors, matrix.rows if by_column else matrix.cols)
+    # Reads the lines walked from the compressed form when frozen (CSC for columns, CSR for rows).
+    if matrix._data is None:
+        # Reads the compressed storage, which is cached for the format the matrix is not frozen in.
+        storage = matrix.compressed("csc" if by_column else "csr")
+        # Reads the buffers into local variables for faster access in the loop.
+        indptr, indices, values = storage.indptr, storage.indices, storage.values
+
+        # Defines a helper that returns the stored (minor, value) pairs of a row (or column).
+        def line(k):
+            # Returns the pairs from the row's (or column's) slice of the buffers.
+            return zip(indices[indptr[k]:indptr[k + 1]], values[indptr[k]:indptr[k + 1]])
+    # Otherwise reads them from the cached row (or column) index of the dictionary.
+    else:
+        # Reads the index, built on first use and then kept up to date by __setitem__.
+        by_line = matrix.col_index if by_column else matrix.row_index
+
+        # Defines a helper that returns the stored (minor, value) pairs of a row (or column).
+        def line(k):
+            # Returns the pairs of the row (or column), none if it is empty.
+            return by_line[k].items() if k in by_line else ()
+    # Initializes the elements of the result.
+    result = {}
+    # Iterates over the walked rows (or columns) with their position in the result.
+    for p, k in enumerate(majors):
+        # Iterates over the stored elements of the row (or column).
+        for minor, value in line(k):
+            # Iterates over the result positions of the element's column (or row), skipping unselected ones.
+            for q in ((minor,) if minor_map is None else minor_map.get(minor, ())):
+                # Stores the element at its position in the result.
+                result[(q, p) if by_column else (p, q)] = value
+    # Builds the result with the dtype of the matrix.
+    submatrix = Matrix(len(rows), len(cols), result, matrix._dtype)
+    # Returns the result in the storage format of the matrix.
+    return submatrix if matrix._data is not None else submatrix.freeze(matrix.format)
+
+
+# Defines the function behind Matrix.__getitem__ for anything but a single (i, j) element: each index may be an integer,
+# a slice, a sequence of integers (in any order, with repetitions), a boolean mask or a NumPy array of those. Selecting
+# one row (matrix[i, :]) or column (matrix[:, j]) returns a 1 x cols or rows x 1 matrix. Contiguous rows of a frozen
+# matrix, or contiguous columns, are returned as views sharing its compressed buffers (O(1) beyond the first CSC
+# conversion for columns of a CSR matrix); other selections are copied in O(nnz of the rows or columns read), using the
+# per-row and per-column indexes cached for dictionary matrices.
+def extract(matrix, row_key, col_key):
+    # Reads the selected rows.
+    rows, single_row = _select(row_key, matrix.rows)
+    # Reads the selected columns.
+    cols, single_col = _select(col_key, matrix.cols)
+    # Returns the element itself when both indices are single integers (e.g. NumPy integers).
+    if single_row and single_col:
+        # Returns the element.
+        return matrix[rows[0], cols[0]]
+    # Returns a view when the selection is contiguous, otherwise a copy.
+    view = _view(matrix, rows, cols)
+    # Returns the view or the copy.
+    return view if view is not None else _copy(matrix, rows, cols)
@@ -0,0 +1,199 @@
+# Imports array to accumulate coordinates and values in compact typed buffers instead of a dictionary.
+from array import array
+
+# Imports the Matrix class to wrap the compressed result.
+from .core import Matrix
+# Imports the compressed storage, which builds CSR/CSC buffers directly from coordinate arrays.
+from .compressed import CompressedStorage
+
+# Defines how many bytes of text are read per chunk.
+CHUNK_BYTES = 1 << 22
+
+
+# Defines a helper that yields the lines of a text file in chunks of about CHUNK_BYTES bytes.
+def _chunks(file, chunk_bytes):
+    # Reads chunks until the end of the file.
+    while True:
+        # Reads whole lines totalling about chunk_bytes bytes.
+        lines = file.readlines(chunk_bytes)
+        # Stops at the end of the file.
+        if not lines:
+            # Ends the generator.
+            return
+        # Yields the chunk of lines.
+        yield lines
+
+
+# Defines a helper that returns a zero-filled typed buffer of the given length, allocated in one step.
+def _zeros(typecode, length):
+    # Creates the buffer from a block of zero bytes.
+    buffer = array(typecode)
+    # Fills the buffer with zeros.
+    buffer.frombytes(bytes(buffer.itemsize * length))
+    # Returns the buffer.
+    return buffer
+
+
+# Defines a helper that checks that every coordinate lies inside a matrix of the given shape.
+def _check_bounds(rows, cols, row_indices, col_indices):
+    # Checks the smallest and largest row and column indices.
+    if row_indices and (min(row_indices) < 0 or max(row_indices) >= rows or min(col_indices) < 0
+                        or max(col_indices) >= cols):
+        # Raises a ValueError for entries outside the matrix.
+        raise ValueError("Coordinate file has entries outside the matrix shape.")
+
+
+# Defines a function that reads a Matrix Market (.mtx) coordinate file into a frozen CSR (or CSC) matrix.
+# The entries are parsed chunk by chunk into arrays preallocated from the size line, duplicates are summed, and
+# no dictionary of all entries is ever built.
+def read_matrix_market(path, fmt="csr", chunk_bytes=CHUNK_BYTES):
+    # Opens the file for reading as text.
+    with open(path) as file:
+        # Reads the banner line, e.g. "%%MatrixMarket matrix coordinate real general".
+        banner = file.readline().lower().split()
+        # Checks that the file is a Matrix Market matrix file.
+        if len(banner) != 5 or banner[0] != "%%matrixmarket" or banner[1] != "matrix":
+            # Raises a ValueError for files with another banner.
+            raise ValueError(f"'{path}' is not a Matrix Market matrix file.")
+        # Reads the layout, value field and symmetry from the banner.
+        layout, field, symmetry = banner[2:]
+        # Checks that the file lists coordinates, which is how sparse matrices are stored.
+        if layout != "coordinate":
+            # Raises a ValueError for dense 'array' files.
+            raise ValueError("Only coordinate Matrix Market files are supported.")
+        # Checks that the values are of a supported kind.
+        if field not in ("real", "double", "integer", "pattern"):
+            # Raises a ValueError for complex or unknown value fields.
+            raise ValueError(f"Unsupported Matrix Market field '{field}'.")
+        # Checks that the symmetry is supported.
+        if symmetry not in ("general", "symmetric", "skew-symmetric"):
+            # Raises a ValueError for hermitian or unknown symmetries.
+            raise ValueError(f"Unsupported Matrix Market symmetry '{symmetry}'.")
+        # Reads lines until the size line, skipping comments and blank lines.
+        line = file.readline()
+        # Skips comment lines (starting with '%') and blank lines.
+        while line.startswith("%") or not line.strip():
+            # Checks for a file that ends before the size line.
+            if not line:
+                # Raises a ValueError for truncated files.
+                raise ValueError(f"'{path}' has no size line.")
+            # Reads the next line.
+            line = file.readline()
+        # Reads the number of rows, columns and listed entries.
+        rows, cols, listed = (int(token) for token in line.split())
+        # Bounds the number of entries: symmetric files also store the mirror of every off-diagonal entry.
+        capacity = listed if symmetry == "general" else 2 * listed
+        # Preallocates the row index buffer.
+        row_indices = _zeros("q", capacity)
+        # Preallocates the column index buffer.
+        col_indices = _zeros("q", capacity)
+        # Preallocates the value buffer: integers for integer and pattern files, floats otherwise.
+        values = _zeros("q" if field in ("integer", "pattern") else "d", capacity)
+        # Picks the parser of the value field.
+        parse = float if values.typecode == "d" else int
+        # Remembers whether entries are mirrored, and with which sign.
+        mirror = {"general": 0, "symmetric": 1, "skew-symmetric": -1}[symmetry]
+        # Initializes the number of entries stored so far.
+        count = 0
+        # Iterates over the chunks of entry lines.
+        for lines in _chunks(file, chunk_bytes):
+            # Iterates over the lines of the chunk.
+            for line in lines:
+                # Splits the line into tokens.
+                tokens = line.split()
+                # Skips blank lines and comments.
+                if not tokens or tokens[0].startswith("%"):
+                    # Continues with the next line.
+                    continue
+                # Converts the 1-based coordinates to 0-based indices.
+                i, j = int(tokens[0]) - 1, int(tokens[1]) - 1
+                # Reads the value (pattern files only list positions, which hold 1).
+                value = 1 if field == "pattern" else parse(tokens[2])
+                # Checks that the file does not hold more entries than its size line announced.
+                if count + (2 if mirror else 1) > capacity:
+                    # Raises a ValueError for inconsistent files.
+                    raise ValueError(f"'{path}' lists more entries than its size line announces.")
+                # Stores the entry's row index.
+                row_indices[count] = i
+                # Stores the entry's column index.
+                col_indices[count] = j
+                # Stores the entry's value.
+                values[count] = value
+                # Counts the entry.
+                count += 1
+                # Stores the mirrored entry of symmetric files, except on the diagonal.
+                if mirror and i != j:
+                    # Stores the mirrored row index.
+                    row_indices[count] = j
+                    # Stores the mirrored column index.
+                    col_indices[count] = i
+                    # Stores the mirrored value, negated for skew-symmetric matrices.
+                    values[count] = mirror * value
+                    # Counts the mirrored entry.
+                    count += 1
+    # Drops the unused preallocated slots of the row index buffer.
+    del row_indices[count:]
+    # Drops the unused preallocated slots of the column index buffer.
+    del col_indices[count:]
+    # Drops the unused preallocated slots of the value buffer.
+    del values[count:]
+    # Checks that every index lies inside the shape.
+    _check_bounds(rows, cols, row_indices, col_indices)
+    # Returns the frozen matrix built from the coordinate buffers.
+    return Matrix.from_storage(CompressedStorage.from_coo(rows, cols, row_indices, col_indices, values, fmt))
+
+
+# Defines a function that reads a plain coordinate text or CSV file ("row col value" per line) into a frozen CSR (or
+# CSC) matrix. Lines starting with '#' or '%' are comments; skip_header skips that many leading lines (e.g. CSV
+# column names). The shape is inferred from the largest indices unless given as (rows, cols).
+def read_coo(path, shape=None, delimiter=None, one_based=False, skip_header=0, fmt="csr", chunk_bytes=CHUNK_BYTES):
+    # Initializes the row index buffer (the number of entries is unknown, so the buffers grow by appending).
+    row_indices = array("q")
+    # Initializes the column index buffer.
+    col_indices = array("q")
+    # Initializes the value buffer with integers; it switches to floats at the first non-integer value.
+    values = array("q")
+    # Picks the offset subtracted from every coordinate.
+    base = 1 if one_based else 0
+    # Opens the file for reading as text.
+    with open(path) as file:
+        # Skips the header lines.
+        for _ in range(skip_header):
+            # Reads and discards a line.
+            file.readline()
+        # Iterates over the chunks of lines.
+        for lines in _chunks(file, chunk_bytes):
+            # Iterates over the lines of the chunk.
+            for line in lines:
+                # Splits the line on the delimiter (whitespace by default).
+                tokens = line.split(delimiter)
+                # Skips blank lines and comments.
+                if not tokens or not tokens[0].strip() or tokens[0].lstrip().startswith(("#", "%")):
+                    # Continues with the next line.
+                    continue
+                # Stores the entry's row index.
+                row_indices.append(int(tokens[0]) - base)
+                # Stores the entry's column index.
+                col_indices.append(int(tokens[1]) - base)
+                # Reads the value text.
+                text = tokens[2].strip()
+                # Stores the value as an integer while every value so far is an integer.
+                if values.typecode == "q":
+                    # Tries to read the value as an integer.
+                    try:
+                        # Stores the integer value.
+                        values.append(int(text))
+                        # Continues with the next line.
+                        continue
+                    # Switches the buffer to floats at the first non-integer value.
+                    except ValueError:
+                        # Converts the values read so far to floats.
+                        values = array("d", values)
+                # Stores the value as a float.
+                values.append(float(text))
+    # Infers the shape from the largest indices if it was not given.
+    rows, cols = shape if shape is not None else (max(row_indices, default=-1) + 1, max(col_indices, default=-1) + 1)
+    # Checks that every index lies inside the shape.
+    _check_bounds(rows, cols, row_indices, col_indices)
+    # Returns the frozen matrix built from the coordinate buffers.
+    return Matrix.from_storage(CompressedStorage.from_coo(rows, cols, row_indices, col_indices, values, fmt))
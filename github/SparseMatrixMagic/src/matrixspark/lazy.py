@@ -0,0 +1,461 @@
+# Imports contextmanager to build the deferred() context manager from a generator.
+from contextlib import contextmanager
+
+# Imports the Matrix class, which the leaves of an expression wrap and evaluation returns.
+from .core import Matrix
+# Imports the helper that packs per-row dictionaries into a CSR storage.
+from .compressed import _pack_rows
+
+# Initializes the nesting depth of deferred() blocks; while it is positive, the operations functions build expressions.
+_depth = 0
+
+
+# Defines a context manager inside which add_matrices, elementwise_multiply and matmul return lazy expressions
+# instead of computing their result, e.g. with deferred(): expr = matmul(add_matrices(a, b), c).
+@contextmanager
+def deferred():
+    # Declares that the module-level depth is modified.
+    global _depth
+    # Enters one more level of deferred evaluation.
+    _depth += 1
+    # Runs the body of the with block.
+    try:
+        # Hands control to the with block.
+        yield
+    # Leaves the level even if the block raised an exception.
+    finally:
+        # Leaves one level of deferred evaluation.
+        _depth -= 1
+
+
+# Defines a function that reports whether deferred evaluation is active.
+def deferring():
+    # Returns True inside a deferred() block.
+    return _depth > 0
+
+
+# Defines a function that wraps a Matrix into a leaf expression (expressions are returned unchanged).
+def lift(operand):
+    # Returns expressions unchanged.
+    if isinstance(operand, Expression):
+        # Returns the expression.
+        return operand
+    # Checks that the operand is a matrix.
+    if not isinstance(operand, Matrix):
+        # Raises a TypeError for other operands.
+        raise TypeError(f"Cannot build a matrix expression from {type(operand).__name__}.")
+    # Returns the leaf wrapping the matrix.
+    return Leaf(operand)
+
+
+# Defines the base class of lazy matrix expressions. Expressions are combined with +, * (element-wise) and @, and
+# nothing is computed until evaluate() is called or the expression is applied to a vector (expr(v) or expr @ v).
+class Expression:
+    # Defines the addition operator, which fuses with other additions into one n-ary node.
+    def __add__(self, other):
+        # Returns the fused element-wise sum.
+        return Elementwise("add", [self, lift(other)])
+
+    # Defines the reflected addition operator, used for Matrix + Expression.
+    def __radd__(self, other):
+        # Returns the fused element-wise sum.
+        return Elementwise("add", [lift(other), self])
+
+    # Defines the subtraction operator, which has no lazy node: it evaluates the expression and returns the difference.
+    def __sub__(self, other):
+        # Imports the operations module when needed (it imports this one).
+        from .operations import subtract_matrices
+        # Returns the difference.
+        return subtract_matrices(self, other)
+
+    # Defines the element-wise multiplication operator, which fuses with other products into one n-ary node.
+    def __mul__(self, other):
+        # Returns the fused element-wise product.
+        return Elementwise("multiply", [self, lift(other)])
+
+    # Defines the reflected element-wise multiplication operator.
+    def __rmul__(self, other):
+        # Returns the fused element-wise product.
+        return Elementwise("multiply", [lift(other), self])
+
+    # Defines the matrix multiplication operator: a chain product for matrices, a matrix-vector product for vectors.
+    def __matmul__(self, other):
+        # Applies the expression to vectors (lists or NumPy arrays) right away.
+        if isinstance(other, list) or hasattr(other, "ndim"):
+            # Returns the matrix-vector product.
+            return self(other)
+        # Returns the chain product.
+        return Product([self, lift(other)])
+
+    # Defines the reflected matrix multiplication operator, used for Matrix @ Expression.
+    def __rmatmul__(self, other):
+        # Returns the chain product.
+        return Product([lift(other), self])
+
+    # Defines the matrix-vector product of the expression. Products are pushed inward, so (A @ B)(v) is A(B(v)) and
+    # (A + B)(v) is A(v) + B(v): no intermediate matrix is built except for operands of element-wise products that
+    # are themselves matrix products. Accepts the same inputs as Matrix.__call__: one vector, a list of vectors or a
+    # 2-D NumPy array of shape (n, cols), an optional out buffer that receives the result, and workers, which is
+    # passed to the matrix products of the leaves.
+    def __call__(self, vector, out=None, workers=None):
+        # Checks the vectors and reads whether they are a batch.
+        batch = _check_vectors(vector, self.cols)
+        # Computes the product with the node.
+        result = self._apply(vector, batch, workers)
+        # Returns the result itself when no buffer was given, otherwise copies it into the buffer.
+        return result if out is None else _write_out(result, out, batch, self.rows)
+
+    # Defines a method that optimizes and computes the expression, returning a Matrix.
+    def evaluate(self):
+        # Returns the result computed by the node.
+        return self._evaluate()
+
+
+# Defines the leaf expression, which wraps an existing matrix.
+class Leaf(Expression):
+    # Initializes the leaf.
+    def __init__(self, matrix):
+        # Stores the matrix.
+        self.matrix = matrix
+        # Stores the number of rows.
+        self.rows = matrix.rows
+        # Stores the number of columns.
+        self.cols = matrix.cols
+
+    # Defines the matrix-vector product of the leaf (one vector or a batch).
+    def _apply(self, vector, batch, workers):
+        # Returns the product computed by the matrix's own kernels.
+        return self.matrix(vector, workers=workers)
+
+    # Defines the evaluation of the leaf.
+    def _evaluate(self):
+        # Returns the wrapped matrix itself.
+        return self.matrix
+
+
+# Defines the n-ary element-wise node ('add' or 'multiply'). Nested element-wise nodes are evaluated together in a
+# single pass over the rows of their leaves, without building intermediate matrices.
+class Elementwise(Expression):
+    # Initializes the node, flattening operands that use the same operation (A + B + C becomes one node).
+    def __init__(self, op, operands):
+        # Stores the operation.
+        self.op = op
+        # Initializes the flattened operands.
+        self.operands = []
+        # Iterates over the operands.
+        for operand in operands:
+            # Checks that every operand has the shape of the first one.
+            if (operand.rows, operand.cols) != (operands[0].rows, operands[0].cols):
+                # Raises a ValueError with the message of the matching operations function.
+                raise ValueError("Matrix dimensions must match for addition." if op == "add" else
+                                 "Matrix dimensions must match for element-wise multiplication.")
+            # Adds the operands of a node with the same operation, or the operand itself.
+            self.operands.extend(operand.operands if isinstance(operand, Elementwise) and operand.op == op
+                                 else [operand])
+        # Stores the number of rows.
+        self.rows = operands[0].rows
+        # Stores the number of columns.
+        self.cols = operands[0].cols
+
+    # Defines the matrix-vector product of the node (one vector or a batch).
+    def _apply(self, vector, batch, workers):
+        # Pushes the product into every operand of a sum, since (A + B)v = Av + Bv.
+        if self.op == "add":
+            # Computes the first product.
+            result = self.operands[0]._apply(vector, batch, workers)
+            # Iterates over the other operands.
+            for operand in self.operands[1:]:
+                # Computes the operand's product.
+                other = operand._apply(vector, batch, workers)
+                # Adds it with array arithmetic for NumPy input.
+                if hasattr(result, "ndim"):
+                    # Adds the arrays.
+                    result = result + other
+                # Adds the results of a list batch vector by vector.
+                elif batch:
+                    # Adds every pair of result lists.
+                    result = [[x + y for x, y in zip(r, o)] for r, o in zip(result, other)]
+                # Otherwise adds the lists element by element.
+                else:
+                    # Adds the lists.
+                    result = [x + y for x, y in zip(result, other)]
+            # Returns the sum.
+            return result
+        # Evaluates the product once for a batch, or for a parallel product, and uses the matrix's kernels.
+        if batch or workers is not None:
+            # Returns the product of the evaluated node.
+            return self._evaluate()(vector, workers=workers)
+        # Otherwise streams the fused rows of the product and multiplies each one by the vector.
+        result = [0] * self.rows
+        # Iterates over the non-empty fused rows.
+        for i, row in _fused_rows(self, _leaves(self)):
+            # Computes the dot product of the row with the vector.
+            result[i] = sum(value * vector[j] for j, value in row.items())
+        # Returns the product, as an array for NumPy input.
+        return _like(vector, result)
+
+    # Defines the evaluation of the node in one pass over the rows.
+    def _evaluate(self):
+        # Imports the dtype promotion helpers of the operations module when needed.
+        from .operations import _result_dtype, _with_dtype
+        # Reads the leaf matrices.
+        leaves = _leaves(self)
+        # Collects the fused rows, which are already non-zero only.
+        fused = dict(_fused_rows(self, leaves))
+        # Returns a frozen CSR result if any leaf is frozen, like the operations functions.
+        if any(leaf.format != "dok" for leaf in leaves):
+            # Packs the rows (empty rows included) into a CSR storage.
+            result = Matrix.from_storage(_pack_rows(self.rows, self.cols, (fused.get(i, {}) for i in range(self.rows))))
+        # Otherwise returns a dictionary-backed matrix.
+        else:
+            # Builds the matrix from the fused rows.
+            result = Matrix(self.rows, self.cols, {(i, j): value for i, row in fused.items() for j, value in row.items()})
+        # Returns the result with the dtype promoted from the leaves.
+        return _with_dtype(result, _result_dtype(*leaves))
+
+
+# Defines the matrix chain product node. Evaluation multiplies the factors in the order with the lowest estimated
+# cost, and matrix-vector products apply the factors right to left.
+class Product(Expression):
+    # Initializes the node, flattening nested chain products (A @ B @ C becomes one node).
+    def __init__(self, factors):
+        # Initializes the flattened factors.
+        self.factors = []
+        # Iterates over the factors.
+        for factor in factors:
+            # Checks that the factor can be multiplied with the previous one.
+            if self.factors and self.factors[-1].cols != factor.rows:
+                # Raises a ValueError with the message of matmul.
+                raise ValueError("Matrix A's columns must match Matrix B's rows for multiplication.")
+            # Adds the factors of a nested chain, or the factor itself.
+            self.factors.extend(factor.factors if isinstance(factor, Product) else [factor])
+        # Stores the number of rows.
+        self.rows = self.factors[0].rows
+        # Stores the number of columns.
+        self.cols = self.factors[-1].cols
+
+    # Defines the matrix-vector product of the chain (one vector or a batch).
+    def _apply(self, vector, batch, workers):
+        # Applies the factors from the right, so only vectors are ever built.
+        for factor in reversed(self.factors):
+            # Replaces the vector by the factor's product with it.
+            vector = factor._apply(vector, batch, workers)
+        # Returns the product.
+        return vector
+
+    # Defines the evaluation of the chain in the cheapest order.
+    def _evaluate(self):
+        # Imports matmul from the operations module when needed (the operations module imports this one).
+        from .operations import matmul
+        # Evaluates every factor.
+        matrices = [factor._evaluate() for factor in self.factors]
+        # Finds the cheapest multiplication order.
+        split = _chain_order(matrices)
+
+        # Defines a helper that multiplies the factors i to j in the chosen order.
+        def multiply(i, j):
+            # Returns the factor itself for a single one.
+            if i == j:
+                # Returns the matrix.
+                return matrices[i]
+            # Reads where the chosen order splits the range.
+            k = split[i, j]
+            # Returns the product of both halves.
+            return matmul(multiply(i, k), multiply(k + 1, j))
+
+        # Returns the product of the whole chain.
+        return multiply(0, len(matrices) - 1)
+
+
+# Defines a helper that finds the cheapest order of a matrix chain product by dynamic programming. Multiplying X by Y
+# over an inner dimension k costs about nnz(X) * nnz(Y) / k multiply-adds with Gustavson's algorithm, which is also the
+# estimated number of non-zero elements of the result (capped at its size). Returns the split point of every range.
+def _chain_order(matrices):
+    # Reads the number of factors.
+    n = len(matrices)
+    # Initializes the estimated non-zero count of every range with the single factors.
+    nnz = {(i, i): matrices[i].nnz for i in range(n)}
+    # Initializes the cost of every single factor.
+    cost = {(i, i): 0 for i in range(n)}
+    # Initializes the best split of every range.
+    split = {}
+    # Iterates over the range lengths.
+    for length in range(2, n + 1):
+        # Iterates over the ranges of that length.
+        for i in range(n - length + 1):
+            # Computes the last factor of the range.
+            j = i + length - 1
+            # Initializes the best cost.
+            cost[i, j] = float("inf")
+            # Iterates over the split points.
+            for k in range(i, j):
+                # Estimates the multiply-adds of the final multiplication.
+                work = nnz[i, k] * nnz[k + 1, j] / max(matrices[k].cols, 1)
+                # Keeps the split if it is the cheapest so far.
+                if cost[i, k] + cost[k + 1, j] + work < cost[i, j]:
+                    # Stores the cost.
+                    cost[i, j] = cost[i, k] + cost[k + 1, j] + work
+                    # Stores the split.
+                    split[i, j] = k
+                    # Estimates the non-zero count of the range's result.
+                    nnz[i, j] = min(work, matrices[i].rows * matrices[j].cols)
+    # Returns the best splits.
+    return split
+
+
+# Defines a helper that lists the matrices at the leaves of an element-wise tree, in a fixed order. Chain products
+# inside the tree are evaluated here, since element-wise operations need their elements.
+def _leaves(node):
+    # Walks the operands of nested element-wise nodes.
+    if isinstance(node, Elementwise):
+        # Returns the leaves of every operand, in order.
+        return [leaf for operand in node.operands for leaf in _leaves(operand)]
+    # Otherwise evaluates the operand into a matrix.
+    return [node._evaluate()]
+
+
+# Defines a helper that yields (i, {column: value}) for every non-empty row of an element-wise tree, computed in one
+# pass that reads the rows of the tree's leaf matrices (from _leaves) in order. Zero results (cancelled sums) are
+# dropped.
+def _fused_rows(node, leaves):
+    # Starts iterating over the non-empty rows of every leaf.
+    iterators = [leaf.iter_rows() for leaf in leaves]
+    # Reads the first non-empty row of every leaf.
+    pending = [next(iterator, None) for iterator in iterators]
+    # Continues while any leaf has rows left.
+    while any(entry is not None for entry in pending):
+        # Finds the smallest pending row index.
+        i = min(entry[0] for entry in pending if entry is not None)
+        # Initializes the row of every leaf at that index.
+        rows = []
+        # Iterates over the leaves.
+        for k, entry in enumerate(pending):
+            # Takes the leaf's row if it is the current one.
+            if entry is not None and entry[0] == i:
+                # Stores the row as a dictionary.
+                rows.append(dict(entry[1]))
+                # Reads the leaf's next non-empty row.
+                pending[k] = next(iterators[k], None)
+            # Otherwise the leaf's row is empty.
+            else:
+                # Stores an empty row.
+                rows.append({})
+        # Computes the fused row.
+        row = _fused_row(node, iter(rows))
+        # Yields the row if anything is left in it.
+        if row:
+            # Yields the row without zeros.
+            yield i, {j: value for j, value in row.items() if value != 0}
+
+
+# Defines a helper that computes one row of an element-wise tree from the rows of its leaves (consumed in order).
+def _fused_row(node, rows):
+    # Reads the leaf's row for operands that are not element-wise nodes.
+    if not isinstance(node, Elementwise):
+        # Returns the next leaf row.
+        return next(rows)
+    # Computes the rows of every operand, in leaf order.
+    operands = [_fused_row(operand, rows) for operand in node.operands]
+    # Merges the rows of a sum.
+    if node.op == "add":
+        # Starts from a copy of the first row.
+        result = dict(operands[0])
+        # Iterates over the other rows.
+        for row in operands[1:]:
+            # Iterates over the row's elements.
+            for j, value in row.items():
+                # Adds the element.
+                result[j] = result.get(j, 0) + value
+        # Returns the sum.
+        return result
+    # Intersects the rows of a product, iterating over the shortest one.
+    shortest = min(operands, key=len)
+    # Initializes the product.
+    result = {}
+    # Iterates over the shortest row's elements.
+    for j, value in shortest.items():
+        # Multiplies the elements of every row at column j.
+        for row in operands:
+            # Skips the shortest row itself.
+            if row is not shortest:
+                # Multiplies the element (missing elements are zero).
+                value *= row.get(j, 0)
+        # Stores the product if it is non-zero.
+        if value != 0:
+            # Stores the element.
+            result[j] = value
+    # Returns the product.
+    return result
+
+
+# Defines a helper that checks the input of a matrix-vector product like Matrix.__call__ does, and returns whether it
+# is a batch of vectors (a 2-D NumPy array or a list of vectors) rather than a single vector.
+def _check_vectors(vector, cols):
+    # Checks a NumPy array (detected by its ndim attribute, so NumPy is never imported here).
+    if hasattr(vector, "ndim"):
+        # Checks that the array is one vector or a batch of vectors with one element per column.
+        if vector.ndim not in (1, 2) or vector.shape[-1] != cols:
+            # Raises a ValueError if the array has the wrong shape.
+            raise ValueError("Vector length must match matrix column count.")
+        # Returns whether the array is a batch.
+        return vector.ndim == 2
+    # Checks a list of vectors.
+    if isinstance(vector, list) and vector and isinstance(vector[0], (list, tuple)):
+        # Checks the length of every vector of the batch.
+        if any(len(v) != cols for v in vector):
+            # Raises a ValueError if a vector has incorrect length.
+            raise ValueError("Vector length must match matrix column count.")
+        # Returns True for the batch.
+        return True
+    # Checks a single vector.
+    if not isinstance(vector, list) or len(vector) != cols:
+        # Raises a ValueError if the vector is invalid or has incorrect length.
+        raise ValueError("Vector length must match matrix column count.")
+    # Returns False for the single vector.
+    return False
+
+
+# Defines a helper that copies the result of a matrix-vector product into a preallocated out buffer and returns it.
+def _write_out(result, out, batch, rows):
+    # Copies into a NumPy buffer of the result's shape.
+    if hasattr(out, "ndim"):
+        # Checks the shape of the buffer.
+        if out.shape != getattr(result, "shape", (len(result), rows) if batch else (rows,)):
+            # Raises a ValueError if the buffer has the wrong shape.
+            raise ValueError(f"Output buffer shape must match the result shape ({len(result)} results of {rows}).")
+        # Writes the result into the buffer.
+        out[...] = result
+        # Returns the buffer.
+        return out
+    # Copies a batch into one buffer per vector.
+    if batch:
+        # Checks that there is one buffer per vector.
+        if len(out) != len(result):
+            # Raises a ValueError if the number of buffers is wrong.
+            raise ValueError("Output buffer must hold one result per input vector.")
+        # Iterates over the buffers and the results together.
+        for buffer, values in zip(out, result):
+            # Writes the result into the buffer, converting a NumPy row to Python values.
+            buffer[:] = values.tolist() if hasattr(values, "tolist") else values
+        # Returns the buffers.
+        return out
+    # Checks that the buffer has one entry per row.
+    if len(out) != rows:
+        # Raises a ValueError if the buffer has the wrong length.
+        raise ValueError(f"Output buffer length must match matrix row count ({rows}).")
+    # Writes the result into the buffer.
+    out[:] = result
+    # Returns the buffer.
+    return out
+
+
+# Defines a helper that returns a list result as a NumPy array when the input vector is one.
+def _like(vector, result):
+    # Returns the list for list input.
+    if isinstance(vector, list):
+        # Returns the list.
+        return result
+    # Imports NumPy lazily, as it is only needed for NumPy input.
+    import numpy as np
+    # Returns the result as an array.
+    return np.asarray(result)
@@ -1,9 +1,9 @@
 # Imports the Matrix class from the core module to create and manipulate sparse matrices.
-from core import Matrix
+from .core import Matrix
 # Imports matrix operation functions (add_matrices, elementwise_multiply, matmul) from the operations module.
-from operations import add_matrices, elementwise_multiply, matmul
+from .operations import add_matrices, elementwise_multiply, matmul
 # Imports the pretty_print function from the utils module for formatted matrix output.
-from utils import pretty_print
+from .utils import pretty_print
 # Imports Fore and Style from the colorama library to enable colored and styled terminal output.
 from colorama import Fore, Style
 
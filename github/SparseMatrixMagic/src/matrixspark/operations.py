@@ -1,9 +1,50 @@
+# Imports the math module for the square root of the Frobenius norm.
+import math
+
 # Imports the Matrix class from the core module to use its functionality in matrix operations.
-from core import Matrix
+from .core import Matrix
+# Imports the format-specific kernels of the compressed storage, used when an operand has been frozen.
+from .compressed import (_binary_op, cast_value, compressed_merge, compressed_merge_into, csr_matmul, drop_small,
+                         promote_dtypes, transpose_items)
+# Imports the lazy expression helpers, used when evaluation is deferred or an operand is already an expression.
+from .lazy import Expression, deferring, lift
+
+
+# Defines a helper that checks whether any of the given matrices is stored in a compressed format.
+def _any_compressed(*matrices):
+    # Returns True if at least one matrix has been frozen into CSR or CSC storage.
+    return any(matrix.format != "dok" for matrix in matrices)
+
+
+# Defines a helper that returns the dtype of the result of an operation on the given matrices, promoted from the
+# operands' dtypes, or None (inferred from the result's values) when no operand has an explicit dtype.
+def _result_dtype(*matrices):
+    # Leaves the dtype to inference when every operand infers its own.
+    if all(matrix._dtype is None for matrix in matrices):
+        # Returns None.
+        return None
+    # Returns the promoted dtype of the operands.
+    return promote_dtypes(*(matrix.dtype for matrix in matrices))
+
+
+# Defines a helper that gives a result matrix the dtype of the operation, converting its values only if needed.
+def _with_dtype(result, dtype):
+    # Keeps the result as it is when the dtype is inferred or already recorded.
+    if dtype is None or result._dtype == dtype:
+        # Returns the result.
+        return result
+    # Records the dtype without converting when the values already have it.
+    if result.dtype == dtype:
+        # Stores the dtype.
+        result._dtype = dtype
+        # Returns the result.
+        return result
+    # Returns a converted copy otherwise.
+    return result.astype(dtype)
 
 
 # Defines a function to compute the determinant of a square matrix.
-def compute_determinant(matrix):
+def compute_determinant(matrix, exact=None):
     # Checks if the matrix is square by comparing the number of rows and columns.
     if matrix.rows != matrix.cols:
         # Raises a ValueError if the matrix is not square, as determinant is only defined for square matrices.
@@ -12,115 +53,430 @@ def compute_determinant(matrix):
     if matrix.rows == 1:
         # Returns the single element of a 1x1 matrix as its determinant.
         return matrix[0, 0]
-    # Initializes the determinant value to 0.
-    det = 0
-    # Iterates over each column index in the first row to compute the determinant using cofactor expansion.
-    for j in range(matrix.cols):
-        # Checks if the element at position (0, j) is non-zero to avoid unnecessary computations.
-        if matrix[0, j] != 0:
-            # Computes the cofactor for the element at position (0, j).
-            cofactor = compute_cofactor(matrix, 0, j)
-            # Adds the contribution of the element to the determinant: (-1)^j * element * cofactor.
-            det += ((-1) ** j) * matrix[0, j] * cofactor
-    # Returns the computed determinant value.
-    return det
+    # Imports the sparse LU elimination when needed (it loads the fractions module).
+    from .decomposition import lu_determinant
+    # Computes the determinant in O(n^3) by sparse LU elimination (exact Fraction arithmetic for integer matrices).
+    return lu_determinant(matrix, exact)
 
 
 # Defines a function to compute the cofactor for a specific element at position (row, col) in the matrix.
 def compute_cofactor(matrix, row, col):
     # Creates a new Matrix instance for the submatrix, with dimensions reduced by 1 (excluding the specified row and column).
     submatrix = Matrix(matrix.rows - 1, matrix.cols - 1)
-    # Iterates over all row indices of the original matrix.
-    for i in range(matrix.rows):
-        # Skips the row that is to be excluded for the cofactor computation.
-        if i == row:
-            # Continues to the next iteration, ignoring this row.
+    # Iterates over the non-zero elements of the original matrix, whatever its storage format.
+    for (i, j), value in matrix.items():
+        # Skips the row and the column that are to be excluded for the cofactor computation.
+        if i == row or j == col:
+            # Continues to the next iteration, ignoring this element.
             continue
-        # Iterates over all column indices of the original matrix.
-        for j in range(matrix.cols):
-            # Skips the column that is to be excluded for the cofactor computation.
-            if j == col:
-                # Continues to the next iteration, ignoring this column.
-                continue
-            # Computes the row index for the submatrix (adjusts if i is after the excluded row).
-            sub_i = i if i < row else i - 1
-            # Computes the column index for the submatrix (adjusts if j is after the excluded column).
-            sub_j = j if j < col else j - 1
-            # Checks if the element at (i, j) exists in the original matrix's data dictionary.
-            if (i, j) in matrix.data:
-                # Copies the element from the original matrix to the appropriate position in the submatrix.
-                submatrix[sub_i, sub_j] = matrix[i, j]
+        # Computes the row index for the submatrix (adjusts if i is after the excluded row).
+        sub_i = i if i < row else i - 1
+        # Computes the column index for the submatrix (adjusts if j is after the excluded column).
+        sub_j = j if j < col else j - 1
+        # Copies the element from the original matrix to the appropriate position in the submatrix.
+        submatrix[sub_i, sub_j] = value
     # Returns the determinant of the submatrix, which is the cofactor value.
     return submatrix.determinant
 
 
-# Defines a function to compute the transpose of a matrix.
+# Defines a function to compute the transpose of a matrix, as a new matrix in compressed form. Dictionary matrices are
+# transposed by two counting sorts straight into CSR buffers (linear time, no per-element __setitem__).
 def compute_transpose(matrix):
-    # Creates a new Matrix instance for the transpose, with swapped dimensions (rows become columns, columns become rows).
-    transpose = Matrix(matrix.cols, matrix.rows)
-    # Iterates over all non-zero elements in the original matrix's data dictionary.
-    for (i, j), value in matrix.data.items():
-        # Sets the element at position (j, i) in the transpose matrix to the value at (i, j) in the original matrix.
-        transpose[j, i] = value
-    # Returns the transposed matrix.
-    return transpose
+    # If the matrix is frozen, builds the transpose from the compressed buffers instead of copying element by element.
+    if _any_compressed(matrix):
+        # Reads the matrix in the other compressed format; the CSC buffers of a matrix are the CSR buffers of its transpose.
+        other = matrix.compressed("csc" if matrix.format == "csr" else "csr")
+        # Returns a matrix in the same format as the input that reinterprets those buffers with swapped dimensions.
+        return _with_dtype(Matrix.from_storage(other.share(matrix.format, matrix.cols, matrix.rows)), matrix._dtype)
+    # Returns a frozen CSR matrix built by counting sorts over the dictionary's elements.
+    return _with_dtype(Matrix.from_storage(transpose_items(matrix.rows, matrix.cols, matrix.data.items(),
+                                                           matrix._dtype)), matrix._dtype)
 
 
-# Defines a function to add two matrices of the same dimensions.
-def add_matrices(a, b):
-    # Checks if the dimensions of both matrices match (same number of rows and columns).
+# Defines a function that returns a zero-copy transposed view of a frozen matrix: the CSR buffers of a matrix are the
+# CSC buffers of its transpose (and vice versa), so the view shares them and only swaps the format and the shape.
+# Dictionary matrices are compressed to CSR first. Writing to the view converts the view alone to dictionary form, and
+# the view keeps showing the buffers it was made from if the matrix itself is written afterwards.
+def transposed_view(matrix):
+    # Reads the compressed storage (the matrix's own buffers when frozen).
+    storage = matrix.compressed(matrix.format if matrix.format != "dok" else "csr")
+    # Returns the storage reinterpreted in the other format with swapped dimensions.
+    return _with_dtype(Matrix.from_storage(
+        storage.share("csc" if storage.fmt == "csr" else "csr", matrix.cols, matrix.rows)), matrix._dtype)
+
+
+# Defines a function that computes the sum of every row, as a list with one entry per row.
+def compute_row_sums(matrix):
+    # Initializes the sums with zeros.
+    sums = [0] * matrix.rows
+    # Iterates over the non-zero elements of the matrix, whatever its storage format.
+    for (i, j), value in matrix.items():
+        # Adds the element to the sum of its row.
+        sums[i] += value
+    # Returns the row sums.
+    return sums
+
+
+# Defines a function that counts the non-zero elements of every row, as a list with one entry per row.
+def compute_nnz_per_row(matrix):
+    # Reads the counts straight from the row offsets when the matrix is frozen as CSR.
+    if matrix.format == "csr":
+        # Reads the compressed storage.
+        storage = matrix.compressed("csr")
+        # Returns the differences between consecutive row offsets.
+        return [storage.indptr[i + 1] - storage.indptr[i] for i in range(matrix.rows)]
+    # Initializes the counts with zeros.
+    counts = [0] * matrix.rows
+    # Iterates over the non-zero elements of the matrix, whatever its storage format.
+    for (i, j), value in matrix.items():
+        # Counts the element in its row.
+        counts[i] += 1
+    # Returns the counts.
+    return counts
+
+
+# Defines a function that computes the Frobenius norm (square root of the sum of squared magnitudes).
+def compute_frobenius_norm(matrix):
+    # Returns the square root of the sum of the squared magnitudes of the non-zero elements.
+    return math.sqrt(sum(abs(value) ** 2 for _, value in matrix.items()))
+
+
+# Defines a function that computes the 1-norm (largest sum of magnitudes over the columns).
+def compute_one_norm(matrix):
+    # Initializes the column sums with zeros.
+    sums = [0] * matrix.cols
+    # Iterates over the non-zero elements of the matrix.
+    for (i, j), value in matrix.items():
+        # Adds the magnitude of the element to the sum of its column.
+        sums[j] += abs(value)
+    # Returns the largest column sum (0 for a matrix without columns).
+    return max(sums, default=0)
+
+
+# Defines a function that computes the infinity-norm (largest sum of magnitudes over the rows).
+def compute_inf_norm(matrix):
+    # Initializes the row sums with zeros.
+    sums = [0] * matrix.rows
+    # Iterates over the non-zero elements of the matrix.
+    for (i, j), value in matrix.items():
+        # Adds the magnitude of the element to the sum of its row.
+        sums[i] += abs(value)
+    # Returns the largest row sum (0 for a matrix without rows).
+    return max(sums, default=0)
+
+
+# Defines a function that indexes the non-zero elements of a matrix by row, as {i: {j: value}}, so one row can be
+# read in O(nnz in the row) without scanning the dictionary (see indexing.py).
+def compute_row_index(matrix):
+    # Initializes the index.
+    index = {}
+    # Iterates over the non-zero elements of the matrix, whatever its storage format.
+    for (i, j), value in matrix.items():
+        # Stores the element in the dictionary of its row, creating it on first use.
+        index.setdefault(i, {})[j] = value
+    # Returns the row index.
+    return index
+
+
+# Defines a function that indexes the non-zero elements of a matrix by column, as {j: {i: value}}.
+def compute_col_index(matrix):
+    # Initializes the index.
+    index = {}
+    # Iterates over the non-zero elements of the matrix, whatever its storage format.
+    for (i, j), value in matrix.items():
+        # Stores the element in the dictionary of its column, creating it on first use.
+        index.setdefault(j, {})[i] = value
+    # Returns the column index.
+    return index
+
+
+# Maps every named element-wise operation to the description used in dimension errors.
+_DESCRIPTIONS = {"add": "addition", "subtract": "subtraction", "multiply": "element-wise multiplication",
+                 "maximum": "element-wise maximum", "minimum": "element-wise minimum"}
+
+
+# Defines a helper that checks that two matrices have the same dimensions, as element-wise operations require.
+def _check_same_shape(a, b, op):
+    # Raises a ValueError if the dimensions do not match.
     if a.rows != b.rows or a.cols != b.cols:
-        # Raises a ValueError if the dimensions do not match, as addition requires identical dimensions.
-        raise ValueError("Matrix dimensions must match for addition.")
-    # Creates a new Matrix instance for the result, with the same dimensions as the input matrices.
-    result = Matrix(a.rows, a.cols)
-    # Iterates over all non-zero elements in the first matrix's data dictionary.
-    for (i, j), value in a.data.items():
-        # Copies the element from the first matrix to the result matrix at the same position.
-        result[i, j] = value
-    # Iterates over all non-zero elements in the second matrix's data dictionary.
-    for (i, j), value in b.data.items():
-        # Adds the element from the second matrix to the existing value in the result matrix at position (i, j).
-        result[i, j] = result[i, j] + value
-    # Returns the resulting matrix, which is the sum of the two input matrices.
-    return result
+        # Reports the operation.
+        raise ValueError(f"Matrix dimensions must match for {_DESCRIPTIONS.get(op, 'element-wise operations')}.")
+
+
+# Defines the element-wise kernel of dictionary matrices: a single pass over the stored elements of both operands
+# (hash lookups instead of a sorted merge, since dictionaries are unordered), with exact zeros pruned.
+def _dict_merge(a_data, b_data, op):
+    # Resolves the operation.
+    function, intersect = _binary_op(op)
+    # Combines only the common elements when the operation is 0 as soon as one operand is 0.
+    if intersect:
+        # Walks the smaller operand and looks its elements up in the other one.
+        if len(b_data) < len(a_data):
+            # Computes the results at the elements of b that are stored in a.
+            result = {key: function(a_data[key], value) for key, value in b_data.items() if key in a_data}
+        # Otherwise walks a.
+        else:
+            # Computes the results at the elements of a that are stored in b.
+            result = {key: function(value, b_data[key]) for key, value in a_data.items() if key in b_data}
+    # Otherwise combines every element stored in either operand.
+    else:
+        # Computes the results at the elements of a, with 0 for elements b does not store.
+        result = {key: function(value, b_data.get(key, 0)) for key, value in a_data.items()}
+        # Iterates over the elements of b.
+        for key, value in b_data.items():
+            # Computes the results at the elements only b stores.
+            if key not in a_data:
+                # Applies the operation with 0 for a.
+                result[key] = function(0, value)
+    # Returns the results that did not cancel out to exactly 0.
+    return {key: value for key, value in result.items() if value != 0}
+
+
+# Defines the function behind every element-wise operation: op is a name from compressed.BINARY_OPS ("add",
+# "subtract", "multiply", "maximum", "minimum") or any function of two values that maps (0, 0) to 0, such as a NumPy
+# ufunc. Frozen operands use the sorted-merge kernel over their CSR indices, dictionary operands a single hash pass.
+def elementwise_apply(a, b, op, workers=None):
+    # Computes expression operands first, since only addition and multiplication have lazy nodes.
+    a, b = (operand.evaluate() if isinstance(operand, Expression) else operand for operand in (a, b))
+    # Checks that the dimensions match.
+    _check_same_shape(a, b, op)
+    # Resolves the operation first, so an invalid one is reported before any work.
+    _binary_op(op)
+    # Computes the dtype of the result from the dtypes of the operands.
+    dtype = _result_dtype(a, b)
+    # Imports the parallel execution mode when needed, so importing the package does not load the process pools.
+    from .parallel import parallel_csr, resolve_workers
+    # Resolves the number of workers (None uses the default set with parallel.set_workers).
+    workers = resolve_workers(workers, a.nnz)
+    # If more than one worker is used, partitions the rows of a across a process pool and returns a frozen CSR result.
+    if workers > 1:
+        # Runs the merge kernel on every block of rows in parallel.
+        return _with_dtype(Matrix.from_storage(parallel_csr(op, a.compressed("csr"), b.compressed("csr"), workers)),
+                           dtype)
+    # If either matrix is frozen, runs the merge kernel and returns a frozen CSR result.
+    if _any_compressed(a, b):
+        # Compresses both operands to CSR (reusing existing buffers) and wraps the result without copying.
+        return _with_dtype(Matrix.from_storage(compressed_merge(a.compressed("csr"), b.compressed("csr"), op)), dtype)
+    # Returns a dictionary matrix built from the merged elements.
+    return Matrix(a.rows, a.cols, _dict_merge(a.data, b.data, op), dtype)
+
+
+# Defines a function to add two matrices of the same dimensions.
+def add_matrices(a, b, workers=None):
+    # Builds a lazy expression inside a deferred() block or when an operand is already an expression.
+    if deferring() or isinstance(a, Expression) or isinstance(b, Expression):
+        # Returns the expression, which is only computed when evaluated or applied to a vector.
+        return lift(a) + lift(b)
+    # Returns the merged sum.
+    return elementwise_apply(a, b, "add", workers)
+
+
+# Defines a function that subtracts b from a element-wise (elements that cancel out are not stored).
+def subtract_matrices(a, b, workers=None):
+    # Returns the merged difference.
+    return elementwise_apply(a, b, "subtract", workers)
 
 
 # Defines a function to perform element-wise multiplication of two matrices.
-def elementwise_multiply(a, b):
-    # Checks if the dimensions of both matrices match (same number of rows and columns).
-    if a.rows != b.rows or a.cols != b.cols:
-        # Raises a ValueError if the dimensions do not match, as element-wise multiplication requires identical dimensions.
-        raise ValueError("Matrix dimensions must match for element-wise multiplication.")
-    # Creates a new Matrix instance for the result, with the same dimensions as the input matrices.
-    result = Matrix(a.rows, a.cols)
-    # Iterates over all non-zero elements in the first matrix's data dictionary.
-    for (i, j), value in a.data.items():
-        # Checks if the second matrix has a non-zero element at the same position (i, j).
-        if (i, j) in b.data:
-            # Sets the result at (i, j) to the product of the elements from both matrices at that position.
-            result[i, j] = value * b[i, j]
-    # Returns the resulting matrix, containing products of corresponding elements where both are non-zero.
-    return result
+def elementwise_multiply(a, b, workers=None):
+    # Builds a lazy expression inside a deferred() block or when an operand is already an expression.
+    if deferring() or isinstance(a, Expression) or isinstance(b, Expression):
+        # Returns the expression, which is only computed when evaluated or applied to a vector.
+        return lift(a) * lift(b)
+    # Returns the merged product, which only has elements stored in both matrices.
+    return elementwise_apply(a, b, "multiply", workers)
+
+
+# Defines a function that returns the element-wise maximum of two matrices (missing elements count as 0).
+def elementwise_maximum(a, b, workers=None):
+    # Returns the merged maximum.
+    return elementwise_apply(a, b, "maximum", workers)
+
+
+# Defines a function that returns the element-wise minimum of two matrices (missing elements count as 0).
+def elementwise_minimum(a, b, workers=None):
+    # Returns the merged minimum.
+    return elementwise_apply(a, b, "minimum", workers)
+
+
+# Defines a function that applies an element-wise operation to a in place (a = op(a, b), e.g. A += B), without
+# allocating a result matrix; the values keep a's dtype. A dictionary matrix is updated at the touched elements only
+# (just b's elements for addition and subtraction). A frozen matrix has its value buffer overwritten when the result
+# keeps its structure, and otherwise gets new buffers. A value buffer shared with other matrices (slicing views,
+# matrix.T, transpose) is copied first, so the update never changes them or their caches.
+def elementwise_inplace(a, b, op):
+    # Computes an expression operand first.
+    b = b.evaluate() if isinstance(b, Expression) else b
+    # Checks that the dimensions match.
+    _check_same_shape(a, b, op)
+    # Resolves the operation.
+    function, intersect = _binary_op(op)
+    # Updates the dictionary of a dictionary matrix.
+    if a._data is not None:
+        # Reads the dictionary.
+        data = a._data
+        # Drops the cached CSR form of the dictionary, even inside a batch, since it no longer matches.
+        a._csr_cache = None
+        # Reads b's elements without thawing it: from its dictionary, or by binary search in its compressed storage.
+        lookup = (lambda key: b._data.get(key, 0)) if b._data is not None else (lambda key: b._storage.get(*key))
+        # Initializes the new values of the touched elements, computed before any write in case b is a.
+        updates = {}
+        # Recomputes the elements of a unless the operation leaves them unchanged where b is 0 (x + 0 and x - 0).
+        if op not in ("add", "subtract"):
+            # Iterates over the elements of a.
+            for key, value in data.items():
+                # Computes the new value.
+                updates[key] = function(value, lookup(key))
+        # Computes the elements of b as well, unless the operation only keeps common elements.
+        if not intersect:
+            # Iterates over the elements of b.
+            for key, value in b.items():
+                # Skips elements already computed.
+                if key not in updates:
+                    # Computes the new value.
+                    updates[key] = function(data.get(key, 0), value)
+        # Writes the new values.
+        for key, value in updates.items():
+            # Removes elements that became 0, so no zero is stored.
+            if value == 0:
+                # Removes the element if it is stored.
+                data.pop(key, None)
+            # Otherwise stores the value, in a's dtype if it has one.
+            else:
+                # Assigns the value.
+                data[key] = value if a._dtype is None else cast_value(value, a._dtype)
+    # Otherwise merges into the compressed storage, in a's format.
+    else:
+        # Reads b in a's format (reusing existing buffers), before a's values are detached in case b is a.
+        other = b.compressed(a.format)
+        # Copies a value buffer shared with other matrices (copy-on-write).
+        if a._storage.shared:
+            # Replaces the storage by one with private values.
+            a._storage = a._storage.detach()
+        # Overwrites a's values when the structure is kept, otherwise builds new buffers.
+        if not compressed_merge_into(a._storage, other, op):
+            # Replaces the storage by the merged one.
+            a._storage = compressed_merge(a._storage, other, op, a._dtype)
+        # Drops the converted storage, which no longer matches.
+        a._converted_storage = None
+    # Records the change inside a batch_update() block, otherwise invalidates the caches.
+    if a._batch_depth:
+        # Marks the matrix as changed by the batch.
+        a._batch_dirty = True
+    # Invalidates every cache outside a batch.
+    else:
+        # Invalidates the caches.
+        a._invalidate_caches()
+    # Returns the updated matrix.
+    return a
+
+
+# Defines a helper that groups the non-zero elements of a matrix by row, giving each row a list of (column, value) pairs.
+def _row_index(matrix):
+    # Initializes a dictionary mapping a row index to the list of its non-zero (column, value) pairs.
+    rows = {}
+    # Iterates over all non-zero elements in the matrix's data dictionary.
+    for (i, j), value in matrix.data.items():
+        # Appends the (column, value) pair to the list of row i, creating the list on first use.
+        rows.setdefault(i, []).append((j, value))
+    # Returns the per-row index of non-zero elements.
+    return rows
 
 
 # Defines a function to perform matrix multiplication (matmul) of two matrices.
-def matmul(a, b):
+def matmul(a, b, workers=None):
+    # Builds a lazy expression inside a deferred() block or when an operand is already an expression.
+    if deferring() or isinstance(a, Expression) or isinstance(b, Expression):
+        # Returns the expression, which is only computed when evaluated or applied to a vector.
+        return lift(a) @ lift(b)
     # Checks if the number of columns in matrix a matches the number of rows in matrix b, as required for matrix multiplication.
     if a.cols != b.rows:
         # Raises a ValueError if the dimensions are incompatible for matrix multiplication.
         raise ValueError("Matrix A's columns must match Matrix B's rows for multiplication.")
-    # Creates a new Matrix instance for the result, with rows from matrix a and columns from matrix b.
-    result = Matrix(a.rows, b.cols)
-    # Iterates over all non-zero elements in matrix a's data dictionary.
-    for (i, j), a_val in a.data.items():
-        # Iterates over all column indices of the result matrix (columns of matrix b).
-        for k in range(b.cols):
-            # Iterates over the row indices of matrix b (which correspond to columns of matrix a).
-            for m in range(b.rows):
-                # Checks if matrix b has a non-zero element at position (m, k).
-                if (m, k) in b.data:
-                    # Adds the product of a[i, j] and b[m, k] to the result at position (i, k).
-                    result[i, k] = result[i, k] + a_val * b[m, k]
+    # Computes the dtype of the result from the dtypes of the operands.
+    dtype = _result_dtype(a, b)
+    # Imports the parallel execution mode when needed, so importing the package does not load the process pools.
+    from .parallel import parallel_csr, resolve_workers
+    # Resolves the number of workers (None uses the default set with parallel.set_workers).
+    workers = resolve_workers(workers, a.nnz)
+    # If more than one worker is used, partitions the rows of a across a process pool and returns a frozen CSR result.
+    if workers > 1:
+        # Runs the CSR kernel on every block of rows in parallel.
+        return _with_dtype(
+            Matrix.from_storage(parallel_csr("matmul", a.compressed("csr"), b.compressed("csr"), workers)), dtype)
+    # If either matrix is frozen, runs the CSR kernel and returns a frozen CSR result.
+    if _any_compressed(a, b):
+        # Compresses both operands to CSR (reusing existing buffers) and wraps the result without copying.
+        return _with_dtype(Matrix.from_storage(csr_matmul(a.compressed("csr"), b.compressed("csr"))), dtype)
+    # Builds the per-row index of matrix b once, so each row of b can be reached without scanning all of b.
+    b_rows = _row_index(b)
+    # Initializes the dictionary that will hold the non-zero elements of the result.
+    values = {}
+    # Iterates over the non-empty rows of matrix a (Gustavson's row-by-row algorithm).
+    for i, a_row in _row_index(a).items():
+        # Initializes a sparse accumulator mapping a result column to its running sum for row i.
+        accumulator = {}
+        # Iterates over the non-zero elements a[i, j] of the current row.
+        for j, a_val in a_row:
+            # Iterates over the non-zero elements b[j, k] of row j of matrix b; rows of b that are empty are skipped.
+            for k, b_val in b_rows.get(j, ()):
+                # Adds the product a[i, j] * b[j, k] to the running sum for the result position (i, k).
+                accumulator[k] = accumulator.get(k, 0) + a_val * b_val
+        # Iterates over the accumulated sums of row i.
+        for k, total in accumulator.items():
+            # Stores the sum only if it is non-zero, since products may cancel out (sparse matrix stores only non-zero elements).
+            if total != 0:
+                # Assigns the sum to the key (i, k) in the result dictionary.
+                values[(i, k)] = total
     # Returns the resulting matrix, which is the product of matrices a and b.
-    return result
\ No newline at end of file
+    return Matrix(a.rows, b.cols, values, dtype)
+
+
+# Defines a function that computes the k-th power of a square matrix by repeated squaring: O(log k) sparse products
+# over the CSR kernels instead of k - 1. Powers of sparse matrices fill in quickly (A^k holds the k-step paths of a
+# graph), so elements whose magnitude is at most threshold are dropped from every intermediate product, which keeps
+# it sparse at the cost of an approximate result (threshold=0, the default, only drops exact zeros). Returns a frozen
+# CSR matrix; the 0-th power is the identity.
+def matrix_power(matrix, k, threshold=0, workers=None):
+    # Checks that the matrix is square.
+    if matrix.rows != matrix.cols:
+        # Raises a ValueError for non-square matrices.
+        raise ValueError("Matrix power is only defined for square matrices.")
+    # Checks that the exponent is a non-negative integer.
+    if not isinstance(k, int) or k < 0:
+        # Raises a ValueError for negative or non-integer exponents.
+        raise ValueError("Matrix power exponent must be a non-negative integer.")
+    # Imports the parallel execution mode when needed, so importing the package does not load the process pools.
+    from .parallel import parallel_csr, resolve_workers
+    # Resolves the number of workers (None uses the default set with parallel.set_workers).
+    workers = resolve_workers(workers, matrix.nnz)
+
+    # Defines a helper that multiplies two CSR storages and drops the small elements of the product.
+    def multiply(a, b):
+        # Runs the product on a process pool or serially.
+        product = parallel_csr("matmul", a, b, workers) if workers > 1 else csr_matmul(a, b)
+        # Returns the product, pruned when a threshold is given.
+        return drop_small(product, threshold) if threshold else product
+    # Starts from a pruned copy of the matrix's CSR form, so even the first power never shares the matrix's buffers.
+    base = drop_small(matrix.compressed("csr"), threshold)
+    # Initializes the result as the identity (None until a factor is multiplied in).
+    result = None
+    # Iterates over the bits of the exponent, from the lowest.
+    while k:
+        # Multiplies the current square into the result when the bit is set.
+        if k & 1:
+            # Starts the result from the square, or multiplies it in.
+            result = base if result is None else multiply(result, base)
+        # Moves to the next bit.
+        k >>= 1
+        # Squares the base for the next bit, unless none is left.
+        if k:
+            # Squares the base.
+            base = multiply(base, base)
+    # Builds the identity for the 0-th power.
+    if result is None:
+        # Returns the frozen identity.
+        return _with_dtype(Matrix(matrix.rows, matrix.cols, {(i, i): 1 for i in range(matrix.rows)}).freeze(),
+                           matrix._dtype)
+    # Returns the power.
+    return _with_dtype(Matrix.from_storage(result), matrix._dtype)
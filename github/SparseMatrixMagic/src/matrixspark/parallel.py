@@ -0,0 +1,320 @@
+# Imports atexit to shut the worker pools down when the interpreter exits.
+import atexit
+# Imports bisect_left to split the rows of a matrix into blocks holding similar numbers of stored elements.
+from bisect import bisect_left
+
+# Imports the storage class and the serial CSR kernels, which every worker runs on its own block of rows.
+from .compressed import (CompressedStorage, compressed_merge, csr_add, csr_matmat_numpy, csr_matmul, csr_matvec,
+                        csr_multiply, stack_rows, typecode_of)
+
+# Defines the smallest number of stored elements for which a parallel run is worth the cost of starting the tasks.
+PARALLEL_MIN_NNZ = 10_000
+
+# Stores the default number of workers used when an operation is called with workers=None (1 means serial).
+_workers = 1
+# Stores the shared process pool as (number of workers, executor), created on first use.
+_process_pool = None
+# Stores the shared thread pool as (number of workers, executor), created on first use.
+_thread_pool = None
+
+# Maps the name of a row-partitioned kernel to the serial function that computes one block.
+_KERNELS = {"matmul": csr_matmul, "add": csr_add, "multiply": csr_multiply, "matvec": csr_matvec}
+
+
+# Defines a function that sets the default number of workers for matmul, add_matrices, elementwise_multiply and
+# Matrix.__call__.
+def set_workers(workers):
+    # Allows the module-level default to be replaced.
+    global _workers
+    # Checks that the number of workers is a positive integer.
+    if not isinstance(workers, int) or workers < 1:
+        # Raises a ValueError for invalid worker counts.
+        raise ValueError("Number of workers must be a positive integer.")
+    # Stores the new default.
+    _workers = workers
+
+
+# Defines a function that returns the default number of workers.
+def get_workers():
+    # Returns the module-level default.
+    return _workers
+
+
+# Defines a function that decides how many workers an operation on a given number of stored elements should use.
+def resolve_workers(workers, nnz):
+    # Uses the module-level default when the caller did not choose.
+    workers = _workers if workers is None else workers
+    # Checks that the number of workers is a positive integer.
+    if not isinstance(workers, int) or workers < 1:
+        # Raises a ValueError for invalid worker counts.
+        raise ValueError("Number of workers must be a positive integer.")
+    # Runs serially when the matrix is too small for parallelism to pay off.
+    return workers if nnz >= PARALLEL_MIN_NNZ else 1
+
+
+# Defines a helper that returns the shared pool of the given kind, recreating it if the worker count changed.
+def _pool(kind, workers):
+    # Allows the module-level pools to be replaced.
+    global _process_pool, _thread_pool
+    # Reads the current pool of the requested kind.
+    current = _process_pool if kind == "process" else _thread_pool
+    # Reuses the pool if it has the requested number of workers.
+    if current is not None and current[0] == workers:
+        # Returns the existing executor.
+        return current[1]
+    # Shuts down a pool of the wrong size.
+    if current is not None:
+        # Waits for the old pool's workers to exit.
+        current[1].shutdown()
+    # Imports the process pool (pure-Python kernels hold the GIL) and the thread pool (NumPy kernels release it) here,
+    # since serial calls, which only resolve the number of workers, never need them.
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    # Creates a pool of the requested kind and size.
+    executor = (ProcessPoolExecutor if kind == "process" else ThreadPoolExecutor)(max_workers=workers)
+    # Stores the new process pool.
+    if kind == "process":
+        # Remembers the pool and its size.
+        _process_pool = (workers, executor)
+    # Stores the new thread pool.
+    else:
+        # Remembers the pool and its size.
+        _thread_pool = (workers, executor)
+    # Returns the new executor.
+    return executor
+
+
+# Defines a function that shuts down the shared pools; it runs automatically at interpreter exit.
+@atexit.register
+def shutdown():
+    # Allows the module-level pools to be cleared.
+    global _process_pool, _thread_pool
+    # Iterates over both pools.
+    for pool in (_process_pool, _thread_pool):
+        # Shuts down pools that were created.
+        if pool is not None:
+            # Waits for the pool's workers to exit.
+            pool[1].shutdown()
+    # Forgets both pools.
+    _process_pool = _thread_pool = None
+
+
+# Defines a function that splits the rows of a CSR storage into at most `parts` blocks of similar numbers of
+# stored elements, returned as (start, stop) row ranges.
+def partition_rows(storage, parts):
+    # Reads the total number of stored elements.
+    nnz = storage.nnz
+    # Initializes the list of block boundaries with the first row.
+    bounds = [0]
+    # Iterates over the interior boundaries.
+    for k in range(1, parts):
+        # Finds the first row whose offset reaches k / parts of the stored elements.
+        row = min(bisect_left(storage.indptr, nnz * k // parts), storage.rows)
+        # Adds the boundary unless it would create an empty block.
+        if row > bounds[-1]:
+            # Records the boundary.
+            bounds.append(row)
+    # Adds the last row as the final boundary.
+    if storage.rows > bounds[-1]:
+        # Records the end of the matrix.
+        bounds.append(storage.rows)
+    # Returns the row ranges between consecutive boundaries.
+    return list(zip(bounds, bounds[1:]))
+
+
+# Defines a context manager that copies compressed storages into shared memory blocks for the worker processes.
+class SharedBuffers:
+    # Constructor method to initialize the list of shared memory blocks.
+    def __init__(self):
+        # Stores every shared memory block created, so they can be released on exit.
+        self.blocks = []
+
+    # Enters the context, returning the manager itself.
+    def __enter__(self):
+        # Returns the manager so storages can be exported inside the with block.
+        return self
+
+    # Exits the context, releasing and deleting every shared memory block.
+    def __exit__(self, *exc_info):
+        # Iterates over the shared memory blocks.
+        for block in self.blocks:
+            # Closes the parent's mapping of the block.
+            block.close()
+            # Deletes the block from the system.
+            block.unlink()
+        # Forgets the released blocks.
+        self.blocks = []
+
+    # Defines a method that exports a storage and returns a small picklable descriptor that workers can attach to.
+    def export(self, storage):
+        # Sends only the path of memory-mapped storages, so every worker maps the same page-cached file.
+        if storage.path is not None:
+            # Returns a file descriptor of the storage.
+            return "file", storage.path
+        # Sends storages holding Python objects inline, since objects cannot live in shared memory.
+        if not all(typecode_of(buffer) for buffer in (storage.indptr, storage.indices, storage.values)):
+            # Returns an inline descriptor carrying the storage itself.
+            return "inline", storage
+        # Initializes the list of (name, typecode, length) of the three buffers.
+        buffers = []
+        # Imports SharedMemory so workers read the matrix buffers without each receiving a pickled copy.
+        from multiprocessing.shared_memory import SharedMemory
+        # Iterates over the row offsets, indices and values.
+        for buffer in (storage.indptr, storage.indices, storage.values):
+            # Views the buffer as raw bytes.
+            raw = memoryview(buffer).cast("B")
+            # Creates a shared memory block large enough for the buffer (empty blocks are not allowed).
+            block = SharedMemory(create=True, size=max(1, len(raw)))
+            # Remembers the block so it is released on exit.
+            self.blocks.append(block)
+            # Copies the buffer into the block.
+            block.buf[:len(raw)] = raw
+            # Records how to rebuild the typed buffer in a worker.
+            buffers.append((block.name, typecode_of(buffer), len(buffer)))
+        # Returns the shared descriptor.
+        return "shared", (storage.fmt, storage.rows, storage.cols, buffers)
+
+
+# Defines a helper that rebuilds a storage from a descriptor inside a worker, keeping the attached blocks in `handles`.
+def _attach(descriptor, handles):
+    # Reads the descriptor kind and payload.
+    kind, payload = descriptor
+    # Returns inline storages as they were received.
+    if kind == "inline":
+        # Returns the unpickled storage.
+        return payload
+    # Maps file-backed storages from their file.
+    if kind == "file":
+        # Imports the file loader here, since most workers never receive a file-backed storage.
+        from .persist import load_storage
+        # Returns the storage mapped from the file.
+        return load_storage(payload)
+    # Reads the storage layout.
+    fmt, rows, cols, buffers = payload
+    # Imports SharedMemory to attach to the parent's blocks.
+    from multiprocessing.shared_memory import SharedMemory
+    # Initializes the list of typed views.
+    views = []
+    # Iterates over the shared buffers.
+    for name, typecode, length in buffers:
+        # Attaches to the shared memory block created by the parent.
+        block = SharedMemory(name=name)
+        # Remembers the block so the worker closes its mapping afterwards.
+        handles.append(block)
+        # Views the block as a typed buffer of the recorded length, without copying.
+        views.append(block.buf.cast(typecode)[:length])
+    # Returns a storage backed by the shared buffers.
+    return CompressedStorage(fmt, rows, cols, *views)
+
+
+# Defines the function that a worker process runs for one block of rows.
+def _run_block(kernel, start, stop, a_descriptor, b_operand):
+    # Initializes the list of attached shared memory blocks.
+    handles = []
+    # Computes the block, closing the attached blocks afterwards.
+    try:
+        # Returns the block's result, which is built in fresh buffers owned by the worker.
+        return _compute_block(kernel, start, stop, a_descriptor, b_operand, handles)
+    # Closes the worker's mappings even if the kernel failed.
+    finally:
+        # Iterates over the attached blocks.
+        for block in handles:
+            # Closes the mapping; a traceback may still reference a view, in which case it is released with the traceback.
+            try:
+                # Closes the worker's mapping of the block.
+                block.close()
+            # Ignores blocks still referenced by a traceback.
+            except BufferError:
+                # Leaves the mapping to be released with the traceback.
+                pass
+
+
+# Defines a helper that computes one block of rows with the serial kernel.
+def _compute_block(kernel, start, stop, a_descriptor, b_operand, handles):
+    # Attaches to the left operand and takes the block of rows assigned to this task.
+    a = _attach(a_descriptor, handles).row_block(start, stop)
+    # Multiplies the block by the vector for matrix-vector products.
+    if kernel == "matvec":
+        # Returns the block's slice of the result vector.
+        return csr_matvec(a, b_operand)
+    # Attaches to the right operand.
+    b = _attach(b_operand, handles)
+    # Takes the same block of rows of b for element-wise kernels (matmul needs all of b).
+    if kernel != "matmul":
+        # Takes the block of rows of b.
+        b = b.row_block(start, stop)
+    # Returns the block of the result, merging with the element-wise operation for other kernels.
+    return _KERNELS[kernel](a, b) if kernel in _KERNELS else compressed_merge(a, b, kernel)
+
+
+# Defines a function that runs a row-partitioned CSR kernel ('matmul', 'add', 'multiply', or any other element-wise
+# operation accepted by compressed_merge, as a name or a picklable function) on a process pool.
+def parallel_csr(kernel, a, b, workers):
+    # Splits the rows of a into one block per worker.
+    blocks = partition_rows(a, workers)
+    # Copies both operands into shared memory for the duration of the call.
+    with SharedBuffers() as shared:
+        # Exports the left operand.
+        a_descriptor = shared.export(a)
+        # Exports the right operand.
+        b_descriptor = shared.export(b)
+        # Runs one task per block on the shared process pool.
+        futures = [_pool("process", workers).submit(_run_block, kernel, start, stop, a_descriptor, b_descriptor)
+                   for start, stop in blocks]
+        # Collects the blocks of the result in row order.
+        results = [future.result() for future in futures]
+    # Returns the stacked result, or an empty result if a has no rows.
+    return stack_rows(results, b.cols)
+
+
+# Defines a function that multiplies a CSR storage by a list vector on a process pool.
+def parallel_matvec(storage, vector, workers, out=None):
+    # Uses a new result list unless a preallocated buffer was given.
+    if out is None:
+        # Allocates the result list.
+        out = [0] * storage.rows
+    # Otherwise checks the preallocated buffer.
+    elif len(out) != storage.rows:
+        # Raises a ValueError if the buffer has the wrong length.
+        raise ValueError(f"Output buffer length must match matrix row count ({storage.rows}).")
+    # Copies the matrix into shared memory for the duration of the call.
+    with SharedBuffers() as shared:
+        # Exports the matrix.
+        descriptor = shared.export(storage)
+        # Runs one task per block of rows, sending the vector with every task.
+        futures = [(start, _pool("process", workers).submit(_run_block, "matvec", start, stop, descriptor, vector))
+                   for start, stop in partition_rows(storage, workers)]
+        # Copies every block's slice of the result into place.
+        for start, future in futures:
+            # Reads the block's slice.
+            part = future.result()
+            # Writes the slice into the result.
+            out[start:start + len(part)] = part
+    # Returns the result vector.
+    return out
+
+
+# Defines a function that runs the vectorized NumPy kernel on a thread pool, one block of rows per thread (NumPy
+# releases the GIL inside its kernels, so the threads run concurrently and share the matrix without copies).
+def parallel_matmat_numpy(storage, vectors, workers, out=None):
+    # Imports NumPy here, since it is only needed (and already loaded by the caller) for NumPy input.
+    import numpy as np
+    # Computes the shape of the result: one row of results per vector, or a single result vector.
+    shape = (vectors.shape[0], storage.rows) if vectors.ndim == 2 else (storage.rows,)
+    # Uses a new result array unless a preallocated buffer was given.
+    if out is None:
+        # Allocates the result in the type of the products.
+        out = np.empty(shape, dtype=np.result_type(np.asarray(storage.values).dtype, vectors.dtype))
+    # Otherwise checks that the preallocated buffer has the shape of the result.
+    elif out.shape != shape:
+        # Raises a ValueError if the buffer has the wrong shape.
+        raise ValueError(f"Output buffer shape must be {shape} for this input.")
+    # Runs one task per block of rows, each writing into its own columns (or slice) of the result.
+    futures = [_pool("thread", workers).submit(csr_matmat_numpy, storage.row_block(start, stop), vectors,
+                                               out[..., start:stop])
+               for start, stop in partition_rows(storage, workers)]
+    # Waits for every block, re-raising any error.
+    for future in futures:
+        # Waits for the block.
+        future.result()
+    # Returns the result.
+    return out
@@ -0,0 +1,102 @@
+# Imports mmap to map saved matrices into memory instead of reading them.
+import mmap
+# Imports struct to write and read the fixed-size file header.
+import struct
+# Imports sys to record the byte order the buffers were written in.
+import sys
+# Imports array to look up the element size of a typecode.
+from array import array
+
+# Imports the compressed storage, which is what the file format holds.
+from .compressed import CompressedStorage, typecode_of
+
+# Defines the magic bytes that start every saved matrix file.
+MAGIC = b"MSPK"
+# Defines the version of the file format.
+VERSION = 1
+# Defines the header layout: magic, version, byte order, format, three buffer typecodes, rows, columns, stored elements.
+_HEADER = struct.Struct("<4sHccccc5xQQQ")
+# Defines the size reserved for the header, so the buffers that follow start on an aligned offset.
+HEADER_SIZE = 64
+# Defines the alignment of every buffer in the file.
+_ALIGN = 8
+
+
+# Defines a helper that rounds an offset up to the buffer alignment.
+def _aligned(offset):
+    # Returns the next multiple of the alignment.
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+# Defines a function that writes a compressed storage to a file: a 64-byte header followed by the row (or column)
+# offsets, the indices and the values, each aligned to 8 bytes and in the machine's byte order.
+def save_storage(storage, path):
+    # Reads the typecodes of the three buffers.
+    typecodes = [typecode_of(buffer) for buffer in (storage.indptr, storage.indices, storage.values)]
+    # Checks that every buffer is typed, since Python objects (e.g. Fraction) have no binary layout.
+    if None in typecodes:
+        # Raises a TypeError for matrices whose values are not plain integers or floats.
+        raise TypeError("Only matrices with integer or float values can be saved.")
+    # Builds the header.
+    header = _HEADER.pack(MAGIC, VERSION, sys.byteorder[0].encode(), storage.fmt[-1].encode(),
+                          *(typecode.encode() for typecode in typecodes), storage.rows, storage.cols, storage.nnz)
+    # Opens the file for writing in binary mode.
+    with open(path, "wb") as file:
+        # Writes the header, padded to its reserved size.
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        # Iterates over the three buffers in file order.
+        for buffer in (storage.indptr, storage.indices, storage.values):
+            # Writes the raw bytes of the buffer.
+            file.write(memoryview(buffer).cast("B"))
+            # Pads the file so the next buffer starts on an aligned offset.
+            file.write(b"\0" * (_aligned(file.tell()) - file.tell()))
+
+
+# Defines a function that opens a saved file as a compressed storage backed by a read-only memory map. Nothing is
+# read or copied up front: the buffers are views into the mapping, so loading takes the same time for any size and
+# processes that open the same file share one copy in the operating system's page cache.
+def load_storage(path):
+    # Opens the file for reading in binary mode.
+    with open(path, "rb") as file:
+        # Maps the whole file read-only (the mapping stays valid after the file is closed).
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    # Views the mapping as bytes.
+    raw = memoryview(mapping)
+    # Checks that the file is long enough to hold a header.
+    if len(raw) < HEADER_SIZE:
+        # Raises a ValueError for truncated files.
+        raise ValueError(f"'{path}' is not a matrixspark matrix file.")
+    # Unpacks the header.
+    magic, version, byteorder, fmt, *typecodes, rows, cols, nnz = _HEADER.unpack_from(raw)
+    # Checks the magic bytes.
+    if magic != MAGIC:
+        # Raises a ValueError for files in another format.
+        raise ValueError(f"'{path}' is not a matrixspark matrix file.")
+    # Checks the format version.
+    if version != VERSION:
+        # Raises a ValueError for unsupported versions.
+        raise ValueError(f"Unsupported matrixspark file version {version}.")
+    # Checks that the buffers were written in this machine's byte order, since they are used without conversion.
+    if byteorder != sys.byteorder[0].encode():
+        # Raises a ValueError for files written on a machine with the other byte order.
+        raise ValueError("Matrix file was written with a different byte order.")
+    # Computes the number of compressed rows (or columns).
+    n_major = rows if fmt == b"r" else cols
+    # Initializes the list of buffer views.
+    buffers = []
+    # Starts reading right after the header.
+    offset = HEADER_SIZE
+    # Iterates over the three buffers with their typecodes and lengths.
+    for typecode, length in zip(typecodes, (n_major + 1, nnz, nnz)):
+        # Reads the size in bytes of one element of the buffer.
+        itemsize = array(typecode.decode()).itemsize
+        # Views the buffer in place as a typed memoryview (zero-copy).
+        buffers.append(raw[offset:offset + length * itemsize].cast(typecode.decode()))
+        # Moves past the buffer and its alignment padding.
+        offset = _aligned(offset + length * itemsize)
+    # Builds the storage over the views.
+    storage = CompressedStorage("csr" if fmt == b"r" else "csc", rows, cols, *buffers)
+    # Remembers the file the storage is mapped from, so worker processes can map it too instead of receiving a copy.
+    storage.path = path
+    # Returns the storage.
+    return storage
@@ -0,0 +1,275 @@
+# Imports the array type to build the offsets and values of permuted CSR matrices.
+from array import array
+# Imports heappush and heappop to always eliminate the node with the smallest approximate degree next.
+from heapq import heappop, heappush
+
+# Imports the compressed storage and index buffer helpers, used to build permuted CSR matrices directly.
+from .compressed import CompressedStorage, _index_array, typecode_of
+# Imports the Matrix class, which permuted matrices are returned as.
+from .core import Matrix
+
+
+# Defines a function that returns the bandwidth of a matrix, the largest distance |i - j| of a stored element from the
+# diagonal. Matrix-vector products and factorizations touch memory (and create fill-in) within this band.
+def bandwidth(matrix):
+    # Returns the largest distance, or 0 for a matrix without stored elements.
+    return max((abs(i - j) for (i, j), value in matrix.items()), default=0)
+
+
+# Defines a function that returns the inverse of a permutation: inverse[perm[k]] == k.
+def inverse_permutation(perm):
+    # Initializes the inverse.
+    inverse = [0] * len(perm)
+    # Iterates over the permutation.
+    for new, old in enumerate(perm):
+        # Records the new position of the old index.
+        inverse[old] = new
+    # Returns the inverse.
+    return inverse
+
+
+# Defines a helper that checks that a permutation reorders range(size).
+def _check_permutation(perm, size):
+    # Raises a ValueError unless every index appears exactly once.
+    if len(perm) != size or sorted(perm) != list(range(size)):
+        # Reports the expected size.
+        raise ValueError(f"Permutation must contain every index from 0 to {size - 1} exactly once.")
+
+
+# Defines a function that permutes the rows and columns of a matrix: row r of the result is row row_perm[r] of the
+# matrix, and column c is column col_perm[c]. Without col_perm, the permutation is symmetric (P A P^T, col_perm =
+# row_perm), which keeps the diagonal on the diagonal, as orderings such as reverse_cuthill_mckee require. Frozen
+# matrices are permuted row by row straight into a new CSR storage, in O(nnz log(row length)); dictionary matrices
+# are re-keyed in O(nnz).
+def permute(matrix, row_perm, col_perm=None):
+    # Uses the row permutation for the columns as well for a symmetric permutation.
+    if col_perm is None:
+        # Checks that the matrix is square.
+        if matrix.rows != matrix.cols:
+            # Raises a ValueError for non-square matrices.
+            raise ValueError("Symmetric permutations are only defined for square matrices.")
+        # Uses the same permutation.
+        col_perm = row_perm
+    # Checks the row permutation.
+    _check_permutation(row_perm, matrix.rows)
+    # Checks the column permutation.
+    _check_permutation(col_perm, matrix.cols)
+    # Maps every old column to its new position.
+    new_col = inverse_permutation(col_perm)
+    # Re-keys the dictionary of a dictionary matrix.
+    if matrix.format == "dok":
+        # Maps every old row to its new position.
+        new_row = inverse_permutation(row_perm)
+        # Returns the permuted matrix.
+        return Matrix(matrix.rows, matrix.cols, {(new_row[i], new_col[j]): value for (i, j), value in matrix.items()},
+                      matrix._dtype)
+    # Reads the CSR storage (CSC matrices use their cached CSR conversion).
+    storage = matrix.compressed("csr")
+    # Reads the buffers into local variables for faster access in the loop.
+    indptr, indices, values = storage.indptr, storage.indices, storage.values
+    # Initializes the offsets with the start of the first row.
+    new_indptr = array("q", [0])
+    # Initializes the index buffer of the result.
+    new_indices = _index_array(matrix.cols)
+    # Initializes the value buffer of the result with the matrix's value type.
+    new_values = array(typecode_of(values)) if typecode_of(values) else []
+    # Iterates over the rows of the result.
+    for old in row_perm:
+        # Moves the row's elements to their new columns and sorts them by column.
+        row = sorted((new_col[indices[k]], values[k]) for k in range(indptr[old], indptr[old + 1]))
+        # Appends the columns.
+        new_indices.extend(j for j, value in row)
+        # Appends the values.
+        new_values.extend(value for j, value in row)
+        # Records where the next row starts.
+        new_indptr.append(len(new_indices))
+    # Wraps the permuted storage without copying it.
+    result = Matrix.from_storage(
+        CompressedStorage("csr", matrix.rows, matrix.cols, new_indptr, new_indices, new_values))
+    # Keeps the explicit dtype of the matrix.
+    if matrix._dtype is not None:
+        # Records the dtype.
+        result._dtype = matrix._dtype
+    # Returns the result in the matrix's format.
+    return result.freeze(matrix.format)
+
+
+# Defines a helper that returns the symmetric adjacency structure of a square matrix as a list of neighbor sets: i and
+# j are neighbors when A[i, j] or A[j, i] is stored (the graph of A + A^T, without self-loops).
+def _adjacency(matrix):
+    # Checks that the matrix is square.
+    if matrix.rows != matrix.cols:
+        # Raises a ValueError for non-square matrices.
+        raise ValueError("Reordering is only defined for square matrices.")
+    # Initializes one neighbor set per node.
+    adjacency = [set() for _ in range(matrix.rows)]
+    # Iterates over the stored elements.
+    for (i, j), value in matrix.items():
+        # Links the two nodes of every off-diagonal element.
+        if i != j:
+            # Adds j to the neighbors of i.
+            adjacency[i].add(j)
+            # Adds i to the neighbors of j.
+            adjacency[j].add(i)
+    # Returns the adjacency structure.
+    return adjacency
+
+
+# Defines a helper that returns the breadth-first level structure rooted at a node, as a list of levels (lists).
+def _levels(adjacency, root):
+    # Starts with the root's level.
+    levels = [[root]]
+    # Marks the root as seen.
+    seen = {root}
+    # Adds levels until no new node is reached.
+    while True:
+        # Collects the unseen neighbors of the last level.
+        level = []
+        # Iterates over the nodes of the last level.
+        for node in levels[-1]:
+            # Iterates over the neighbors of the node.
+            for neighbor in adjacency[node]:
+                # Adds neighbors that were not reached yet.
+                if neighbor not in seen:
+                    # Marks the neighbor as seen.
+                    seen.add(neighbor)
+                    # Appends it to the new level.
+                    level.append(neighbor)
+        # Returns the levels once the component is exhausted.
+        if not level:
+            # Returns the level structure.
+            return levels
+        # Appends the new level.
+        levels.append(level)
+
+
+# Defines a helper that finds a pseudo-peripheral node of the root's component (George and Liu): a node whose level
+# structure is as deep as possible, so the Cuthill-McKee levels are narrow.
+def _pseudo_peripheral(adjacency, degree, root):
+    # Computes the level structure of the root.
+    levels = _levels(adjacency, root)
+    # Moves to a node of the deepest level while that makes the structure deeper.
+    while True:
+        # Picks the node of smallest degree in the deepest level.
+        candidate = min(levels[-1], key=degree.__getitem__)
+        # Computes its level structure.
+        candidate_levels = _levels(adjacency, candidate)
+        # Stops when the structure is no deeper.
+        if len(candidate_levels) <= len(levels):
+            # Returns the current node.
+            return root
+        # Moves to the candidate.
+        root, levels = candidate, candidate_levels
+
+
+# Defines the reverse Cuthill-McKee ordering, which reduces the bandwidth of a matrix: every connected component of
+# the graph of A + A^T is numbered breadth-first from a pseudo-peripheral node, visiting neighbors by increasing
+# degree, and the numbering is reversed (which reduces fill-in in factorizations). Returns the permutation for permute.
+def reverse_cuthill_mckee(matrix):
+    # Builds the graph of the matrix.
+    adjacency = _adjacency(matrix)
+    # Reads the degree of every node.
+    degree = [len(neighbors) for neighbors in adjacency]
+    # Initializes the visited flags.
+    visited = [False] * matrix.rows
+    # Initializes the ordering, which is also the breadth-first queue.
+    order = []
+    # Starts a new component from every node not yet numbered, trying nodes of small degree first.
+    for seed in sorted(range(matrix.rows), key=degree.__getitem__):
+        # Skips nodes of components already numbered.
+        if visited[seed]:
+            # Continues with the next node.
+            continue
+        # Finds the starting node of the component.
+        start = _pseudo_peripheral(adjacency, degree, seed)
+        # Reads the position of the component's first node in the queue.
+        head = len(order)
+        # Numbers the starting node.
+        visited[start] = True
+        # Appends it to the queue.
+        order.append(start)
+        # Numbers the component breadth-first.
+        while head < len(order):
+            # Reads the next node of the queue.
+            node = order[head]
+            # Advances the queue.
+            head += 1
+            # Numbers the node's unvisited neighbors by increasing degree.
+            for neighbor in sorted((n for n in adjacency[node] if not visited[n]), key=degree.__getitem__):
+                # Marks the neighbor as numbered.
+                visited[neighbor] = True
+                # Appends it to the queue.
+                order.append(neighbor)
+    # Reverses the ordering.
+    order.reverse()
+    # Returns the permutation.
+    return order
+
+
+# Defines the approximate minimum degree (AMD) ordering, which reduces fill-in in factorizations: the node of smallest
+# degree is eliminated next, on a quotient graph where every eliminated node becomes an "element" standing for the
+# clique its elimination creates, so fill-in is never stored explicitly. Exact degrees would need the union of
+# those cliques; like AMD, the degree of a node is bounded by its remaining neighbors plus the sizes of its adjacent
+# elements, which is cheap to update. (Supervariable detection and aggressive absorption are not implemented.)
+# Returns the permutation for permute.
+def approximate_minimum_degree(matrix):
+    # Builds the graph of the matrix, whose sets become the node-to-node edges of the quotient graph.
+    adjacency = _adjacency(matrix)
+    # Initializes the elements adjacent to every node.
+    elements = [set() for _ in range(matrix.rows)]
+    # Initializes the nodes of every element, keyed by the eliminated node that created it.
+    members = {}
+    # Initializes the approximate degree of every node.
+    degree = [len(neighbors) for neighbors in adjacency]
+    # Builds a heap of (degree, node), which may hold stale entries after degree updates.
+    heap = [(d, node) for node, d in enumerate(degree)]
+    # Arranges the list as a heap.
+    heap.sort()
+    # Initializes the eliminated flags.
+    eliminated = [False] * matrix.rows
+    # Initializes the ordering.
+    order = []
+    # Eliminates the nodes one at a time.
+    while heap:
+        # Pops the node of smallest degree.
+        d, pivot = heappop(heap)
+        # Skips stale entries (eliminated nodes, or degrees that changed since the entry was pushed).
+        if eliminated[pivot] or d != degree[pivot]:
+            # Continues with the next entry.
+            continue
+        # Eliminates the node.
+        eliminated[pivot] = True
+        # Appends it to the ordering.
+        order.append(pivot)
+        # Collects the pivot's clique: its neighbors and the nodes of its adjacent elements.
+        clique = set(adjacency[pivot])
+        # Iterates over the pivot's elements, which the new element absorbs.
+        for element in elements[pivot]:
+            # Adds the element's nodes to the clique.
+            clique |= members.pop(element)
+        # Removes the pivot itself.
+        clique.discard(pivot)
+        # Stores the new element.
+        members[pivot] = clique
+        # Reads the absorbed elements.
+        absorbed = elements[pivot]
+        # Updates every node of the clique.
+        for node in clique:
+            # Replaces the absorbed elements by the new one.
+            elements[node] -= absorbed
+            # Adds the new element.
+            elements[node].add(pivot)
+            # Removes the edges the new element now represents.
+            adjacency[node] -= clique
+            # Removes the edge to the pivot.
+            adjacency[node].discard(pivot)
+            # Bounds the degree by the remaining neighbors plus the other nodes of every adjacent element.
+            bound = len(adjacency[node]) + sum(len(members[element]) - 1 for element in elements[node])
+            # Caps the bound by the number of remaining nodes.
+            degree[node] = min(bound, matrix.rows - len(order) - 1)
+            # Pushes the updated degree.
+            heappush(heap, (degree[node], node))
+        # Releases the pivot's structures.
+        adjacency[pivot], elements[pivot] = set(), set()
+    # Returns the permutation.
+    return order
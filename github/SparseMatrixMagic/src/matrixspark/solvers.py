@@ -0,0 +1,591 @@
+# Imports the math module for square roots and the hypotenuse of the Givens rotations.
+import math
+# Imports mul to compute dot products of lists with map.
+from operator import mul
+
+# Imports the Matrix class, used to wrap the CSR storage so every product goes through the compressed kernels.
+from .core import Matrix
+
+# Defines the default relative tolerance: iteration stops once ||b - Ax|| <= tol * ||b||.
+TOLERANCE = 1e-5
+# Defines the default number of inner iterations of GMRES between restarts.
+RESTART = 20
+
+
+# Defines a helper that returns a zero vector of the same kind (list or NumPy array) and length as the given vector.
+def _zeros_like(vector):
+    # Returns a float array for NumPy input, otherwise a list.
+    return vector * 0.0 if hasattr(vector, "ndim") else [0.0] * len(vector)
+
+
+# Defines a helper that returns a float copy of a vector, keeping NumPy arrays as arrays.
+def _copy(vector):
+    # Returns a float array for NumPy input, otherwise a list.
+    return vector.astype(float) if hasattr(vector, "ndim") else [float(value) for value in vector]
+
+
+# Defines a helper that returns the dot product of two vectors.
+def _dot(u, v):
+    # Uses the vectorized product for NumPy arrays, otherwise sums the element products.
+    return float(u @ v) if hasattr(u, "ndim") else sum(map(mul, u, v))
+
+
+# Defines a helper that returns the Euclidean norm of a vector.
+def _norm(vector):
+    # Returns the square root of the vector's dot product with itself.
+    return math.sqrt(_dot(vector, vector))
+
+
+# Defines a helper that returns the new vector a * x + b * y.
+def _combine(a, x, b, y):
+    # Uses array arithmetic for NumPy arrays.
+    if hasattr(x, "ndim"):
+        # Returns the combination.
+        return a * x + b * y
+    # Returns the combination of the lists, element by element.
+    return [a * xi + b * yi for xi, yi in zip(x, y)]
+
+
+# Defines a helper that returns the new vector x * scale.
+def _scale(x, scale):
+    # Returns the scaled array, or the scaled list.
+    return x * scale if hasattr(x, "ndim") else [xi * scale for xi in x]
+
+
+# Defines a helper that returns the sum of the elements of a vector.
+def _sum(vector):
+    # Returns the sum of the array, or of the list.
+    return float(vector.sum()) if hasattr(vector, "ndim") else sum(vector)
+
+
+# Defines a helper that returns the 1-norm (sum of magnitudes) of a vector.
+def _abs_sum(vector):
+    # Returns the sum of the magnitudes of the array, or of the list.
+    return float(abs(vector).sum()) if hasattr(vector, "ndim") else sum(map(abs, vector))
+
+
+# Defines a helper that returns the matrix-vector product function used by the solvers. The matrix is compressed to
+# CSR once (a frozen CSR matrix is used as is), and every product reuses the given output buffer.
+def _operator(matrix, workers):
+    # Wraps the CSR form of the matrix, without changing the caller's matrix.
+    csr = matrix if matrix.format == "csr" else Matrix.from_storage(matrix.compressed("csr"))
+
+    # Defines the product, written into out.
+    def apply(x, out):
+        # Returns the product computed by the matrix's CSR kernels (vectorized for NumPy arrays).
+        return csr(x, out=out, workers=workers)
+
+    # Returns the product function.
+    return apply
+
+
+# Defines a helper that checks the system and returns the initial guess, the iteration limit and the stopping threshold.
+def _prepare(matrix, b, x0, tol, atol, maxiter):
+    # Checks that the matrix is square.
+    if matrix.rows != matrix.cols:
+        # Raises a ValueError for non-square matrices.
+        raise ValueError("Matrix must be square to solve a linear system.")
+    # Checks that the right-hand side has one element per row.
+    if len(b) != matrix.rows:
+        # Raises a ValueError if the right-hand side has the wrong length.
+        raise ValueError("Right-hand side length must match matrix row count.")
+    # Starts from the given guess, or from zero.
+    x = _copy(x0) if x0 is not None else _zeros_like(_copy(b))
+    # Stops once the residual norm reaches the relative or the absolute tolerance.
+    threshold = max(tol * _norm(b), atol)
+    # Returns the guess, the iteration limit (10 iterations per unknown by default) and the threshold.
+    return x, maxiter if maxiter is not None else 10 * matrix.rows, threshold
+
+
+# Defines a helper that resolves the preconditioner argument into a function r -> z approximating A^-1 r.
+def _preconditioner(matrix, preconditioner):
+    # Uses the identity when no preconditioner is given.
+    if preconditioner is None:
+        # Returns the identity.
+        return lambda r: r
+    # Builds the Jacobi preconditioner by name.
+    if preconditioner == "jacobi":
+        # Returns the Jacobi preconditioner.
+        return jacobi_preconditioner(matrix)
+    # Builds the ILU(0) preconditioner by name.
+    if preconditioner == "ilu0":
+        # Returns the ILU(0) preconditioner.
+        return ilu0_preconditioner(matrix)
+    # Checks that any other preconditioner is a function.
+    if not callable(preconditioner):
+        # Raises a ValueError for unknown names.
+        raise ValueError(f"Unknown preconditioner '{preconditioner}'.")
+    # Returns the caller's function.
+    return preconditioner
+
+
+# Defines a function that builds the Jacobi (diagonal) preconditioner: z = r / diag(A).
+def jacobi_preconditioner(matrix):
+    # Reads the inverse of every diagonal element.
+    inverse = []
+    # Iterates over the diagonal.
+    for i in range(matrix.rows):
+        # Reads the diagonal element.
+        diagonal = matrix[i, i]
+        # Checks that the element can be inverted.
+        if diagonal == 0:
+            # Raises a ValueError for a zero on the diagonal.
+            raise ValueError(f"Jacobi preconditioner needs a non-zero diagonal (row {i}).")
+        # Stores the inverse.
+        inverse.append(1.0 / diagonal)
+
+    # Initializes the NumPy copy of the inverse diagonal, converted on the first NumPy input.
+    arrays = {}
+
+    # Defines the preconditioner.
+    def apply(r):
+        # Multiplies the arrays for NumPy input.
+        if hasattr(r, "ndim"):
+            # Converts the inverse diagonal once per array type.
+            if r.dtype not in arrays:
+                # Stores the converted inverse diagonal.
+                arrays[r.dtype] = _like(r, inverse)
+            # Returns the scaled array.
+            return r * arrays[r.dtype]
+        # Returns the scaled list.
+        return list(map(mul, r, inverse))
+
+    # Returns the preconditioner.
+    return apply
+
+
+# Defines a helper that converts a list into an array of the same kind as the given NumPy array.
+def _like(array, values):
+    # Imports NumPy lazily, as it is only needed for NumPy input.
+    import numpy as np
+    # Returns the values as an array of the same float type.
+    return np.asarray(values, dtype=array.dtype)
+
+
+# Defines a function that builds the ILU(0) preconditioner: an incomplete LU factorization A ≈ LU that keeps the
+# non-zero pattern of A (no fill-in), applied by one forward and one backward triangular solve.
+def ilu0_preconditioner(matrix):
+    # Reads the number of rows.
+    n = matrix.rows
+    # Initializes the strictly lower part of every factored row, as sorted (column, value) pairs.
+    lower = []
+    # Initializes the upper part (diagonal included) of every factored row, as a {column: value} dictionary.
+    upper = []
+    # Initializes the diagonal of U, the pivots.
+    pivots = []
+    # Reads the rows of the matrix in order, with empty rows filled in.
+    stored = dict(matrix.iter_rows())
+    # Factors the rows one at a time (IKJ order).
+    for i in range(n):
+        # Copies the row as floats; the pattern of the row is fixed from here on.
+        row = {j: float(value) for j, value in stored.get(i, ())}
+        # Iterates over the columns left of the diagonal in increasing order.
+        for k in sorted(j for j in row if j < i):
+            # Divides by the pivot of row k to get the multiplier L[i, k].
+            row[k] /= pivots[k]
+            # Subtracts the multiple of row k from row i, only where row i already has an element (no fill-in).
+            for j, value in upper[k].items():
+                # Updates the element if it belongs to the pattern of row i.
+                if j > k and j in row:
+                    # Subtracts the product.
+                    row[j] -= row[k] * value
+        # Checks that the pivot is usable.
+        if not row.get(i):
+            # Raises a ValueError for a zero pivot.
+            raise ValueError(f"ILU(0) preconditioner hit a zero pivot at row {i}.")
+        # Stores the pivot.
+        pivots.append(row[i])
+        # Stores the lower part.
+        lower.append(sorted((j, value) for j, value in row.items() if j < i))
+        # Stores the upper part.
+        upper.append({j: value for j, value in row.items() if j >= i})
+
+    # Defines the preconditioner.
+    def apply(r):
+        # Solves L y = r by forward substitution (L has a unit diagonal).
+        y = [0.0] * n
+        # Iterates over the rows from the top.
+        for i in range(n):
+            # Subtracts the known part of the row.
+            y[i] = r[i] - sum(value * y[j] for j, value in lower[i])
+        # Solves U z = y by backward substitution.
+        z = y
+        # Iterates over the rows from the bottom.
+        for i in range(n - 1, -1, -1):
+            # Subtracts the known part of the row and divides by the pivot.
+            z[i] = (y[i] - sum(value * z[j] for j, value in upper[i].items() if j > i)) / pivots[i]
+        # Returns an array for NumPy input, otherwise the list.
+        return _like(r, z) if hasattr(r, "ndim") else z
+
+    # Returns the preconditioner.
+    return apply
+
+
+# Defines the conjugate gradient method for symmetric positive definite matrices. Returns (x, info): info is 0 when the
+# residual norm reached max(tol * ||b||, atol), otherwise the number of iterations run. b (and x0) may be lists or
+# NumPy arrays; NumPy input runs the vectorized kernels. preconditioner is None, "jacobi", "ilu0" or a function r -> z,
+# and callback(iteration, residual_norm) is called after every iteration.
+def cg(matrix, b, x0=None, tol=TOLERANCE, atol=0.0, maxiter=None, preconditioner=None, callback=None, workers=None):
+    # Checks the system and reads the starting point, the iteration limit and the threshold.
+    x, maxiter, threshold = _prepare(matrix, b, x0, tol, atol, maxiter)
+    # Builds the product function.
+    product = _operator(matrix, workers)
+    # Builds the preconditioner.
+    precondition = _preconditioner(matrix, preconditioner)
+    # Allocates the buffer that receives every product.
+    ap = _zeros_like(x)
+    # Computes the initial residual r = b - Ax.
+    r = _combine(1.0, _copy(b), -1.0, product(x, ap))
+    # Returns right away if the starting point already solves the system.
+    if _norm(r) <= threshold:
+        # Reports convergence.
+        return x, 0
+    # Applies the preconditioner to the residual.
+    z = precondition(r)
+    # Starts the search direction at the preconditioned residual.
+    p = _copy(z)
+    # Computes the inner product of the residual and the preconditioned residual.
+    rz = _dot(r, z)
+    # Runs the iterations.
+    for iteration in range(1, maxiter + 1):
+        # Computes the product of the matrix with the search direction.
+        ap = product(p, ap)
+        # Computes the step length along the search direction.
+        alpha = rz / _dot(p, ap)
+        # Moves the solution along the search direction.
+        x = _combine(1.0, x, alpha, p)
+        # Updates the residual.
+        r = _combine(1.0, r, -alpha, ap)
+        # Computes the residual norm.
+        residual = _norm(r)
+        # Reports the progress to the caller.
+        if callback is not None:
+            # Calls the callback with the iteration number and the residual norm.
+            callback(iteration, residual)
+        # Stops once the residual is small enough.
+        if residual <= threshold:
+            # Reports convergence.
+            return x, 0
+        # Applies the preconditioner to the new residual.
+        z = precondition(r)
+        # Computes the new inner product.
+        rz_next = _dot(r, z)
+        # Makes the next search direction conjugate to the previous ones.
+        p = _combine(1.0, z, rz_next / rz, p)
+        # Keeps the inner product for the next iteration.
+        rz = rz_next
+    # Reports that the iteration limit was reached.
+    return x, maxiter
+
+
+# Defines the stabilized biconjugate gradient method (BiCGSTAB) for general square matrices, with right
+# preconditioning. Takes and returns the same arguments and results as cg.
+def bicgstab(matrix, b, x0=None, tol=TOLERANCE, atol=0.0, maxiter=None, preconditioner=None, callback=None,
+             workers=None):
+    # Checks the system and reads the starting point, the iteration limit and the threshold.
+    x, maxiter, threshold = _prepare(matrix, b, x0, tol, atol, maxiter)
+    # Builds the product function.
+    product = _operator(matrix, workers)
+    # Builds the preconditioner.
+    precondition = _preconditioner(matrix, preconditioner)
+    # Allocates the buffers of the two products of every iteration.
+    v, t = _zeros_like(x), _zeros_like(x)
+    # Computes the initial residual r = b - Ax.
+    r = _combine(1.0, _copy(b), -1.0, product(x, v))
+    # Returns right away if the starting point already solves the system.
+    if _norm(r) <= threshold:
+        # Reports convergence.
+        return x, 0
+    # Fixes the shadow residual.
+    shadow = _copy(r)
+    # Initializes the scalars of the recurrence.
+    rho, alpha, omega = 1.0, 1.0, 1.0
+    # Initializes the search direction.
+    p = _zeros_like(x)
+    # Clears the product buffer, which is part of the first direction update.
+    v = _zeros_like(x)
+    # Runs the iterations.
+    for iteration in range(1, maxiter + 1):
+        # Computes the new inner product with the shadow residual.
+        rho_next = _dot(shadow, r)
+        # Stops on a breakdown of the recurrence.
+        if rho_next == 0:
+            # Reports the iterations run.
+            return x, iteration
+        # Updates the search direction.
+        p = _combine(1.0, r, (rho_next / rho) * (alpha / omega), _combine(1.0, p, -omega, v))
+        # Applies the preconditioner to the search direction.
+        p_hat = precondition(p)
+        # Computes the product with the preconditioned direction.
+        v = product(p_hat, v)
+        # Computes the first step length.
+        alpha = rho_next / _dot(shadow, v)
+        # Computes the intermediate residual.
+        s = _combine(1.0, r, -alpha, v)
+        # Computes its norm.
+        residual = _norm(s)
+        # Stops early if the intermediate residual is already small enough.
+        if residual <= threshold:
+            # Moves the solution by the first step.
+            x = _combine(1.0, x, alpha, p_hat)
+            # Reports the progress to the caller.
+            if callback is not None:
+                # Calls the callback with the iteration number and the residual norm.
+                callback(iteration, residual)
+            # Reports convergence.
+            return x, 0
+        # Applies the preconditioner to the intermediate residual.
+        s_hat = precondition(s)
+        # Computes the product with it.
+        t = product(s_hat, t)
+        # Computes the stabilizing step length.
+        omega = _dot(t, s) / _dot(t, t)
+        # Moves the solution by both steps.
+        x = _combine(1.0, _combine(1.0, x, alpha, p_hat), omega, s_hat)
+        # Updates the residual.
+        r = _combine(1.0, s, -omega, t)
+        # Computes its norm.
+        residual = _norm(r)
+        # Reports the progress to the caller.
+        if callback is not None:
+            # Calls the callback with the iteration number and the residual norm.
+            callback(iteration, residual)
+        # Stops once the residual is small enough.
+        if residual <= threshold:
+            # Reports convergence.
+            return x, 0
+        # Stops on a breakdown of the stabilizing step.
+        if omega == 0:
+            # Reports the iterations run.
+            return x, iteration
+        # Keeps the inner product for the next iteration.
+        rho = rho_next
+    # Reports that the iteration limit was reached.
+    return x, maxiter
+
+
+# Defines the restarted generalized minimal residual method (GMRES(restart)) for general square matrices, with right
+# preconditioning, modified Gram-Schmidt and Givens rotations. maxiter counts inner iterations; the callback receives
+# the residual norm estimated by the rotations. Takes and returns the same other arguments and results as cg.
+def gmres(matrix, b, x0=None, tol=TOLERANCE, atol=0.0, restart=RESTART, maxiter=None, preconditioner=None,
+          callback=None, workers=None):
+    # Checks the system and reads the starting point, the iteration limit and the threshold.
+    x, maxiter, threshold = _prepare(matrix, b, x0, tol, atol, maxiter)
+    # Builds the product function.
+    product = _operator(matrix, workers)
+    # Builds the preconditioner.
+    precondition = _preconditioner(matrix, preconditioner)
+    # Allocates the buffer of the residual products.
+    ax = _zeros_like(x)
+    # Initializes the number of inner iterations run.
+    iteration = 0
+    # Runs restart cycles until convergence or the iteration limit.
+    while True:
+        # Computes the residual r = b - Ax of the current solution.
+        r = _combine(1.0, _copy(b), -1.0, product(x, ax))
+        # Computes its norm.
+        beta = _norm(r)
+        # Stops once the residual is small enough.
+        if beta <= threshold:
+            # Reports convergence.
+            return x, 0
+        # Stops at the iteration limit.
+        if iteration >= maxiter:
+            # Reports the iterations run.
+            return x, iteration
+        # Starts the Krylov basis with the normalized residual.
+        basis = [_scale(r, 1.0 / beta)]
+        # Initializes the preconditioned basis vectors, which build the solution update.
+        directions = []
+        # Initializes the columns of the rotated Hessenberg matrix (the triangular factor R).
+        columns = []
+        # Initializes the rotated right-hand side of the least-squares problem.
+        g = [beta]
+        # Initializes the cosines and sines of the Givens rotations.
+        cosines, sines = [], []
+        # Runs the inner iterations of the cycle.
+        for j in range(restart):
+            # Applies the preconditioner to the newest basis vector.
+            directions.append(precondition(basis[j]))
+            # Computes the product with it, into a new vector (the basis keeps every vector).
+            w = product(directions[j], None)
+            # Initializes the new column of the Hessenberg matrix.
+            column = []
+            # Orthogonalizes the product against the basis (modified Gram-Schmidt).
+            for vector in basis:
+                # Computes the projection coefficient.
+                h = _dot(w, vector)
+                # Removes the projection.
+                w = _combine(1.0, w, -h, vector)
+                # Stores the coefficient.
+                column.append(h)
+            # Computes the norm of what is left, the subdiagonal element.
+            h_next = _norm(w)
+            # Applies the previous rotations to the new column.
+            for i, (c, s) in enumerate(zip(cosines, sines)):
+                # Rotates the pair of elements i and i + 1.
+                column[i], column[i + 1] = c * column[i] + s * column[i + 1], -s * column[i] + c * column[i + 1]
+            # Computes the rotation that zeroes the subdiagonal element.
+            radius = math.hypot(column[j], h_next)
+            # Computes its cosine and sine (an exactly zero column is left unrotated).
+            c, s = (column[j] / radius, h_next / radius) if radius else (1.0, 0.0)
+            # Stores the rotation.
+            cosines.append(c)
+            # Stores the sine.
+            sines.append(s)
+            # Applies the rotation to the column.
+            column[j] = radius
+            # Stores the column.
+            columns.append(column)
+            # Applies the rotation to the right-hand side, whose last element is the residual norm.
+            g.append(-s * g[j])
+            # Updates the rotated element.
+            g[j] *= c
+            # Counts the iteration.
+            iteration += 1
+            # Reads the estimated residual norm.
+            residual = abs(g[j + 1])
+            # Reports the progress to the caller.
+            if callback is not None:
+                # Calls the callback with the iteration number and the residual norm.
+                callback(iteration, residual)
+            # Ends the cycle on convergence, an exact (lucky) breakdown or the iteration limit.
+            if residual <= threshold or h_next == 0 or iteration >= maxiter:
+                # Stops the inner iterations.
+                break
+            # Adds the normalized vector to the basis.
+            basis.append(_scale(w, 1.0 / h_next))
+        # Solves the triangular system R y = g by backward substitution.
+        y = [0.0] * len(columns)
+        # Iterates over the unknowns from the last one.
+        for i in range(len(columns) - 1, -1, -1):
+            # Subtracts the known part and divides by the diagonal element.
+            y[i] = (g[i] - sum(columns[k][i] * y[k] for k in range(i + 1, len(columns)))) / columns[i][i]
+        # Updates the solution with the preconditioned basis.
+        for coefficient, direction in zip(y, directions):
+            # Adds the scaled direction.
+            x = _combine(1.0, x, coefficient, direction)
+
+
+# Defines a helper that multiplies a vector by a scalar and adds a constant to every element, in place.
+def _scale_into(x, scale, shift=0.0):
+    # Updates the array in place for NumPy input.
+    if hasattr(x, "ndim"):
+        # Scales the array.
+        x *= scale
+        # Shifts the array.
+        x += shift
+        # Returns the array.
+        return x
+    # Iterates over the elements of the list.
+    for i, xi in enumerate(x):
+        # Overwrites the element.
+        x[i] = xi * scale + shift
+    # Returns the list.
+    return x
+
+
+# Defines a helper that returns the 1-norm (order 1) or the Euclidean norm (order 2) of y - sign * x, using scratch (a
+# NumPy array of the same shape, or None for lists) instead of allocating a difference vector.
+def _distance(y, x, sign, order, scratch):
+    # Computes the difference in the scratch buffer for NumPy input.
+    if scratch is not None:
+        # Writes sign * x into the buffer.
+        scratch[...] = x
+        # Scales the buffer by the sign.
+        scratch *= sign
+        # Writes y - sign * x into the buffer.
+        scratch -= y
+        # Returns the norm of the difference.
+        return _abs_sum(scratch) if order == 1 else _norm(scratch)
+    # Returns the 1-norm of the difference of the lists.
+    if order == 1:
+        # Sums the magnitudes of the differences.
+        return sum(abs(yi - sign * xi) for xi, yi in zip(x, y))
+    # Returns the Euclidean norm of the difference of the lists.
+    return math.sqrt(sum((yi - sign * xi) ** 2 for xi, yi in zip(x, y)))
+
+
+# Defines the power iteration: x <- Ax / ||Ax|| converges to the eigenvector of the eigenvalue of largest magnitude.
+# With damping, every step is instead the PageRank update x <- damping * Ax + (1 - sum) / n, where A is a column-
+# stochastic transition matrix: the teleportation term restores the probability lost by damping and by dangling nodes,
+# so x stays a distribution (1-norm 1). Every step writes the product into one of two vectors that are swapped
+# between iterations (plus a scratch vector for NumPy input), so no vector or Matrix is allocated per step. Returns
+# (value, x, info): value is the eigenvalue estimate (1.0 with damping), and info is 0 once the change of x between
+# steps drops to tol (1-norm with damping, Euclidean norm otherwise), or maxiter if the limit was reached first.
+def power_iteration(matrix, x0=None, tol=TOLERANCE, maxiter=None, damping=None, callback=None, workers=None):
+    # Checks that the matrix is square.
+    if matrix.rows != matrix.cols:
+        # Raises a ValueError for non-square matrices.
+        raise ValueError("Matrix must be square for power iteration.")
+    # Checks the damping factor.
+    if damping is not None and not 0 <= damping <= 1:
+        # Raises a ValueError for damping factors outside [0, 1].
+        raise ValueError("Damping factor must be between 0 and 1.")
+    # Reads the size of the vectors.
+    n = matrix.rows
+    # Checks that the starting vector has one element per row.
+    if x0 is not None and len(x0) != n:
+        # Raises a ValueError if the starting vector has the wrong length.
+        raise ValueError("Starting vector length must match matrix row count.")
+    # Builds the product function.
+    product = _operator(matrix, workers)
+    # Starts from the given vector, or from the uniform vector.
+    x = _copy(x0) if x0 is not None else [1.0] * n
+    # Measures steps in the 1-norm for PageRank (distributions) and in the Euclidean norm otherwise.
+    order = 1 if damping is not None else 2
+    # Reads the norm of the starting vector.
+    start = _abs_sum(x) if order == 1 else _norm(x)
+    # Checks that the starting vector can be normalized.
+    if start == 0:
+        # Raises a ValueError for a zero starting vector.
+        raise ValueError("Starting vector must be non-zero.")
+    # Normalizes the starting vector in place.
+    _scale_into(x, 1.0 / start)
+    # Allocates the vector that receives every product.
+    y = _zeros_like(x)
+    # Allocates the scratch vector of the distance for NumPy input.
+    scratch = _zeros_like(x) if hasattr(x, "ndim") else None
+    # Initializes the eigenvalue estimate.
+    value = 1.0 if damping is not None else 0.0
+    # Reads the iteration limit (10 iterations per row by default, as for the solvers).
+    maxiter = maxiter if maxiter is not None else 10 * n
+    # Runs the iterations.
+    for iteration in range(1, maxiter + 1):
+        # Writes the product Ax into y.
+        y = product(x, y)
+        # Applies the PageRank update when damping.
+        if damping is not None:
+            # Scales the product, then adds back the probability lost by damping and by dangling nodes.
+            _scale_into(y, damping, (1.0 - damping * _sum(y)) / n)
+            # Keeps the sign of x for the distance.
+            sign = 1.0
+        # Otherwise normalizes the product.
+        else:
+            # Estimates the eigenvalue with the Rayleigh quotient (x has unit norm).
+            value = _dot(x, y)
+            # Reads the norm of the product.
+            size = _norm(y)
+            # Returns the zero vector when it is in the null space of the matrix.
+            if size == 0:
+                # Reports convergence to the eigenvalue 0.
+                return 0.0, y, 0
+            # Normalizes the product in place.
+            _scale_into(y, 1.0 / size)
+            # Compares against -x for a negative eigenvalue, whose iterates alternate in sign.
+            sign = -1.0 if value < 0 else 1.0
+        # Measures the change of the vector.
+        residual = _distance(y, x, sign, order, scratch)
+        # Swaps the vectors, so the new iterate is x and the old one receives the next product.
+        x, y = y, x
+        # Reports the progress to the caller.
+        if callback is not None:
+            # Calls the callback with the iteration number and the change of the vector.
+            callback(iteration, residual)
+        # Stops once the vector has converged.
+        if residual <= tol:
+            # Reports convergence.
+            return value, x, 0
+    # Reports that the iteration limit was reached.
+    return value, x, maxiter
+
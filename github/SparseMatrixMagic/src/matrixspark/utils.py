@@ -1,29 +1,61 @@
 # Imports Fore and Style from the colorama library to enable colored and styled terminal output.
 from colorama import Fore, Style
 
+# Defines the default number of rows shown by pretty_print before the output is truncated.
+MAX_ROWS = 20
+# Defines the default number of columns shown by pretty_print before the output is truncated.
+MAX_COLS = 20
+
+
+# Defines a helper that picks the indices shown along one dimension: all of them if they fit, otherwise the first and
+# last halves of the limit with None marking the elided middle.
+def _visible(size, limit):
+    # Shows every index when the dimension fits.
+    if size <= limit:
+        # Returns all indices.
+        return list(range(size))
+    # Computes how many leading indices are shown.
+    head = (limit + 1) // 2
+    # Returns the leading indices, the elision marker and the trailing indices.
+    return list(range(head)) + [None] + list(range(size - (limit - head), size))
+
 
 # Defines a function to print a matrix in a visually appealing format with optional title and color.
-def pretty_print(matrix, title="", color=Fore.WHITE):
+# Only the stored elements are read (O(nnz)), and matrices larger than max_rows x max_cols are truncated to their
+# first and last rows and columns, with ⋮ / ⋯ marking the elided part and a summary line of the shape.
+def pretty_print(matrix, title="", color=Fore.WHITE, max_rows=MAX_ROWS, max_cols=MAX_COLS):
     # Prints the title with the specified color and bright style, resetting the style afterward.
     print(f"{color}{Style.BRIGHT}{title}{Style.RESET_ALL}")
-    # Calculates the maximum width needed for any matrix element (converted to integer) to ensure aligned formatting.
-    max_width = max(
-        # Computes the length of the string representation of each matrix element (as an integer).
-        len(str(int(matrix[i, j]))) for i in range(matrix.rows) for j in range(matrix.cols)
-    ) or 1  # Defaults to 1 if no elements exist or all are zero.
+    # Picks the rows to display.
+    rows = _visible(matrix.rows, max_rows)
+    # Picks the columns to display.
+    cols = _visible(matrix.cols, max_cols)
+    # Builds the sets of displayed indices for fast membership tests.
+    shown_rows, shown_cols = set(rows), set(cols)
+    # Collects the displayed stored elements (converted to integers for display), touching only stored entries.
+    cells = {
+        # Maps the position to the displayed text of the element.
+        (i, j): str(int(value)) for i, j, value in matrix.iter_nonzeros() if i in shown_rows and j in shown_cols
+    }
+    # Calculates the maximum width needed for any displayed element to ensure aligned formatting.
+    max_width = max(map(len, cells.values()), default=1)
     # Prints the top border of the matrix, using the specified color, with width adjusted for elements and spacing.
-    print(f"{color}┌{'─' * (max_width + 2) * matrix.cols}┐{Style.RESET_ALL}")
-    # Iterates over each row index of the matrix.
-    for i in range(matrix.rows):
+    print(f"{color}┌{'─' * (max_width + 2) * len(cols)}┐{Style.RESET_ALL}")
+    # Iterates over each displayed row index of the matrix.
+    for i in rows:
         # Initializes an empty list to store formatted elements of the current row.
         row = []
-        # Iterates over each column index of the matrix for the current row.
-        for j in range(matrix.cols):
-            # Converts the matrix element at (i, j) to an integer for display.
-            value = int(matrix[i, j])
-            # Formats the value as a string, right-aligned to the maximum width, and adds it to the row list.
-            row.append(f"{value:>{max_width}}")
+        # Iterates over each displayed column index of the matrix for the current row.
+        for j in cols:
+            # Picks the elision mark for elided rows or columns, otherwise the element (0 if not stored).
+            text = "⋮" if i is None else "⋯" if j is None else cells.get((i, j), "0")
+            # Formats the text as a string, right-aligned to the maximum width, and adds it to the row list.
+            row.append(f"{text:>{max_width}}")
         # Prints the row, with elements joined by spaces, enclosed in vertical bars, using the specified color.
         print(f"{color}│ {' '.join(row)} │{Style.RESET_ALL}")
     # Prints the bottom border of the matrix, matching the top border, using the specified color.
-    print(f"{color}└{'─' * (max_width + 2) * matrix.cols}┘{Style.RESET_ALL}")
\ No newline at end of file
+    print(f"{color}└{'─' * (max_width + 2) * len(cols)}┘{Style.RESET_ALL}")
+    # Prints a summary of the full shape when the output was truncated.
+    if None in shown_rows or None in shown_cols:
+        # Prints the shape and the number of stored elements.
+        print(f"{color}{matrix.rows}×{matrix.cols} matrix, {matrix.nnz} stored elements{Style.RESET_ALL}")
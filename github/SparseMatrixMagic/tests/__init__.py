@@ -53,13 +53,15 @@ class Matrix:
     def __matmul__(self, other):
         if self.cols != other.rows:
             raise ValueError("Matrix A's columns must match Matrix B's rows for multiplication.")
-        result = Matrix(self.rows, other.cols)
+        # Index the rows of the right operand once (Gustavson's algorithm)
+        other_rows = {}
+        for (j, k), value in other.data.items():
+            other_rows.setdefault(j, []).append((k, value))
+        values = {}
         for (i, j), a_val in self.data.items():
-            for k in range(other.cols):
-                for m in range(other.rows):
-                    if (m, k) in other.data:
-                        result[i, k] = result[i, k] + a_val * other[m, k]
-        return result
+            for k, b_val in other_rows.get(j, ()):
+                values[(i, k)] = values.get((i, k), 0) + a_val * b_val
+        return Matrix(self.rows, other.cols, {key: value for key, value in values.items() if value != 0})
 
     def __call__(self, vector):
         if not isinstance(vector, list) or len(vector) != self.cols:
@@ -0,0 +1,46 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the benchmark functions under test.
+from matrixspark.benchmark import (NOISE_FLOOR, banded_sparse, benchmark_suite, compare_baseline, power_law_sparse,
+                                   write_results)
+
+
+# Checks that the banded and power-law generators give the requested shapes, bands and numbers of elements.
+def test_generated_patterns():
+    # Builds a 20 x 20 banded matrix with five elements per row.
+    banded = banded_sparse(20, 20, 0.25, seed=1)
+    # Checks that every element lies within the half-bandwidth of two and the full band is stored.
+    assert all(abs(i - j) <= 2 for i, j in banded.data) and banded.nnz == 20 * 5 - 6
+    # Builds a 50 x 50 power-law matrix.
+    power_law = power_law_sparse(50, 50, 0.1, seed=2)
+    # Counts the elements of every row.
+    lengths = sorted((sum(1 for value in row if value) for row in power_law), reverse=True)
+    # Checks that every row holds an element and the longest row is far longer than the typical one.
+    assert lengths[-1] >= 1 and lengths[0] >= 5 * lengths[len(lengths) // 2]
+
+
+# Checks that the suite measures every operation and that the comparison flags only slowdowns past the tolerance.
+def test_suite_and_baseline_comparison(tmp_path):
+    # Runs the suite on one tiny case.
+    results = benchmark_suite([8], [0.3], ["random"], repeat=1)
+    # Checks the measured operations.
+    assert {r["operation"] for r in results} == {"matmul", "add_matrices", "elementwise_multiply",
+                                                  "compute_transpose", "matvec", "compute_determinant"}
+    # Replaces the times with long, known ones so the noise floor does not apply.
+    results = [dict(r, seconds=1.0) for r in results]
+    # Writes the results as the baseline.
+    path = tmp_path / "baseline.json"
+    write_results(results, str(path))
+    # Checks that unchanged times and a 20% slowdown are not regressions.
+    assert compare_baseline(results, str(path)) == []
+    assert compare_baseline([dict(results[0], seconds=1.2)], str(path)) == []
+    # Checks that a 50% slowdown is a regression, reported with its baseline time.
+    assert compare_baseline([dict(results[0], seconds=1.5)], str(path)) == [dict(results[0], seconds=1.5, baseline=1.0)]
+    # Checks that a measurement below the noise floor never is.
+    write_results([dict(results[0], seconds=NOISE_FLOOR / 10)], str(path))
+    assert compare_baseline([dict(results[0], seconds=NOISE_FLOOR / 2)], str(path)) == []
@@ -0,0 +1,55 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the BlockMatrix class under test and the random matrix generator of the benchmark.
+from matrixspark import BlockMatrix
+from matrixspark.benchmark import random_sparse
+
+
+# Defines a helper that returns the dense rows of a block matrix, read element by element.
+def _dense(block):
+    # Returns one list per row.
+    return [[block[i, j] for j in range(block.cols)] for i in range(block.rows)]
+
+
+# Checks conversion, the matrix-vector product and the transpose against the dense rows, for several tile shapes.
+def test_block_matvec_and_transpose():
+    # Builds a random 12 x 18 matrix.
+    matrix = random_sparse(12, 18, 0.2, seed=1)
+    # Computes the dense rows and a vector.
+    rows, vector = list(matrix), [j % 5 - 2 for j in range(18)]
+    # Iterates over square and rectangular tiles.
+    for blocksize in ((1, 1), (3, 3), (2, 6), (4, 3)):
+        # Splits the matrix into tiles.
+        block = BlockMatrix.from_matrix(matrix, blocksize)
+        # Checks the elements and the conversion back to a scalar matrix.
+        assert _dense(block) == rows and dict(block.to_matrix().items()) == dict(matrix.items())
+        # Checks the product against the dense product, with and without an output buffer.
+        expected = [sum(a * x for a, x in zip(row, vector)) for row in rows]
+        assert block(vector) == expected and block(vector, out=[0] * 12) == expected
+        # Checks the transpose and its tile shape.
+        transpose = block.transpose()
+        assert transpose.blocksize == blocksize[::-1] and _dense(transpose) == [list(c) for c in zip(*rows)]
+
+
+# Checks the tiled product against the dense product, and that mismatched tiles are rejected.
+def test_block_matmul():
+    # Builds random 6 x 12 and 12 x 9 matrices.
+    a, b = random_sparse(6, 12, 0.3, seed=2), random_sparse(12, 9, 0.3, seed=3)
+    # Computes the dense product.
+    expected = [[sum(x * y for x, y in zip(row, col)) for col in zip(*list(b))] for row in list(a)]
+    # Checks the product of 3 x 4 and 4 x 3 tiles.
+    assert _dense(BlockMatrix.from_matrix(a, (3, 4)) @ BlockMatrix.from_matrix(b, (4, 3))) == expected
+    # Checks that tiles that do not line up along the inner dimension are rejected.
+    with pytest.raises(ValueError):
+        BlockMatrix.from_matrix(a, (3, 4)) @ BlockMatrix.from_matrix(b, (3, 3))
+    # Checks that tiles that do not divide the shape are rejected.
+    with pytest.raises(ValueError):
+        BlockMatrix.from_matrix(a, (4, 4))
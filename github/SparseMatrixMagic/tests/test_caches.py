@@ -0,0 +1,53 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix
+from matrixspark.benchmark import random_sparse
+
+# Lists the cached quantities compared by the tests.
+_CACHED = ("row_sums", "nnz_per_row", "frobenius_norm", "one_norm", "inf_norm", "row_index", "col_index", "determinant")
+
+
+# Defines a helper that reads every cached quantity of a matrix, with the transpose as a dictionary.
+def _snapshot(matrix):
+    # Returns the quantities by name.
+    return {name: getattr(matrix, name) for name in _CACHED} | {"transpose": dict(matrix.transpose.items())}
+
+
+# Defines a helper that computes every quantity from scratch on a fresh copy of the matrix.
+def _fresh(matrix):
+    # Returns the quantities of the copy.
+    return _snapshot(Matrix(matrix.rows, matrix.cols, dict(matrix.items())))
+
+
+# Checks that the caches kept up to date by element writes match quantities computed from scratch.
+def test_caches_follow_element_writes():
+    # Builds a random 8 x 8 matrix and fills every cache.
+    matrix = random_sparse(8, 8, 0.3, seed=1)
+    _snapshot(matrix)
+    # Writes new elements, changes existing ones and removes others.
+    for (i, j), value in (((0, 0), 5), ((3, 7), -2), ((3, 7), 4), ((7, 1), 9), ((7, 1), 0), ((2, 2), 0)):
+        # Writes the element.
+        matrix[i, j] = value
+        # Checks every cached quantity against the fresh one.
+        assert _snapshot(matrix) == _fresh(matrix)
+
+
+# Checks that writes inside a batch invalidate the caches once, at the end of the batch.
+def test_caches_after_batch_update():
+    # Builds a random 8 x 8 matrix and fills every cache.
+    matrix = random_sparse(8, 8, 0.3, seed=2)
+    _snapshot(matrix)
+    # Writes several elements in one batch.
+    with matrix.batch_update():
+        # Writes the elements.
+        for k in range(8):
+            # Writes an element on the anti-diagonal.
+            matrix[k, 7 - k] = k + 1
+    # Checks every cached quantity against the fresh one.
+    assert _snapshot(matrix) == _fresh(matrix)
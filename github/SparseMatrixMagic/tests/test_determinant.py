@@ -0,0 +1,68 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports permutations and prod for the Leibniz formula.
+from itertools import permutations
+from math import prod
+
+# Imports pytest for pytest.approx.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix
+from matrixspark.benchmark import random_sparse
+
+
+# Defines a helper that computes the determinant of dense rows by the Leibniz formula, the reference for LU elimination.
+def _leibniz(rows):
+    # Reads the size.
+    n = len(rows)
+    # Initializes the sum.
+    total = 0
+    # Iterates over every permutation.
+    for p in permutations(range(n)):
+        # Reads the sign of the permutation from its number of inversions.
+        sign = (-1) ** sum(p[a] > p[b] for a in range(n) for b in range(a + 1, n))
+        # Adds the signed product of the permuted elements.
+        total += sign * prod(rows[i][p[i]] for i in range(n))
+    # Returns the determinant.
+    return total
+
+
+# Checks integer determinants, which are computed exactly, against the Leibniz formula in every format.
+def test_integer_determinant_matches_leibniz():
+    # Iterates over random 6 x 6 integer matrices of several densities.
+    for seed, density in ((1, 0.3), (2, 0.5), (3, 0.8), (4, 1.0)):
+        # Builds the matrix with positive and negative integer values.
+        elements = {key: value - 5 or 5 for key, value in random_sparse(6, 6, density, seed).items()}
+        # Computes the expected determinant.
+        expected = _leibniz(list(Matrix(6, 6, elements)))
+        # Checks the exact integer result of the dictionary, CSR and CSC forms.
+        assert Matrix(6, 6, elements).determinant == expected
+        assert Matrix(6, 6, elements).freeze("csr").determinant == expected
+        assert Matrix(6, 6, elements).freeze("csc").determinant == expected
+
+
+# Checks that row exchanges flip the sign: the determinant of a permutation matrix is the sign of the permutation.
+def test_permutation_matrix_sign():
+    # Iterates over every permutation of four elements.
+    for p in permutations(range(4)):
+        # Builds the permutation matrix.
+        matrix = Matrix(4, 4, {(i, p[i]): 1 for i in range(4)})
+        # Checks the sign against the Leibniz formula.
+        assert matrix.determinant == _leibniz(list(matrix))
+
+
+# Checks floating-point and singular determinants.
+def test_float_and_singular_determinants():
+    # Builds a random 5 x 5 float matrix.
+    matrix = Matrix(5, 5, {key: value / 3 for key, value in random_sparse(5, 5, 0.9, seed=5).items()})
+    # Checks the floating-point determinant.
+    assert matrix.determinant == pytest.approx(_leibniz(list(matrix)))
+    # Checks that a matrix with a repeated row, and one with an empty column, are singular.
+    assert Matrix(2, 2, {(0, 0): 1, (0, 1): 2, (1, 0): 1, (1, 1): 2}).determinant == 0
+    assert Matrix(3, 3, {(0, 0): 1, (1, 0): 2, (2, 1): 3}).determinant == 0
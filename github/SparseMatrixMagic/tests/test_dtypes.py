@@ -0,0 +1,66 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.approx and pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the operations under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix, add_matrices, compute_transpose, elementwise_multiply, matmul
+from matrixspark.benchmark import random_sparse
+from matrixspark.compressed import promote_dtypes
+
+
+# Checks the promotion table.
+def test_promote_dtypes():
+    # Checks every rule: object wins, then complex, float32 only on its own, then the widest integer.
+    assert promote_dtypes("int32", "object") == "object" and promote_dtypes("float32", "complex128") == "complex128"
+    assert promote_dtypes("float32", "float32") == "float32" and promote_dtypes("float32", "int32") == "float64"
+    assert promote_dtypes("int32", "int32") == "int32" and promote_dtypes("int32", "int64") == "int64"
+
+
+# Checks that every operation gives the dense result in the promoted dtype, for frozen and dictionary operands.
+def test_operations_promote_and_match_dense():
+    # Builds random 6 x 6 operands.
+    base_a, base_b = random_sparse(6, 6, 0.4, seed=1), random_sparse(6, 6, 0.4, seed=2)
+    # Computes the dense operands.
+    dense_a, dense_b = list(base_a), list(base_b)
+    # Lists the dense reference of every operation.
+    references = {
+        add_matrices: [[x + y for x, y in zip(r, s)] for r, s in zip(dense_a, dense_b)],
+        elementwise_multiply: [[x * y for x, y in zip(r, s)] for r, s in zip(dense_a, dense_b)],
+        matmul: [[sum(x * y for x, y in zip(r, c)) for c in zip(*dense_b)] for r in dense_a],
+    }
+    # Iterates over pairs of dtypes with their promoted dtype.
+    for left, right, promoted in (("int32", "int32", "int32"), ("int32", "int64", "int64"),
+                                  ("float32", "float32", "float32"), ("int32", "float32", "float64"),
+                                  ("float64", "complex128", "complex128")):
+        # Converts the operands, freezing the left one so both storage forms are used.
+        a, b = base_a.astype(left).freeze(), base_b.astype(right)
+        # Iterates over the operations.
+        for operation, expected in references.items():
+            # Computes the result.
+            result = operation(a, b)
+            # Checks the dtype and the dense rows.
+            assert result.dtype == promoted and list(result) == expected
+        # Checks that the transpose keeps the dtype.
+        assert compute_transpose(a).dtype == left and list(compute_transpose(a)) == [list(c) for c in zip(*dense_a)]
+
+
+# Checks that values are converted on write and by astype, and that unknown dtypes are rejected.
+def test_values_follow_the_dtype():
+    # Builds an integer matrix and writes a float into it.
+    matrix = Matrix(2, 2, {(0, 0): 1.5}, dtype="int32")
+    matrix[1, 1] = 2.7
+    # Checks that the values were truncated to integers.
+    assert list(matrix) == [[1, 0], [0, 2]] and matrix.dtype == "int32"
+    # Checks that float32 rounds values and that converting to integers drops values that become zero.
+    halves = Matrix(1, 2, {(0, 0): 0.1, (0, 1): 0.5}).freeze()
+    assert halves.astype("float32")[0, 0] == pytest.approx(0.1) and halves.astype("float32")[0, 0] != 0.1
+    assert halves.astype("int64").nnz == 0
+    # Checks that unknown dtypes are rejected.
+    with pytest.raises(ValueError):
+        Matrix(1, 1, dtype="int8")
@@ -0,0 +1,22 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the import benchmark, which runs every statement in fresh interpreters.
+from matrixspark.benchmark import HEAVY_MODULES, IMPORT_STATEMENTS, benchmark_imports
+
+# Defines a time budget far above the benchmark's, so only a real regression (not a slow machine) fails the test.
+BUDGET = 0.5
+
+
+# Checks that importing the package and running a serial product stay fast and load no heavy module.
+def test_imports_are_fast_and_light():
+    # Checks that the statements under test include both import forms.
+    assert {"import matrixspark", "from matrixspark import Matrix"} <= set(IMPORT_STATEMENTS)
+    # Checks that NumPy and the process and thread pools are among the modules checked.
+    assert {"numpy", "concurrent.futures", "multiprocessing"} <= set(HEAVY_MODULES)
+    # Runs every statement once in a fresh interpreter and checks that none failed.
+    assert benchmark_imports(BUDGET, repeat=1) == []
@@ -0,0 +1,76 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class under test.
+from matrixspark import Matrix
+
+
+# Defines a helper that returns the same 2 x 3 matrix in dictionary, CSR and CSC form.
+def _forms():
+    # Returns the three forms.
+    return [Matrix(2, 3, {(0, 0): 1, (1, 2): 2}).freeze(fmt) if fmt else Matrix(2, 3, {(0, 0): 1, (1, 2): 2})
+            for fmt in (None, "csr", "csc")]
+
+
+# Checks that element reads out of range raise an IndexError in every storage format.
+def test_out_of_range_reads_raise_in_every_format():
+    # Iterates over the forms.
+    for matrix in _forms():
+        # Iterates over positions outside the matrix.
+        for key in ((5, 5), (0, 3), (2, 0)):
+            # Checks that the read raises.
+            with pytest.raises(IndexError):
+                matrix[key]
+        # Checks reads inside the matrix.
+        assert matrix[1, 2] == 2 and matrix[0, 2] == 0
+
+
+# Checks that negative indices count from the end in element reads, as they do in slices.
+def test_negative_indices_match_slices():
+    # Iterates over the forms.
+    for matrix in _forms():
+        # Checks element reads against the last row and column.
+        assert matrix[-1, -1] == 2 and matrix[-2, 0] == 1 and matrix[-1, 0] == 0
+        # Checks that a negative element read agrees with the same element of a negative row slice.
+        assert matrix[-1, 2] == matrix[-1, :][0, 2]
+        # Checks that a negative write is read back at the same position.
+        matrix[-1, 0] = 7
+        assert matrix[1, 0] == 7 and matrix[-1, 0] == 7
+        # Checks that negative indices past the start still raise.
+        with pytest.raises(IndexError):
+            matrix[-3, 0]
+
+
+# Checks that compression rejects positions outside the matrix with the same IndexError as element reads.
+def test_freeze_rejects_out_of_range_keys():
+    # Iterates over a position past the end and a negative position.
+    for key in ((2, 0), (-1, 0)):
+        # Builds a dictionary matrix holding the invalid key.
+        matrix = Matrix(2, 2, {(0, 0): 1, key: 2})
+        # Iterates over both compressed formats.
+        for fmt in ("csr", "csc"):
+            # Checks that compressing raises.
+            with pytest.raises(IndexError, match="out of range"):
+                matrix.freeze(fmt)
+
+
+# Checks that element writes outside the matrix raise an IndexError and leave the matrix unchanged.
+def test_out_of_range_writes_raise():
+    # Iterates over the forms.
+    for matrix in _forms():
+        # Iterates over a negative index past the start and a position past the end.
+        for key in ((-3, 0), (5, 5)):
+            # Checks that the write raises.
+            with pytest.raises(IndexError):
+                matrix[key] = 4
+        # Checks that nothing was stored.
+        assert dict(matrix.items()) == {(0, 0): 1, (1, 2): 2}
+        # Checks that the matrix still compresses.
+        assert matrix.freeze("csc")[1, 2] == 2
@@ -0,0 +1,56 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the readers under test.
+from matrixspark import read_coo, read_matrix_market
+
+
+# Checks that symmetric files are mirrored (negated for skew-symmetric ones), the diagonal only once.
+def test_matrix_market_mirrors_symmetric_entries(tmp_path):
+    # Writes a symmetric and a skew-symmetric file listing the lower triangle.
+    for symmetry, sign in (("symmetric", 1), ("skew-symmetric", -1)):
+        # Writes the file, with a comment and a diagonal entry for the symmetric one.
+        path = tmp_path / f"{symmetry}.mtx"
+        diagonal = "1 1 4\n" if sign == 1 else ""
+        path.write_text(f"%%MatrixMarket matrix coordinate integer {symmetry}\n% comment\n3 3 {2 + (sign == 1)}\n"
+                        f"{diagonal}2 1 5\n3 2 -7\n")
+        # Reads the matrix in both formats, with tiny chunks so entries span several chunks.
+        for fmt in ("csr", "csc"):
+            # Reads the file.
+            matrix = read_matrix_market(str(path), fmt=fmt, chunk_bytes=4)
+            # Computes the expected dense rows.
+            expected = [[4 if sign == 1 else 0, 5 * sign, 0], [5, 0, -7 * sign], [0, -7, 0]]
+            # Checks the format and the dense rows.
+            assert matrix.format == fmt and list(matrix) == expected
+
+
+# Checks that duplicate coordinates are summed and entries that cancel out are dropped.
+def test_coo_sums_duplicates(tmp_path):
+    # Writes a CSV file with a header, duplicates and a cancelling pair.
+    path = tmp_path / "entries.csv"
+    path.write_text("row,col,value\n0,0,1\n1,2,2.5\n0,0,3\n# comment\n1,1,4\n1,1,-4\n1,2,0.5\n")
+    # Reads the file with an explicit shape.
+    matrix = read_coo(str(path), shape=(2, 3), delimiter=",", skip_header=1, chunk_bytes=8)
+    # Checks the dense rows and that the cancelled entry is not stored.
+    assert list(matrix) == [[4.0, 0, 0], [0, 0, 3.0]] and matrix.nnz == 2
+    # Checks the inferred shape of a 1-based whitespace file.
+    path.write_text("1 1 2\n3 2 5\n1 1 2\n")
+    matrix = read_coo(str(path), one_based=True)
+    assert (matrix.rows, matrix.cols) == (3, 2) and list(matrix) == [[4, 0], [0, 0], [0, 5]]
+
+
+# Checks that entries outside the announced shape are rejected.
+def test_readers_reject_out_of_range_entries(tmp_path):
+    # Writes a Matrix Market file with an entry past the last row.
+    path = tmp_path / "bad.mtx"
+    path.write_text("%%MatrixMarket matrix coordinate real general\n2 2 1\n3 1 1.0\n")
+    # Checks that reading raises.
+    with pytest.raises(ValueError):
+        read_matrix_market(str(path))
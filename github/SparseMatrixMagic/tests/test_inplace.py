@@ -0,0 +1,91 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class under test.
+from matrixspark import Matrix
+
+
+# Defines a helper that builds the frozen 2 x 2 matrix used by the tests.
+def _matrix():
+    # Returns [[1, 2], [3, 5]] in CSR form.
+    return Matrix(2, 2, {(0, 0): 1, (0, 1): 2, (1, 0): 3, (1, 1): 5}).freeze()
+
+
+# Defines a helper that builds a frozen 2 x 2 matrix of ones.
+def _ones():
+    # Returns [[1, 1], [1, 1]] in CSR form.
+    return Matrix(2, 2, {(0, 0): 1, (0, 1): 1, (1, 0): 1, (1, 1): 1}).freeze()
+
+
+# Checks that an in-place update of a slicing view leaves the matrix it was taken from, and its caches, unchanged.
+def test_inplace_update_of_view_keeps_parent():
+    # Builds the matrix.
+    a = _matrix()
+    # Fills the determinant cache and the CSC conversion used by column reads.
+    assert a.determinant == -1 and dict(a[:, 0].items()) == {(0, 0): 1, (1, 0): 3}
+    # Takes a view of every row and updates it in place.
+    view = a[0:2, :]
+    view += _ones()
+    # Checks the view.
+    assert dict(view.items()) == {(0, 0): 2, (0, 1): 3, (1, 0): 4, (1, 1): 6}
+    # Checks that the matrix, its determinant and its columns are unchanged.
+    assert dict(a.items()) == {(0, 0): 1, (0, 1): 2, (1, 0): 3, (1, 1): 5}
+    assert a.determinant == -1
+    assert dict(a[:, 0].items()) == {(0, 0): 1, (1, 0): 3}
+
+
+# Checks that an in-place update of a transpose (cached or view) leaves the matrix unchanged.
+def test_inplace_update_of_transpose_keeps_parent():
+    # Builds the matrix.
+    a = _matrix()
+    # Updates the cached transpose in place.
+    t = a.transpose
+    t += _ones()
+    # Updates the transposed view in place.
+    v = a.T
+    v *= _ones() + _ones()
+    # Checks the transposes.
+    assert dict(t.items()) == {(0, 0): 2, (0, 1): 4, (1, 0): 3, (1, 1): 6}
+    assert dict(v.items()) == {(0, 0): 2, (0, 1): 6, (1, 0): 4, (1, 1): 10}
+    # Checks that the matrix is unchanged whichever way it is read.
+    assert a[0, 0] == 1 and a[1, 0] == 3
+    assert dict(a[:, 0].items()) == {(0, 0): 1, (1, 0): 3}
+
+
+# Checks that an in-place update of a matrix leaves the views taken from it unchanged.
+def test_inplace_update_of_parent_keeps_views():
+    # Builds the matrix.
+    a = _matrix()
+    # Takes a row view and a transposed view.
+    row, t = a[0:1, :], a.T
+    # Updates the matrix in place.
+    a += _ones()
+    # Checks the matrix.
+    assert dict(a.items()) == {(0, 0): 2, (0, 1): 3, (1, 0): 4, (1, 1): 6}
+    # Checks that the views still show the values they were taken from.
+    assert dict(row.items()) == {(0, 0): 1, (0, 1): 2}
+    assert dict(t.items()) == {(0, 0): 1, (1, 0): 2, (0, 1): 3, (1, 1): 5}
+
+
+# Checks that a matrix stops copying its values on in-place updates once its views are gone.
+def test_inplace_update_copies_only_while_views_are_alive():
+    # Builds the matrix.
+    a = _matrix()
+    # Takes a row view and a transposed view.
+    row, t = a[0:1, :], a.T
+    # Checks that the buffers are shared while the views are alive.
+    assert a.compressed("csr").shared
+    # Drops the views.
+    del row, t
+    # Checks that the buffers are private again.
+    assert not a.compressed("csr").shared
+    # Reads the value buffer.
+    values = a.compressed("csr").values
+    # Updates the matrix in place without changing its structure.
+    a += _ones()
+    # Checks that the buffer was overwritten rather than copied.
+    assert a.compressed("csr").values is values and dict(a.items()) == {(0, 0): 2, (0, 1): 3, (1, 0): 4, (1, 1): 6}
@@ -0,0 +1,51 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class and the deferred evaluation mode under test.
+from matrixspark import Matrix, deferred
+
+
+# Checks that expressions accept the batches and out buffers that Matrix.__call__ accepts.
+def test_expression_batch_matvec_matches_evaluated_matrix():
+    # Builds a frozen and a dictionary matrix.
+    a = Matrix(3, 2, {(0, 0): 1, (1, 1): 2, (2, 0): 3}).freeze()
+    b = Matrix(3, 2, {(0, 0): 4, (0, 1): 5, (2, 1): 6})
+    # Builds a list batch of two vectors.
+    batch = [[1, 2], [3, 4]]
+    # Builds a lazy sum and a lazy element-wise product.
+    with deferred():
+        # Builds the expressions.
+        exprs = (a + b, a * b)
+    # Iterates over the expressions.
+    for expr in exprs:
+        # Evaluates the expression.
+        matrix = expr.evaluate()
+        # Checks the batch product.
+        assert expr(batch) == matrix(batch)
+        # Checks the batch product written into preallocated buffers.
+        out = [[0] * 3, [0] * 3]
+        assert expr(batch, out=out) is out and out == matrix(batch)
+        # Checks a single vector with workers given.
+        assert expr([1, 2], workers=1) == matrix([1, 2])
+
+
+# Checks that the operators return matrices outside a deferred() block and expressions inside it.
+def test_operators_are_lazy_only_when_deferred():
+    # Builds a frozen and a dictionary matrix.
+    a = Matrix(2, 2, {(0, 0): 1, (1, 1): 2}).freeze()
+    b = Matrix(2, 2, {(0, 0): 3, (0, 1): 4})
+    # Checks that the eager results are drop-in matrices.
+    assert isinstance(a + b, Matrix) and isinstance(a * b, Matrix) and isinstance(a @ b, Matrix)
+    assert (a + b)[0, 0] == 4 and ((a + b) - a)[0, 1] == 4 and (a @ b).data == {(0, 0): 3, (0, 1): 4}
+    # Builds the same sum lazily.
+    with deferred():
+        # Builds the expression.
+        expr = a + b
+    # Checks that the expression is not a matrix but evaluates to the eager result.
+    assert not isinstance(expr, Matrix) and dict(expr.evaluate().items()) == dict((a + b).items())
+    # Checks that subtracting from an expression evaluates it.
+    assert dict((expr - a).items()) == {(0, 0): 3, (0, 1): 4}
@@ -0,0 +1,46 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class, the product under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix, matmul
+from matrixspark.benchmark import random_sparse
+
+
+# Defines a helper that multiplies two matrices given as dense rows, the reference for the sparse product.
+def _dense_matmul(a, b):
+    # Returns the dense product.
+    return [[sum(a[i][k] * b[k][j] for k in range(len(b))) for j in range(len(b[0]))] for i in range(len(a))]
+
+
+# Checks the Gustavson product against the dense product for dictionary, frozen and mixed operands.
+def test_matmul_matches_dense():
+    # Builds random 12 x 9 and 9 x 7 matrices and their dense rows.
+    a, b = random_sparse(12, 9, 0.3, seed=1), random_sparse(9, 7, 0.3, seed=2)
+    expected = _dense_matmul(list(a), list(b))
+    # Checks the dictionary product.
+    assert list(matmul(a, b)) == expected
+    # Checks the CSR kernel with frozen and mixed operands.
+    assert list(matmul(a.freeze(), b)) == expected
+    assert list(matmul(a, b.freeze("csc"))) == expected
+
+
+# Checks that products that cancel out are not stored.
+def test_matmul_drops_cancelled_products():
+    # Builds a row and a column whose products cancel out.
+    a, b = Matrix(1, 2, {(0, 0): 1, (0, 1): 1}), Matrix(2, 1, {(0, 0): 2, (1, 0): -2})
+    # Checks that no element is stored in either form.
+    assert matmul(a, b).nnz == 0 and matmul(a.freeze(), b.freeze()).nnz == 0
+
+
+# Checks that incompatible dimensions are rejected.
+def test_matmul_rejects_mismatched_shapes():
+    # Checks that the product raises.
+    with pytest.raises(ValueError):
+        matmul(Matrix(2, 3), Matrix(2, 3))
@@ -0,0 +1,97 @@
+# Imports subprocess and sys to check the modules loaded by a fresh interpreter, and Path to find the source tree.
+import subprocess
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.importorskip.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix
+from matrixspark.benchmark import random_sparse
+
+
+# Defines a helper that multiplies dense rows by a vector, the reference for the sparse kernels.
+def _dense_matvec(rows, vector):
+    # Returns one dot product per row.
+    return [sum(a * x for a, x in zip(row, vector)) for row in rows]
+
+
+# Checks single and batched products, with and without out buffers, against the dense product in every format.
+def test_matvec_matches_dense_in_every_format():
+    # Builds a random 30 x 20 matrix and its dense rows.
+    matrix = random_sparse(30, 20, 0.2, seed=1)
+    dense = list(matrix)
+    # Builds a batch of three vectors.
+    batch = [[(i * 7 + k) % 5 - 2 for i in range(20)] for k in range(3)]
+    # Computes the expected products.
+    expected = [_dense_matvec(dense, vector) for vector in batch]
+    # Iterates over the dictionary, CSR and CSC forms.
+    for fmt in (None, "csr", "csc"):
+        # Freezes the matrix into the format.
+        if fmt:
+            # Compresses the matrix.
+            matrix.freeze(fmt)
+        # Checks one vector.
+        assert matrix(batch[0]) == expected[0]
+        # Checks the batch.
+        assert matrix(batch) == expected
+        # Checks the batch written into preallocated buffers, which are returned.
+        out = [[1] * 30 for _ in batch]
+        assert matrix(batch, out=out) is out and out == expected
+        # Checks one vector written into a buffer holding stale values.
+        buffer = [9] * 30
+        assert matrix(batch[1], out=buffer) is buffer and buffer == expected[1]
+
+
+# Checks the NumPy kernel, with and without an out array, against the dense product.
+def test_numpy_matvec_matches_dense():
+    # Skips the test when NumPy is not installed.
+    np = pytest.importorskip("numpy")
+    # Builds a random matrix and a batch of vectors.
+    matrix = random_sparse(25, 15, 0.3, seed=2).freeze()
+    batch = np.arange(45, dtype=float).reshape(3, 15)
+    # Computes the expected products.
+    expected = np.array(list(matrix), dtype=float) @ batch.T
+    # Checks one vector and the batch.
+    assert np.allclose(matrix(batch[0]), expected[:, 0])
+    assert np.allclose(matrix(batch), expected.T)
+    # Checks the batch written into an out array.
+    out = np.empty((3, 25))
+    assert matrix(batch, out=out) is out and np.allclose(out, expected.T)
+
+
+# Checks that a dictionary matrix compresses itself once for repeated products and again after a write.
+def test_dictionary_matrix_caches_its_csr_form():
+    # Builds a dictionary matrix.
+    matrix = Matrix(2, 2, {(0, 0): 1, (1, 1): 2})
+    # Checks that the CSR form is reused while the matrix does not change.
+    storage = matrix.compressed("csr")
+    assert matrix.compressed("csr") is storage
+    # Writes an element, which drops the cached form.
+    matrix[0, 1] = 3
+    assert matrix.compressed("csr") is not storage and matrix([1, 1]) == [4, 2]
+    # Checks that writes inside a batch are seen by products inside the batch.
+    with matrix.batch_update():
+        # Writes an element.
+        matrix[1, 0] = 5
+        # Checks the product.
+        assert matrix([1, 1]) == [4, 7]
+    # Checks that an in-place update is seen by the next product.
+    matrix += Matrix(2, 2, {(0, 0): 1})
+    assert matrix([1, 1]) == [5, 7]
+
+
+# Checks that a serial product does not import the parallel module.
+def test_serial_matvec_does_not_import_parallel():
+    # Runs a product in a fresh interpreter and lists the loaded matrixspark modules.
+    code = ("import sys; from matrixspark import Matrix; Matrix(2, 2, {(0, 0): 1})([1, 1]); "
+            "print('matrixspark.parallel' in sys.modules)")
+    # Reads the result.
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parents[1] / "src")
+    # Checks that the module was not loaded.
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,51 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for its fixtures.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the parallel module under test, the operations it runs and the random matrix generator of the benchmark.
+from matrixspark import add_matrices, elementwise_multiply, matmul, parallel
+from matrixspark.benchmark import random_sparse
+
+
+# Defines a fixture that lets small matrices run in parallel, so the tests stay fast.
+@pytest.fixture
+def small_threshold(monkeypatch):
+    # Lowers the number of stored elements needed for a parallel run.
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_NNZ", 1)
+
+
+# Checks that the row blocks cover every row once, in order, with similar numbers of stored elements.
+def test_partition_rows_covers_every_row():
+    # Builds a random 100 x 40 matrix.
+    storage = random_sparse(100, 40, 0.2, seed=1).compressed("csr")
+    # Iterates over several block counts, including more blocks than rows.
+    for parts in (1, 2, 3, 7, 150):
+        # Splits the rows.
+        blocks = parallel.partition_rows(storage, parts)
+        # Checks that the blocks are contiguous, non-empty and cover every row.
+        assert blocks[0][0] == 0 and blocks[-1][1] == 100 and len(blocks) <= parts
+        assert all(start < stop for start, stop in blocks)
+        assert all(blocks[k][1] == blocks[k + 1][0] for k in range(len(blocks) - 1))
+    # Checks that four blocks hold roughly a quarter of the elements each.
+    counts = [storage.indptr[stop] - storage.indptr[start] for start, stop in parallel.partition_rows(storage, 4)]
+    assert max(counts) - min(counts) <= storage.nnz // 10
+
+
+# Checks that the parallel kernels give the serial results.
+def test_parallel_kernels_match_serial(small_threshold):
+    # Builds two random 60 x 60 matrices.
+    a, b = random_sparse(60, 60, 0.1, seed=2), random_sparse(60, 60, 0.1, seed=3)
+    # Builds a vector.
+    vector = [i % 4 - 1 for i in range(60)]
+    # Checks the product, sum and element-wise product on two workers.
+    for function in (matmul, add_matrices, elementwise_multiply):
+        # Compares the elements of both results.
+        assert dict(function(a, b, workers=2).items()) == dict(function(a, b, workers=1).items())
+    # Checks the matrix-vector product of a frozen matrix on two workers.
+    assert a.freeze()(vector, workers=2) == a(vector, workers=1)
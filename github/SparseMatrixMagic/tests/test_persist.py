@@ -0,0 +1,43 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix
+from matrixspark.benchmark import random_sparse
+
+
+# Checks that saving and loading keeps the format, dtype and every element, and that the loaded buffers are mapped.
+def test_save_load_round_trip(tmp_path):
+    # Iterates over a dictionary matrix, which is saved as CSR, a CSC matrix and a float32 matrix.
+    for matrix, fmt in ((random_sparse(20, 15, 0.2, seed=1), "csr"),
+                        (random_sparse(20, 15, 0.2, seed=2).freeze("csc"), "csc"),
+                        (random_sparse(20, 15, 0.2, seed=3).astype("float32").freeze(), "csr")):
+        # Saves the matrix.
+        path = tmp_path / f"matrix-{fmt}-{matrix.dtype}.bin"
+        matrix.save(str(path))
+        # Loads it back.
+        loaded = Matrix.load(str(path))
+        # Checks the shape, format, dtype, elements and dense rows.
+        assert (loaded.rows, loaded.cols, loaded.format, loaded.dtype) == (20, 15, fmt, matrix.dtype)
+        assert dict(loaded.items()) == dict(matrix.items()) and list(loaded) == list(matrix)
+        # Checks that the values are a view into the file rather than a copy.
+        assert isinstance(loaded.compressed(fmt).values, memoryview)
+        # Checks a product computed from the mapped buffers.
+        assert loaded([1] * 15) == matrix([1] * 15)
+
+
+# Checks that other files are rejected.
+def test_load_rejects_other_files(tmp_path):
+    # Writes a file that is not a saved matrix.
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a matrix" * 10)
+    # Checks that loading raises.
+    with pytest.raises(ValueError):
+        Matrix.load(str(path))
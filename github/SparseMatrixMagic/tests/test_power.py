@@ -0,0 +1,55 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports pytest for pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class, the power under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix, matrix_power
+from matrixspark.benchmark import random_sparse
+
+
+# Defines a helper that multiplies two lists of dense rows.
+def _dense_matmul(a, b):
+    # Returns the product rows.
+    return [[sum(x * y for x, y in zip(row, column)) for column in zip(*b)] for row in a]
+
+
+# Checks every power up to 9, whose exponents use every combination of squarings, against repeated dense products.
+def test_powers_match_repeated_products():
+    # Builds a random 6 x 6 matrix.
+    matrix = random_sparse(6, 6, 0.25, seed=1)
+    # Starts the dense reference at the identity.
+    expected = [[int(i == j) for j in range(6)] for i in range(6)]
+    # Iterates over the exponents.
+    for k in range(10):
+        # Checks the operator and the function, from the dictionary and the frozen matrix.
+        assert list(matrix ** k) == list(matrix_power(matrix.freeze("csc"), k)) == expected
+        # Multiplies the reference by the matrix for the next exponent.
+        expected = _dense_matmul(expected, list(matrix))
+    # Checks that the first power is a copy that does not change with the matrix.
+    first = matrix ** 1
+    matrix[0, 0] = 100
+    assert first[0, 0] != 100
+
+
+# Checks that the threshold drops small intermediate elements, and that invalid arguments are rejected.
+def test_threshold_and_errors():
+    # Builds a matrix whose square has a small element at (0, 2).
+    matrix = Matrix(4, 4, {(0, 1): 0.1, (1, 2): 0.1, (1, 0): 5.0, (0, 3): 5.0})
+    # Computes the dense square.
+    square = _dense_matmul(list(matrix), list(matrix))
+    # Checks the exact square.
+    assert list(matrix_power(matrix, 2)) == square and square[0][2] == pytest.approx(0.01)
+    # Checks that a threshold of 0.05 keeps the factors but drops the small element of their product.
+    square[0][2] = 0
+    assert list(matrix_power(matrix, 2, threshold=0.05)) == square
+    # Checks that non-square matrices and negative or non-integer exponents are rejected.
+    for args in ((Matrix(2, 3, {}), 2), (matrix, -1), (matrix, 1.5)):
+        # Checks that the power raises.
+        with pytest.raises(ValueError):
+            matrix_power(*args)
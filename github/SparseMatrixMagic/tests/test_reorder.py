@@ -0,0 +1,96 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports random to shuffle the matrices.
+import random
+
+# Imports pytest for pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class, the orderings under test and the matrix generators of the benchmark.
+from matrixspark import Matrix, approximate_minimum_degree, bandwidth, permute, reverse_cuthill_mckee
+from matrixspark.benchmark import banded_sparse, random_sparse
+
+
+# Checks that permute moves rows and columns like the dense reference, in every storage format.
+def test_permute_matches_dense():
+    # Builds a random 5 x 7 matrix and its dense rows.
+    matrix = random_sparse(5, 7, 0.4, seed=1)
+    rows = list(matrix)
+    # Picks row and column permutations.
+    row_perm, col_perm = [3, 0, 4, 1, 2], [6, 2, 0, 5, 1, 3, 4]
+    # Computes the dense result: element (r, c) is element (row_perm[r], col_perm[c]) of the matrix.
+    expected = [[rows[i][j] for j in col_perm] for i in row_perm]
+    # Checks the dictionary, CSR and CSC forms.
+    for operand in (matrix, Matrix(5, 7, dict(matrix.items())).freeze("csr"),
+                    Matrix(5, 7, dict(matrix.items())).freeze("csc")):
+        # Checks the permuted rows.
+        assert list(permute(operand, row_perm, col_perm)) == expected
+    # Checks that invalid permutations and symmetric permutations of non-square matrices are rejected.
+    for args in ((matrix, [0, 1, 2, 3, 3], col_perm), (matrix, row_perm, col_perm[:-1]), (matrix, row_perm)):
+        # Checks that the permutation raises.
+        with pytest.raises(ValueError):
+            permute(*args)
+
+
+# Checks that reverse Cuthill-McKee recovers a narrow band from a shuffled banded matrix, component by component.
+def test_reverse_cuthill_mckee_restores_the_band():
+    # Builds a 40 x 40 matrix with a half-bandwidth of 2, next to a 10 x 10 diagonal block, as two components.
+    elements = dict(banded_sparse(40, 40, 5 / 40, seed=2).items()) | {(40 + k, 40 + k): 1 for k in range(10)}
+    banded = Matrix(50, 50, elements)
+    # Shuffles the rows and columns symmetrically.
+    shuffle = list(range(50))
+    random.Random(3).shuffle(shuffle)
+    shuffled = permute(banded, shuffle)
+    # Computes the ordering.
+    order = reverse_cuthill_mckee(shuffled)
+    # Checks that it is a permutation and that the reordered band is no wider than the original one.
+    assert sorted(order) == list(range(50)) and bandwidth(shuffled) > 10
+    assert bandwidth(permute(shuffled, order)) <= bandwidth(banded) == 2
+
+
+# Defines a helper that counts the fill-in of Gaussian elimination without pivoting on the pattern of a square matrix.
+def _fill_in(matrix):
+    # Reads the pattern as one set of columns per row, with the diagonal.
+    pattern = [{i} for i in range(matrix.rows)]
+    # Iterates over the stored elements.
+    for i, j in dict(matrix.items()):
+        # Records the element and its mirror.
+        pattern[i].add(j)
+        pattern[j].add(i)
+    # Initializes the fill count.
+    fill = 0
+    # Eliminates the nodes in order.
+    for k in range(matrix.rows):
+        # Reads the later neighbors of the node.
+        later = [j for j in pattern[k] if j > k]
+        # Connects them pairwise, counting the new edges.
+        for a in later:
+            # Adds the edges to the other neighbors.
+            for b in later:
+                # Counts each new edge once.
+                if a != b and b not in pattern[a]:
+                    # Records the edge.
+                    pattern[a].add(b)
+                    # Counts the edge.
+                    fill += 1
+    # Returns the number of new elements.
+    return fill
+
+
+# Checks that approximate minimum degree eliminates the hub of an arrow matrix last, which avoids all fill-in.
+def test_approximate_minimum_degree_avoids_fill():
+    # Builds a 12 x 12 arrow matrix whose first row and column are full, then shuffles it.
+    arrow = Matrix(12, 12, {(i, i): 4 for i in range(12)} | {(0, k): 1 for k in range(12)}
+                   | {(k, 0): 1 for k in range(12)})
+    shuffled = permute(arrow, [5, 3, 0, 9, 11, 1, 7, 2, 10, 4, 8, 6])
+    # Computes the ordering.
+    order = approximate_minimum_degree(shuffled)
+    # Checks that it is a permutation that keeps the hub (now row 2) until only one leaf is left, as both then tie.
+    assert sorted(order) == list(range(12)) and 2 in order[-2:]
+    # Checks that the elimination in that order creates no fill-in, unlike the shuffled order.
+    assert _fill_in(shuffled) > 0 and _fill_in(permute(shuffled, order)) == 0
@@ -0,0 +1,75 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Imports cos and pi for the known eigenvalues of tridiagonal matrices.
+from math import cos, pi
+
+# Imports pytest for pytest.approx and pytest.raises.
+import pytest
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class and the solvers under test.
+from matrixspark import Matrix, bicgstab, cg, gmres, power_iteration
+
+
+# Defines a helper that builds an n x n tridiagonal matrix with 4 on the diagonal and the given off-diagonal values.
+def _tridiagonal(n, lower=-1, upper=-1):
+    # Stores the three diagonals.
+    elements = {(i, i): 4 for i in range(n)}
+    elements |= {(i + 1, i): lower for i in range(n - 1)} | {(i, i + 1): upper for i in range(n - 1)}
+    # Returns the matrix.
+    return Matrix(n, n, elements)
+
+
+# Defines a helper that computes the residual norm ||b - Ax|| from the dense rows of the matrix.
+def _residual(matrix, x, b):
+    # Returns the Euclidean norm of the residual.
+    return sum((bi - sum(a * xi for a, xi in zip(row, x))) ** 2 for row, bi in zip(matrix, b)) ** 0.5
+
+
+# Checks every solver with every preconditioner on a symmetric and a non-symmetric diagonally dominant system.
+def test_solvers_reach_the_tolerance():
+    # Builds the right-hand side.
+    b = [float(i % 3 + 1) for i in range(12)]
+    # Iterates over the solvers with a matrix each can solve: CG needs a symmetric matrix.
+    for solver, matrix in ((cg, _tridiagonal(12)), (bicgstab, _tridiagonal(12, -2, 1)),
+                           (gmres, _tridiagonal(12, -2, 1))):
+        # Iterates over the preconditioners.
+        for preconditioner in (None, "jacobi", "ilu0"):
+            # Solves the system with the dictionary and the frozen matrix.
+            for operand in (matrix, Matrix(12, 12, dict(matrix.items())).freeze()):
+                # Solves the system.
+                x, info = solver(operand, b, tol=1e-10, preconditioner=preconditioner)
+                # Checks convergence and the residual against the dense rows.
+                assert info == 0 and _residual(matrix, x, b) <= 1e-9 * sum(v * v for v in b) ** 0.5
+
+
+# Checks that an exact preconditioner solves a tridiagonal system in one iteration, since ILU(0) keeps all its fill.
+def test_ilu0_is_exact_for_tridiagonal_matrices():
+    # Records the residual of every iteration.
+    history = []
+    # Solves the system.
+    x, info = gmres(_tridiagonal(10, -2, 1), [1.0] * 10, tol=1e-12, preconditioner="ilu0",
+                    callback=lambda iteration, residual: history.append(residual))
+    # Checks convergence within one iteration.
+    assert info == 0 and len(history) == 1
+
+
+# Checks the dominant eigenvalue against the known eigenvalues of the tridiagonal matrix, and the solver checks.
+def test_power_iteration_and_errors():
+    # Computes the largest eigenvalue of the 8 x 8 matrix, 4 + 2 cos(pi / 9).
+    expected = 4 + 2 * cos(pi / 9)
+    # Runs the power iteration from a start that is not orthogonal to the alternating dominant eigenvector.
+    value, vector, info = power_iteration(_tridiagonal(8), x0=[float(i + 1) for i in range(8)], tol=1e-12, maxiter=5000)
+    # Checks the eigenvalue.
+    assert info == 0 and value == pytest.approx(expected, rel=1e-8)
+    # Checks that non-square matrices, wrong right-hand sides and unknown preconditioners are rejected.
+    with pytest.raises(ValueError):
+        cg(Matrix(2, 3, {}), [1.0, 1.0])
+    with pytest.raises(ValueError):
+        cg(_tridiagonal(3), [1.0, 1.0])
+    with pytest.raises(ValueError):
+        cg(_tridiagonal(3), [1.0, 1.0, 1.0], preconditioner="other")
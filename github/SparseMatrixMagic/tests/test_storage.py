@@ -0,0 +1,43 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix
+from matrixspark.benchmark import random_sparse
+
+
+# Checks that freezing into CSR or CSC, converting between them and thawing keep every element.
+def test_freeze_convert_and_thaw_keep_elements():
+    # Builds a random 15 x 10 matrix and its dense rows.
+    matrix = random_sparse(15, 10, 0.25, seed=3)
+    dense, elements = list(matrix), dict(matrix.items())
+    # Iterates over the formats, converting from the previous one each time.
+    for fmt in ("csr", "csc", "csr"):
+        # Freezes the matrix.
+        matrix.freeze(fmt)
+        # Checks the format, the elements and the dense rows.
+        assert matrix.format == fmt and dict(matrix.items()) == elements and list(matrix) == dense
+        # Checks element reads by binary search.
+        assert all(matrix[i, j] == dense[i][j] for i in range(15) for j in range(10))
+    # Thaws the matrix by writing an element.
+    matrix[0, 0] = 42
+    # Checks that the matrix is back in dictionary form with the write applied.
+    assert matrix.format == "dok" and matrix[0, 0] == 42 and matrix.nnz == len(elements | {(0, 0): 42})
+
+
+# Checks the CSR buffers of a small matrix against the layout computed by hand.
+def test_csr_and_csc_buffers():
+    # Builds [[0, 5, 0], [7, 0, 8]].
+    matrix = Matrix(2, 3, {(0, 1): 5, (1, 0): 7, (1, 2): 8})
+    # Reads both compressed forms.
+    csr, csc = matrix.compressed("csr"), matrix.compressed("csc")
+    # Checks the CSR offsets, column indices and values.
+    assert (list(csr.indptr), list(csr.indices), list(csr.values)) == ([0, 1, 3], [1, 0, 2], [5, 7, 8])
+    # Checks the CSC offsets, row indices and values.
+    assert (list(csc.indptr), list(csc.indices), list(csc.values)) == ([0, 1, 2, 3], [1, 0, 1], [7, 5, 8])
+    # Checks that converting one form gives the other.
+    assert dict(csr.convert().items()) == dict(csc.items()) and csr.convert().fmt == "csc"
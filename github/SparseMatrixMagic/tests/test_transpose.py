@@ -0,0 +1,42 @@
+# Imports sys and Path to make the package importable from the source tree.
+import sys
+from pathlib import Path
+
+# Adds the src directory to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Imports the Matrix class, the transposes under test and the random matrix generator of the benchmark.
+from matrixspark import Matrix, compute_transpose, transposed_view
+from matrixspark.benchmark import random_sparse
+
+
+# Checks the counting-sort transpose of dictionary matrices and the buffer transpose of frozen ones against dense rows.
+def test_transpose_matches_dense():
+    # Iterates over shapes including empty rows and columns and a matrix with no elements.
+    for rows, cols, density in ((7, 11, 0.2), (11, 7, 0.05), (1, 9, 0.5), (5, 5, 1.0), (4, 6, 0.0)):
+        # Builds the matrix, emptied for the zero density.
+        matrix = random_sparse(rows, cols, density, seed=rows) if density else Matrix(rows, cols)
+        # Computes the dense transpose.
+        expected = [list(column) for column in zip(*list(matrix))]
+        # Iterates over the dictionary, CSR and CSC forms.
+        for operand in (matrix, Matrix(rows, cols, dict(matrix.items())).freeze("csr"),
+                        Matrix(rows, cols, dict(matrix.items())).freeze("csc")):
+            # Computes the transposes.
+            transpose, view = compute_transpose(operand), transposed_view(operand)
+            # Checks the shapes and the dense rows.
+            assert (transpose.rows, transpose.cols, view.rows, view.cols) == (cols, rows, cols, rows)
+            assert list(transpose) == list(view) == list(operand.T) == list(operand.transpose) == expected
+
+
+# Checks that the counting sort stores the columns of every row in increasing order, as CSR requires.
+def test_counting_sort_gives_sorted_rows():
+    # Builds a matrix written in reverse order.
+    matrix = Matrix(3, 4, {})
+    for i, j in ((2, 3), (2, 0), (1, 3), (0, 3), (0, 1), (1, 0)):
+        # Writes the element.
+        matrix[i, j] = i * 4 + j + 1
+    # Reads the CSR buffers of the transpose.
+    storage = compute_transpose(matrix).compressed("csr")
+    # Checks the offsets, the sorted column indices and the values.
+    assert list(storage.indptr) == [0, 2, 3, 3, 6]
+    assert list(storage.indices) == [1, 2, 0, 0, 1, 2] and list(storage.values) == [5, 9, 2, 4, 8, 12]